@@ -26,6 +26,7 @@ namespace AgentAssistant
         public event EventHandler<SyncEventArgs>? EventCreated;
         public event EventHandler<SyncEventArgs>? EventUpdated;
         public event EventHandler<int>? EventDeleted;
+        public event EventHandler<string>? EventDeletedById;
         public event EventHandler<List<ServerEvent>>? SyncReceived;
         public event EventHandler<string>? ConnectionStatusChanged;
 
@@ -108,12 +109,45 @@ namespace AgentAssistant
                     }
                 });
 
+                // 여러 건의 알림을 한 프레임으로 받은 경우 (BROADCAST_WINDOW_MS 또는 일괄 변경 API)
+                socket.On("events_batch", response =>
+                {
+                    var batch = response.GetValue<EventsBatch>();
+                    foreach (var eventData in batch.Created)
+                    {
+                        OnEventCreated(eventData);
+                    }
+                    foreach (var eventData in batch.Updated)
+                    {
+                        OnEventUpdated(eventData);
+                    }
+                    // 서버 이벤트 ID는 UUID 문자열
+                    foreach (var eventId in batch.Deleted)
+                    {
+                        OnEventDeleted(eventId);
+                    }
+                });
+
                 socket.On("sync_response", response =>
                 {
                     var data = response.GetValue<SyncResponse>();
                     OnSyncReceived(data.Events);
                 });
 
+                socket.On("sync_error", async response =>
+                {
+                    var data = response.GetValue<JsonElement>();
+                    var message = data.TryGetProperty("message", out var messageElement) ? messageElement.GetString() : "";
+                    OnConnectionStatusChanged($"동기화 오류: {message}");
+
+                    // 서버가 혼잡해 거절한 경우 retry_after초 뒤에 다시 요청 (잘못된 요청에는 retry_after가 없음)
+                    if (data.TryGetProperty("retry_after", out var retryAfterElement))
+                    {
+                        await Task.Delay(TimeSpan.FromSeconds(Math.Max(1, retryAfterElement.GetInt32())));
+                        await RequestSyncAsync();
+                    }
+                });
+
                 await socket.ConnectAsync();
                 return true;
             }
@@ -298,6 +332,15 @@ namespace AgentAssistant
         protected virtual void OnEventCreated(ServerEvent serverEvent) => EventCreated?.Invoke(this, new SyncEventArgs(serverEvent));
         protected virtual void OnEventUpdated(ServerEvent serverEvent) => EventUpdated?.Invoke(this, new SyncEventArgs(serverEvent));
         protected virtual void OnEventDeleted(int eventId) => EventDeleted?.Invoke(this, eventId);
+        protected virtual void OnEventDeleted(string eventId)
+        {
+            EventDeletedById?.Invoke(this, eventId);
+            // 숫자 ID를 쓰는 기존 구독자에게도 전달
+            if (int.TryParse(eventId, out var numericId))
+            {
+                OnEventDeleted(numericId);
+            }
+        }
         protected virtual void OnSyncReceived(List<ServerEvent> events) => SyncReceived?.Invoke(this, events);
         protected virtual void OnConnectionStatusChanged(string status) => ConnectionStatusChanged?.Invoke(this, status);
     }
@@ -354,6 +397,14 @@ namespace AgentAssistant
         public List<ServerEvent> Events { get; set; } = new List<ServerEvent>();
     }
 
+    public class EventsBatch
+    {
+        public string Department_id { get; set; } = "";
+        public List<ServerEvent> Created { get; set; } = new List<ServerEvent>();
+        public List<ServerEvent> Updated { get; set; } = new List<ServerEvent>();
+        public List<string> Deleted { get; set; } = new List<string>();
+    }
+
     // 이벤트 인자
     public class SyncEventArgs : EventArgs
     {
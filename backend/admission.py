@@ -0,0 +1,171 @@
+"""
+동기화 요청 부하 제어
+서버 재시작이나 네트워크 장애 직후 모든 클라이언트가 한꺼번에 다시 동기화를 요청할 때
+- SingleFlight: 같은 요청이 진행 중이면 새로 읽지 않고 그 결과를 함께 받음
+- AdmissionControl: 동시에 처리하는 요청 수를 제한하고, 대기열도 차면 재시도 시각(초)을 알려주며 거절
+
+대기에는 create_event로 만든 이벤트를 사용합니다 (eventlet 서버에서는 socketio.server.eio.create_event).
+"""
+
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Hashable
+
+
+class Overloaded(Exception):
+    """동시 처리 수와 대기열이 모두 찬 경우"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f'서버가 혼잡합니다. {retry_after}초 후 다시 시도하세요.')
+        self.retry_after = retry_after
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self, done):
+        self.done = done
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """키별로 동시에 한 번만 실행하고, 진행 중에 들어온 호출은 같은 결과(또는 예외)를 받음"""
+
+    def __init__(self, create_event: Callable = threading.Event):
+        self._create_event = create_event
+        self._calls = {}  # key -> _Call
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], object]):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(self._create_event())
+                self.calls += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {'calls': self.calls, 'shared': self.shared, 'in_flight': len(self._calls)}
+
+
+class AdmissionControl:
+    """
+    동시 처리 수 제한 + 대기열
+
+    max_active개까지 바로 처리하고, 그 이상은 max_queue개까지 도착 순서대로 기다립니다.
+    대기열도 차면 Overloaded를 내며, retry_after는 밀린 작업량과 평균 처리 시간으로 추정한 뒤
+    재접속한 클라이언트가 다시 한꺼번에 몰리지 않도록 1~2배 사이로 흩뜨립니다.
+    """
+
+    def __init__(self, max_active: int = 8, max_queue: int = 64, create_event: Callable = threading.Event):
+        self.max_active = max_active
+        self.max_queue = max_queue
+        self._create_event = create_event
+        self._active = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+        self._average = 0.1  # 평균 처리 시간(초, 지수 이동 평균)
+        self.admitted = 0
+        self.queued = 0
+        self.rejected = 0
+
+    def run(self, fn: Callable[[], object]):
+        """슬롯을 얻어 fn() 실행 (대기열이 차면 Overloaded)"""
+        self._acquire()
+        start = time.monotonic()
+        try:
+            return fn()
+        finally:
+            self._release(time.monotonic() - start)
+
+    def _acquire(self):
+        with self._lock:
+            if self._active < self.max_active:
+                self._active += 1
+                self.admitted += 1
+                return
+            if len(self._waiters) >= self.max_queue:
+                self.rejected += 1
+                raise Overloaded(self._retry_after())
+            waiter = self._create_event()
+            self._waiters.append(waiter)
+            self.admitted += 1
+            self.queued += 1
+        # 끝난 요청이 슬롯을 그대로 넘겨줌 (_active는 그대로)
+        try:
+            waiter.wait()
+        except BaseException:
+            # 기다리는 중에 취소되면(greenlet kill, 타임아웃) 대기열에서 빼고, 이미 슬롯을 넘겨받았으면 돌려줌
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    self.admitted -= 1
+                except ValueError:
+                    self._hand_over()
+            raise
+
+    def _release(self, duration: float):
+        with self._lock:
+            self._average = self._average * 0.8 + duration * 0.2
+            self._hand_over()
+
+    def _hand_over(self):
+        """슬롯을 다음 대기 요청에 넘기거나 반납 (_lock을 잡은 상태에서 호출)"""
+        if self._waiters:
+            self._waiters.popleft().set()
+        else:
+            self._active -= 1
+
+    def _retry_after(self) -> int:
+        backlog = (self._active + len(self._waiters)) / self.max_active * self._average
+        return math.ceil(max(1.0, backlog) * random.uniform(1, 2))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'active': self._active,
+                'waiting': len(self._waiters),
+                'admitted': self.admitted,
+                'queued': self.queued,
+                'rejected': self.rejected,
+                'average_ms': round(self._average * 1000, 1)
+            }
+
+
+def get_admission_control(create_event: Callable = threading.Event) -> AdmissionControl:
+    """
+    환경 변수로 동기화 부하 제어 생성
+
+    SYNC_MAX_ACTIVE: 동시에 처리할 동기화 요청 수 (기본값: 8)
+    SYNC_MAX_QUEUE: 기다릴 수 있는 요청 수, 넘으면 retry_after와 함께 거절 (기본값: 64)
+    """
+    return AdmissionControl(int(os.environ.get('SYNC_MAX_ACTIVE', '8')),
+                            int(os.environ.get('SYNC_MAX_QUEUE', '64')),
+                            create_event)
@@ -7,6 +7,19 @@ from flask import Flask, request, jsonify
 from flask_socketio import SocketIO, emit, join_room, leave_room
 from flask_cors import CORS
 from models import get_database
+from model_cache import get_model_cache
+from versioning import get_version_counters
+from admission import Overloaded, SingleFlight, get_admission_control
+from broadcast import get_broadcast_scheduler
+from cooperative_io import offload_blocking_io
+from message_queue import socketio_queue_options
+from metrics import CONTENT_TYPE, AppMetrics
+from profiler import get_sampling_profiler
+from tracing import get_tracer
+from response_cache import GZIP_MIN_SIZE, EncodedPayload, ResponseCache, SocketJSON, encode_json
+from datetime import date
+import hmac
+import json
 import logging
 import os
 
@@ -16,29 +29,278 @@ app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-change-
 app.config['JSON_AS_ASCII'] = False  # 한글 등 유니코드 문자 제대로 표시
 CORS(app)
 
+# Prometheus 형식 지표 (/metrics)
+metrics = AppMetrics()
+metrics.instrument_flask(app)
+
+# 느린 요청/핸들러/테이블 호출 기록 (SLOW_LOG_MS), 관리자용 샘플링 프로파일러 (ADMIN_TOKEN이 있을 때만)
+profiler = get_sampling_profiler()
+tracer = get_tracer(profiler)
+tracer.instrument_flask(app, unprofiled=('/admin/', '/metrics'))
+
 # Socket.IO 설정
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet')
+# (sync_response는 미리 직렬화한 본문을 그대로 프레임에 넣고, 전송 패킷 수/크기는 지표로 집계)
+# SOCKETIO_MESSAGE_QUEUE를 지정하면 워커 프로세스 간에 emit을 메시지 큐로 전달
+socketio = SocketIO(app, cors_allowed_origins="*", async_mode='eventlet', json=metrics.socket_json(SocketJSON),
+                    **socketio_queue_options())
+metrics.watch_socketio(socketio)
+tracer.instrument_socketio(socketio)
+
+# 부서 방 이벤트 알림 (BROADCAST_WINDOW_MS 동안 모아서 전송)
+broadcaster = get_broadcast_scheduler(socketio)
 
 # 데이터베이스 초기화 (로컬 또는 AWS)
 try:
     db_mode = os.environ.get('DB_MODE', 'local').lower()
-    db = get_database(db_mode)
+    # 테이블 호출별 소요 시간/항목 수/읽은 바이트 수 계측
+    db = metrics.instrument_database(get_database(db_mode), db_mode)
     
     from models import Department, Event
-    department_model = Department(db)
-    event_model = Event(db)
+    model_cache = get_model_cache()
+    # eventlet 허브를 막지 않도록 모델 호출은 tpool 스레드에서 실행
+    department_model = offload_blocking_io(Department(db, model_cache), socketio.async_mode)
+    event_model = offload_blocking_io(Event(db, model_cache), socketio.async_mode)
     
-    mode_name = "로컬 NoSQL" if db_mode == 'local' else "AWS DynamoDB"
+    mode_name = {'local': "로컬 NoSQL", 'sqlite': "로컬 SQLite"}.get(db_mode, "AWS DynamoDB")
     print(f"✓ {mode_name} 연결 성공")
 except Exception as e:
     print(f"✗ 데이터베이스 연결 실패: {e}")
-    print("환경 변수를 확인하세요. (DB_MODE=local 또는 aws)")
+    print("환경 변수를 확인하세요. (DB_MODE=local, sqlite 또는 aws)")
     exit(1)
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# 부서 목록('departments') / 부서별 이벤트(('events', 부서 ID)) 버전 (ETag용)
+versions = get_version_counters()
+
+# 버전(ETag)별로 미리 직렬화한 응답 본문 (워커가 여럿이면 ETag 교체 주기보다 오래 보관하지 않음)
+response_cache = ResponseCache(int(os.environ.get('RESPONSE_CACHE_SIZE', '256')), versions.max_age)
+
+# 재접속 폭주 대비: 같은 동기화 요청은 한 번만 읽고, 동시 읽기 수는 제한
+sync_flight = SingleFlight(socketio.server.eio.create_event)
+sync_admission = get_admission_control(socketio.server.eio.create_event)
+
+# 이벤트 페이지 조회 최대 크기
+MAX_PAGE_SIZE = 1000
+
+# 일괄 변경 요청 하나에 담을 수 있는 최대 작업 수
+MAX_BATCH_OPERATIONS = 1000
+
+
+def parse_page_args(params):
+    """
+    limit/cursor 파라미터 파싱
+    
+    Returns:
+        (limit, cursor) - 둘 다 없으면 (None, None)
+    
+    Raises:
+        ValueError: limit이 1~MAX_PAGE_SIZE 범위의 정수가 아닌 경우
+    """
+    limit = params.get('limit')
+    cursor = params.get('cursor') or None
+    
+    if limit is None or limit == '':
+        return (MAX_PAGE_SIZE if cursor else None), cursor
+    
+    try:
+        limit = int(limit)
+    except (TypeError, ValueError):
+        raise ValueError('limit은 정수여야 합니다.')
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ValueError(f'limit은 1~{MAX_PAGE_SIZE} 사이여야 합니다.')
+    return limit, cursor
+
+
+def parse_window_args(params):
+    """
+    from/to 날짜 범위 파라미터 파싱 (YYYY-MM-DD, 양 끝 포함)
+    
+    Returns:
+        (from, to) - 둘 다 없으면 (None, None)
+    
+    Raises:
+        ValueError: 한쪽만 있거나 형식이 틀렸거나 from이 to보다 늦은 경우
+    """
+    start = params.get('from') or None
+    end = params.get('to') or None
+    if start is None and end is None:
+        return None, None
+    if start is None or end is None:
+        raise ValueError('from과 to는 함께 지정해야 합니다.')
+    
+    try:
+        start_day = date.fromisoformat(start)
+        end_day = date.fromisoformat(end)
+    except (TypeError, ValueError):
+        raise ValueError('from/to는 YYYY-MM-DD 형식이어야 합니다.')
+    if start_day > end_day:
+        raise ValueError('from은 to보다 늦을 수 없습니다.')
+    return start_day.isoformat(), end_day.isoformat()
+
+
+def parse_batch_operations(data):
+    """
+    일괄 변경 요청 본문의 operations 검증
+    
+    Returns:
+        모델에 넘길 작업 목록 (op, id와 이벤트 속성만 남김)
+    
+    Raises:
+        ValueError: 형식이 틀렸거나, 필수 항목이 없거나, 같은 ID가 두 번 나오는 경우
+    """
+    operations = (data or {}).get('operations')
+    if not isinstance(operations, list) or not operations:
+        raise ValueError('operations 목록이 필요합니다.')
+    if len(operations) > MAX_BATCH_OPERATIONS:
+        raise ValueError(f'operations는 최대 {MAX_BATCH_OPERATIONS}개까지 보낼 수 있습니다.')
+    
+    parsed = []
+    seen_ids = set()
+    for index, operation in enumerate(operations):
+        if not isinstance(operation, dict):
+            raise ValueError(f'operations[{index}]: 객체여야 합니다.')
+        op = operation.get('op')
+        fields = {name: operation[name] for name in Event.BATCH_FIELDS if operation.get(name) is not None}
+        
+        if op == 'create':
+            if not fields.get('event_date') or not fields.get('title'):
+                raise ValueError(f'operations[{index}]: 날짜와 제목은 필수입니다.')
+            parsed.append({'op': op, **fields})
+            continue
+        if op not in ('update', 'delete'):
+            raise ValueError(f"operations[{index}]: op는 create, update, delete 중 하나여야 합니다.")
+        
+        event_id = operation.get('id')
+        if not event_id:
+            raise ValueError(f'operations[{index}]: id가 필요합니다.')
+        if event_id in seen_ids:
+            raise ValueError(f'operations[{index}]: 같은 이벤트({event_id})를 두 번 변경할 수 없습니다.')
+        seen_ids.add(event_id)
+        if op == 'update' and not fields:
+            raise ValueError(f'operations[{index}]: 수정할 항목이 없습니다.')
+        parsed.append({'op': op, 'id': event_id, **(fields if op == 'update' else {})})
+    return parsed
+
+
+def get_department_sync(department_id, params):
+    """
+    부서 이벤트 동기화 응답 본문 (REST / sync_request 공통)
+    
+    since가 있으면 그 이후 변경분(events)과 삭제된 ID(deleted)만,
+    없으면 전체 목록 또는 limit/cursor 페이지를 반환합니다.
+    from/to를 주면 그 날짜 범위의 이벤트만 대상으로 합니다.
+    
+    Raises:
+        ValueError: 잘못된 파라미터
+    """
+    since = params.get('since') or None
+    limit, cursor = parse_page_args(params)
+    start, end = parse_window_args(params)
+    window = {'from': start, 'to': end} if start else {}
+    
+    if since:
+        if limit is not None:
+            raise ValueError('since는 limit/cursor와 함께 사용할 수 없습니다.')
+        changes = event_model.get_changes(department_id, since, start, end)
+        if changes is not None:
+            events, deleted_ids, sync_cursor = changes
+            return {
+                'events': events,
+                'deleted': deleted_ids,
+                'sync_cursor': sync_cursor,
+                'full': False,
+                **window
+            }
+        # 커서가 너무 오래됐으면 전체 목록으로 다시 동기화
+    
+    if limit is None:
+        sync_cursor = event_model.sync_cursor()
+        if start:
+            events = event_model.get_by_date_range(department_id, start, end)
+        else:
+            events = event_model.get_by_department(department_id)
+        return {
+            'events': events,
+            'deleted': [],
+            'sync_cursor': sync_cursor,
+            'full': True,
+            **window
+        }
+    
+    events, next_cursor = event_model.get_by_department_page(department_id, limit, cursor, start, end)
+    return {
+        'events': events,
+        'next_cursor': next_cursor,
+        **window
+    }
+
+
+def encode_payload(cache_key, tag, build, cacheable=True):
+    """
+    응답 본문 직렬화
+    cacheable이면 response_cache에 tag(ETag)별로 보관해 같은 버전의 다음 요청에서 재사용합니다.
+    (ETAG_MAX_AGE(기본 5초)가 지난 본문은 다시 만듦)
+    """
+    if not cacheable:
+        return EncodedPayload(encode_json(build()))
+    return response_cache.get_or_build(cache_key, tag, build)
+
+
+def encode_sync_payload(cache_key, tag, build, cacheable=True):
+    """
+    동기화 응답 본문 직렬화 (부하 제어 포함)
+    
+    같은 키/버전의 요청이 진행 중이면 그 결과를 함께 받고,
+    데이터베이스 읽기(build)는 sync_admission의 동시 처리 수 안에서만 실행합니다.
+    
+    Raises:
+        Overloaded: 대기열까지 찬 경우 (retry_after 포함)
+        ValueError: 잘못된 파라미터
+    """
+    def admitted_build():
+        return sync_admission.run(build)
+    
+    if not cacheable:
+        return encode_payload(cache_key, tag, admitted_build, cacheable=False)
+    return sync_flight.do((cache_key, tag), lambda: encode_payload(cache_key, tag, admitted_build))
+
+
+def encoded_response(payload):
+    """직렬화된 본문으로 JSON 응답 (Accept-Encoding에 gzip이 있으면 압축된 본문)"""
+    response = app.response_class(mimetype='application/json')
+    if len(payload.body) >= GZIP_MIN_SIZE and request.accept_encodings['gzip']:
+        response.set_data(payload.gzip_body)
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response.set_data(payload.body)
+    response.vary.add('Accept-Encoding')
+    return response
+
+
+def conditional_response(version_key, build):
+    """
+    ETag 조건부 응답
+    If-None-Match가 현재 버전의 ETag와 같으면 데이터베이스를 읽지 않고 304를 반환합니다.
+    
+    Args:
+        version_key: 응답 내용이 의존하는 버전 키
+        build: ETag를 받아 응답 객체를 만드는 함수 (ETag가 맞지 않을 때만 호출)
+    """
+    # 읽기 전에 버전을 확인해야 읽는 도중의 쓰기가 다음 요청에서 반드시 감지됨
+    etag = versions.etag(version_key, request.query_string)
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = app.make_response(build(etag))
+        if response.status_code != 200:
+            return response
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
 
 # ==================== REST API 엔드포인트 ====================
 
@@ -49,18 +311,88 @@ def index():
     return jsonify({
         'status': 'running',
         'message': f'캘린더 동기화 서버가 실행 중입니다. (모드: {db_mode})',
-        'version': '2.0.0'
+        'version': '2.0.0',
+        'cache': model_cache.stats() if model_cache else None,
+        'throttle': db.throttle_stats() if hasattr(db, 'throttle_stats') else None,
+        'response_cache': response_cache.stats(),
+        'broadcast': broadcaster.stats(),
+        'sync_admission': {**sync_admission.stats(), 'single_flight': sync_flight.stats()},
+        'slow_log': tracer.stats()
     })
 
 
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus 형식 지표"""
+    return app.response_class(metrics.render(), content_type=CONTENT_TYPE)
+
+
+def admin_error():
+    """
+    관리자 토큰(X-Admin-Token 헤더) 확인
+    
+    Returns:
+        거절 응답, 통과하면 None
+    """
+    token = os.environ.get('ADMIN_TOKEN')
+    if not token or profiler is None:
+        return jsonify({
+            'success': False,
+            'message': 'ADMIN_TOKEN이 설정되지 않아 관리자 API를 사용할 수 없습니다.'
+        }), 404
+    if not hmac.compare_digest(request.headers.get('X-Admin-Token', ''), token):
+        return jsonify({
+            'success': False,
+            'message': '관리자 토큰이 올바르지 않습니다.'
+        }), 403
+    return None
+
+
+@app.route('/admin/profile', methods=['GET'])
+def profile_status():
+    """샘플링 프로파일러 상태 (남은 요청 수, 마지막 저장 파일)"""
+    error = admin_error()
+    if error is not None:
+        return error
+    return jsonify({'success': True, **profiler.status()})
+
+
+@app.route('/admin/profile', methods=['POST'])
+def start_profile():
+    """
+    다음 N개 요청(REST/Socket.IO 핸들러) 프로파일링
+    끝나면 PROFILE_DIR에 collapsed stack 파일을 저장합니다.
+    """
+    error = admin_error()
+    if error is not None:
+        return error
+    
+    requests_count = (request.get_json(silent=True) or {}).get('requests', 100)
+    if not isinstance(requests_count, int) or isinstance(requests_count, bool) or not 1 <= requests_count <= 10000:
+        return jsonify({
+            'success': False,
+            'message': 'requests는 1~10000 사이의 정수여야 합니다.'
+        }), 400
+    
+    if not profiler.start(requests_count):
+        return jsonify({
+            'success': False,
+            'message': '이미 프로파일링 중입니다.',
+            **profiler.status()
+        }), 409
+    
+    return jsonify({'success': True, **profiler.status()}), 202
+
+
 @app.route('/api/departments', methods=['GET'])
 def get_departments():
-    """모든 부서 목록 조회"""
-    departments = department_model.get_all()
-    return jsonify({
-        'success': True,
-        'departments': departments
-    })
+    """모든 부서 목록 조회 (If-None-Match 지원)"""
+    return conditional_response('departments', lambda etag: encoded_response(
+        encode_payload('departments', etag, lambda: {
+            'success': True,
+            'departments': department_model.get_all()
+        })
+    ))
 
 
 @app.route('/api/departments', methods=['POST'])
@@ -79,6 +411,7 @@ def create_department():
     department_id = department_model.create(name, description)
     
     if department_id:
+        versions.bump('departments')
         department = department_model.get_by_id(department_id)
         # 모든 클라이언트에게 새 부서 생성 알림
         socketio.emit('department_created', department)
@@ -97,6 +430,7 @@ def create_department():
 def delete_department(department_id):
     """부서 삭제"""
     if department_model.delete(department_id):
+        versions.bump('departments', ('events', department_id))
         # 모든 클라이언트에게 부서 삭제 알림
         socketio.emit('department_deleted', {'id': department_id})
         return jsonify({
@@ -112,12 +446,33 @@ def delete_department(department_id):
 
 @app.route('/api/events/<department_id>', methods=['GET'])
 def get_events(department_id):
-    """특정 부서의 모든 이벤트 조회"""
-    events = event_model.get_by_department(department_id)
-    return jsonify({
-        'success': True,
-        'events': events
-    })
+    """
+    특정 부서의 이벤트 조회 (If-None-Match 지원)
+    limit/cursor를 주면 페이지 단위, since를 주면 변경분만, from/to를 주면 날짜 범위만
+    """
+    def build(etag):
+        try:
+            # since 요청은 클라이언트마다 커서가 달라 재사용되지 않으므로 보관하지 않음
+            payload = encode_sync_payload(
+                ('events', department_id, request.query_string), etag,
+                lambda: {'success': True, **get_department_sync(department_id, request.args)},
+                cacheable=not request.args.get('since')
+            )
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'message': str(e)
+            }), 400
+        except Overloaded as e:
+            return jsonify({
+                'success': False,
+                'message': str(e),
+                'retry_after': e.retry_after
+            }), 503, {'Retry-After': str(e.retry_after)}
+        
+        return encoded_response(payload)
+    
+    return conditional_response(('events', department_id), build)
 
 
 @app.route('/api/events/<department_id>', methods=['POST'])
@@ -140,9 +495,10 @@ def create_event(department_id):
     event_id = event_model.create(department_id, event_date, title, description, time, url)
     
     if event_id:
+        versions.bump(('events', department_id))
         event = event_model.get_by_id(event_id)
         # 같은 부서 그룹에게 이벤트 생성 알림
-        socketio.emit('event_created', event, room=f'dept_{department_id}')
+        broadcaster.publish(f'dept_{department_id}', 'event_created', event)
         return jsonify({
             'success': True,
             'event': event
@@ -154,6 +510,44 @@ def create_event(department_id):
         }), 500
 
 
+@app.route('/api/events/<department_id>/batch', methods=['POST'])
+def batch_events(department_id):
+    """
+    이벤트 일괄 생성/수정/삭제
+    한 번의 일괄 쓰기로 처리하고, 부서 그룹에는 events_batch 알림을 한 번만 보냅니다.
+    """
+    try:
+        operations = parse_batch_operations(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    result = event_model.apply_batch(department_id, operations)
+    if result is None:
+        return jsonify({
+            'success': False,
+            'message': '이벤트 일괄 변경에 실패했습니다.'
+        }), 500
+    
+    changes = {key: result[key] for key in ('created', 'updated', 'deleted')}
+    if any(changes.values()):
+        versions.bump(('events', department_id))
+        # 같은 부서 그룹에게 변경 전체를 한 번에 알림
+        broadcaster.publish_many(f'dept_{department_id}', [
+            *[('event_created', event) for event in result['created']],
+            *[('event_updated', event) for event in result['updated']],
+            *[('event_deleted', {'id': event_id, 'department_id': department_id})
+              for event_id in result['deleted']]
+        ])
+    
+    return jsonify({
+        'success': True,
+        **result
+    })
+
+
 @app.route('/api/events/<event_id>', methods=['PUT'])
 def update_event(event_id):
     """이벤트 수정"""
@@ -180,9 +574,10 @@ def update_event(event_id):
     )
     
     if updated:
+        versions.bump(('events', department_id))
         updated_event = event_model.get_by_id(event_id)
         # 같은 부서 그룹에게 이벤트 수정 알림
-        socketio.emit('event_updated', updated_event, room=f'dept_{department_id}')
+        broadcaster.publish(f'dept_{department_id}', 'event_updated', updated_event)
         return jsonify({
             'success': True,
             'event': updated_event
@@ -208,11 +603,12 @@ def delete_event(event_id):
     department_id = event['department_id']
     
     if event_model.delete(event_id):
+        versions.bump(('events', department_id))
         # 같은 부서 그룹에게 이벤트 삭제 알림
-        socketio.emit('event_deleted', {
+        broadcaster.publish(f'dept_{department_id}', 'event_deleted', {
             'id': event_id,
             'department_id': department_id
-        }, room=f'dept_{department_id}')
+        })
         return jsonify({
             'success': True,
             'message': '이벤트가 삭제되었습니다.'
@@ -227,19 +623,22 @@ def delete_event(event_id):
 # ==================== WebSocket 이벤트 핸들러 ====================
 
 @socketio.on('connect')
-def handle_connect():
-    """클라이언트 연결"""
+@tracer.socket_handler('connect')
+def handle_connect(auth=None):
+    """클라이언트 연결 (추적 데코레이터가 인자를 그대로 넘기므로 auth를 받음)"""
     logger.info(f'클라이언트 연결됨: {request.sid}')
     emit('connected', {'message': '서버에 연결되었습니다.'})
 
 
 @socketio.on('disconnect')
+@tracer.socket_handler('disconnect')
 def handle_disconnect():
     """클라이언트 연결 해제"""
     logger.info(f'클라이언트 연결 해제됨: {request.sid}')
 
 
 @socketio.on('join_department')
+@tracer.socket_handler('join_department')
 def handle_join_department(data):
     """부서 그룹 참여"""
     department_id = data.get('department_id')
@@ -255,6 +654,7 @@ def handle_join_department(data):
 
 
 @socketio.on('leave_department')
+@tracer.socket_handler('leave_department')
 def handle_leave_department(data):
     """부서 그룹 나가기"""
     department_id = data.get('department_id')
@@ -270,16 +670,37 @@ def handle_leave_department(data):
 
 
 @socketio.on('sync_request')
+@tracer.socket_handler('sync_request')
 def handle_sync_request(data):
     """동기화 요청 처리"""
     department_id = data.get('department_id')
     
     if department_id:
-        events = event_model.get_by_department(department_id)
-        emit('sync_response', {
-            'department_id': department_id,
-            'events': events
-        })
+        # REST의 쿼리 문자열에 해당하는 요청 변형 (같은 버전, 같은 변형이면 직렬화 결과 재사용)
+        variant = json.dumps({key: data.get(key) for key in ('limit', 'cursor', 'from', 'to')},
+                             sort_keys=True).encode('utf-8')
+        try:
+            response = encode_sync_payload(
+                ('sync', department_id, variant), versions.etag(('events', department_id), variant),
+                lambda: {'department_id': department_id, **get_department_sync(department_id, data)},
+                cacheable=not data.get('since')
+            )
+        except ValueError as e:
+            emit('sync_error', {
+                'department_id': department_id,
+                'message': str(e)
+            })
+            return
+        except Overloaded as e:
+            # 클라이언트는 retry_after초 뒤에 다시 sync_request를 보내야 함
+            emit('sync_error', {
+                'department_id': department_id,
+                'message': str(e),
+                'retry_after': e.retry_after
+            })
+            return
+        
+        emit('sync_response', response)
         logger.info(f'클라이언트 {request.sid}에게 부서 {department_id}의 이벤트 동기화 완료')
 
 
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+DynamoDB 응답 역직렬화 마이크로벤치마크
+10,000개 항목 페이지에 대해 Event.get_by_department 한 번의 CPU 시간을 비교합니다.
+- resource: boto3 TypeDeserializer(Decimal) + 모델의 Decimal 변환
+- client: 저수준 client 응답을 dynamodb_fast로 한 번에 기본 타입으로 변환
+
+AWS에 연결하지 않고 미리 만든 응답 페이지를 돌려주는 가짜 client/Table을 사용합니다.
+
+사용법:
+    python benchmark_dynamodb.py
+"""
+
+import time
+import uuid
+from types import SimpleNamespace
+
+from boto3.dynamodb.types import TypeDeserializer
+
+from dynamodb_fast import FastTable
+from models import Event
+
+PAGE_ITEMS = 10000
+REPEAT = 20
+
+
+def make_wire_item(n):
+    """저수준 client 응답 형식(AttributeValue)의 이벤트 항목"""
+    return {
+        'id': {'S': str(uuid.uuid4())},
+        'department_id': {'S': 'target'},
+        'event_date': {'S': f'2024-{n % 12 + 1:02d}-{n % 28 + 1:02d}'},
+        'title': {'S': f'벤치마크 이벤트 {n}'},
+        'description': {'S': '주간 회의'},
+        'time': {'S': '오후 2:00'},
+        'url': {'S': ''},
+        'priority': {'N': str(n % 5)},
+        'duration': {'N': '1.5'},
+        'created_at': {'S': '2024-01-01T00:00:00'},
+        'last_modified': {'S': '2024-01-01T00:00:00'}
+    }
+
+
+class StubClient:
+    """query마다 같은 페이지를 돌려주는 가짜 저수준 client"""
+
+    def __init__(self, items):
+        self.items = items
+
+    def query(self, **kwargs):
+        return {'Items': list(self.items), 'Count': len(self.items)}
+
+
+class StubResourceTable:
+    """boto3 resource Table처럼 응답을 Decimal 기반으로 역직렬화하는 가짜 Table"""
+
+    def __init__(self, client):
+        self.client = client
+        self.deserializer = TypeDeserializer()
+
+    def query(self, **kwargs):
+        response = self.client.query(**kwargs)
+        response['Items'] = [self.deserializer.deserialize({'M': item}) for item in response['Items']]
+        return response
+
+
+def measure(event_model):
+    """get_by_department 1회 평균 CPU 시간 (ms)"""
+    event_model.get_by_department('target')  # 준비
+    start = time.process_time()
+    for _ in range(REPEAT):
+        event_model.get_by_department('target')
+    return (time.process_time() - start) / REPEAT * 1000
+
+
+def make_model(table):
+    return Event(SimpleNamespace(get_events_table=lambda: table))
+
+
+def main():
+    """메인 함수"""
+    client = StubClient([make_wire_item(n) for n in range(PAGE_ITEMS)])
+
+    resource_model = make_model(StubResourceTable(client))
+    fast_model = make_model(FastTable(SimpleNamespace(name='events'), client))
+
+    assert resource_model.get_by_department('target') == fast_model.get_by_department('target')
+
+    resource_ms = measure(resource_model)
+    fast_ms = measure(fast_model)
+
+    print("DynamoDB 응답 역직렬화 벤치마크")
+    print(f"페이지 항목: {PAGE_ITEMS:,}개, 반복: {REPEAT}회\n")
+    print(f"{'경로':>10} | {'get_by_department CPU(ms)':>26}")
+    print("-" * 40)
+    print(f"{'resource':>10} | {resource_ms:>26.1f}")
+    print(f"{'client':>10} | {fast_ms:>26.1f}")
+    print(f"\nCPU 시간 {(1 - fast_ms / resource_ms) * 100:.0f}% 감소 ({resource_ms / fast_ms:.1f}배)")
+
+
+if __name__ == "__main__":
+    main()
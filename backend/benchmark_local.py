@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+로컬 NoSQL 저장소 벤치마크
+- query: 다른 부서의 이벤트 수가 늘어나도 부서별 쿼리 지연 시간이 일정한지 확인합니다.
+- stress: 여러 프로세스가 동시에 쓸 때 유실되는 쓰기가 없는지 확인합니다.
+
+사용법:
+    python benchmark_local.py [query|stress]
+"""
+
+import json
+import multiprocessing
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+from local_nosql import LocalDynamoDBDatabase
+
+# 측정 대상 부서의 이벤트 수와 다른 부서 이벤트 수 단계
+TARGET_EVENTS = 200
+OTHER_EVENT_STEPS = [1000, 10000, 50000, 100000]
+OTHER_DEPARTMENTS = 50
+REPEAT = 200
+
+# 동시 쓰기 검증: 프로세스 수와 프로세스별 쓰기 횟수
+STRESS_WRITERS = 8
+STRESS_WRITES = 100
+
+
+def make_event(department_id, day):
+    """테스트 이벤트 생성"""
+    return {
+        'id': str(uuid.uuid4()),
+        'department_id': department_id,
+        'event_date': f'2024-{day % 12 + 1:02d}-{day % 28 + 1:02d}',
+        'title': '벤치마크 이벤트',
+        'description': '',
+        'time': '',
+        'url': ''
+    }
+
+
+def build_table(data_dir, other_events):
+    """대상 부서 + 다른 부서 이벤트로 테이블 파일 생성"""
+    events = {}
+    for day in range(TARGET_EVENTS):
+        event = make_event('target', day)
+        events[event['id']] = event
+    for n in range(other_events):
+        event = make_event(f'dept-{n % OTHER_DEPARTMENTS}', n)
+        events[event['id']] = event
+
+    data_path = Path(data_dir)
+    data_path.mkdir(exist_ok=True)
+    with open(data_path / 'events.json', 'w', encoding='utf-8') as f:
+        json.dump(events, f, ensure_ascii=False)
+
+
+def measure(fn):
+    """평균 실행 시간 (ms)"""
+    fn()  # 캐시/인덱스 준비
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        fn()
+    return (time.perf_counter() - start) / REPEAT * 1000
+
+
+def run_query_benchmark():
+    """부서별 쿼리 지연 시간 측정"""
+    print("로컬 NoSQL 부서별 쿼리 벤치마크")
+    print(f"대상 부서 이벤트: {TARGET_EVENTS}개, 반복: {REPEAT}회\n")
+    print(f"{'다른 부서 이벤트':>16} | {'인덱스 쿼리(ms)':>16} | {'범위 쿼리(ms)':>14} | {'전체 평가(ms)':>14}")
+    print("-" * 72)
+
+    for other_events in OTHER_EVENT_STEPS:
+        with tempfile.TemporaryDirectory() as data_dir:
+            build_table(data_dir, other_events)
+            table = LocalDynamoDBDatabase(data_dir).get_events_table()
+
+            indexed = measure(lambda: table.query(
+                IndexName='department-date-index',
+                KeyConditionExpression='department_id = :dept_id',
+                ExpressionAttributeValues={':dept_id': 'target'}
+            ))
+            ranged = measure(lambda: table.query(
+                IndexName='department-date-index',
+                KeyConditionExpression='department_id = :dept_id AND event_date BETWEEN :start AND :end',
+                ExpressionAttributeValues={':dept_id': 'target', ':start': '2024-03-01', ':end': '2024-03-31'}
+            ))
+            # 인덱스 없이 전체 항목을 평가하는 기존 경로
+            linear = measure(lambda: table.query(
+                KeyConditionExpression='department_id = :dept_id',
+                ExpressionAttributeValues={':dept_id': 'target'}
+            ))
+
+            print(f"{other_events:>16,} | {indexed:>16.3f} | {ranged:>14.3f} | {linear:>14.3f}")
+
+
+def stress_writer(data_dir, storage, writer_id):
+    """카운터 증가(읽기-수정-쓰기)와 새 항목 추가를 반복"""
+    table = LocalDynamoDBDatabase(data_dir, storage).get_events_table()
+    for n in range(STRESS_WRITES):
+        table.update_item(
+            Key={'id': 'counter'},
+            UpdateExpression='SET hits = hits + :one',
+            ExpressionAttributeValues={':one': 1}
+        )
+        table.put_item(Item={'id': f'w{writer_id}-{n}', 'department_id': 'stress'})
+
+
+def run_stress_test():
+    """동시 쓰기 프로세스 간 유실 여부 확인"""
+    print("로컬 NoSQL 동시 쓰기 검증")
+    print(f"쓰기 프로세스: {STRESS_WRITERS}개, 프로세스별 쓰기: {STRESS_WRITES}회\n")
+
+    expected = STRESS_WRITERS * STRESS_WRITES
+    ok = True
+    for storage in ('json', 'journal'):
+        with tempfile.TemporaryDirectory() as data_dir:
+            table = LocalDynamoDBDatabase(data_dir, storage).get_events_table()
+            table.put_item(Item={'id': 'counter', 'hits': 0})
+
+            start = time.perf_counter()
+            workers = [
+                multiprocessing.Process(target=stress_writer, args=(data_dir, storage, writer_id))
+                for writer_id in range(STRESS_WRITERS)
+            ]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - start
+
+            hits = table.get_item(Key={'id': 'counter'})['Item']['hits']
+            items = len(table.scan()['Items']) - 1
+            passed = hits == expected and items == expected
+            ok = ok and passed
+            print(f"{storage:>8} | 카운터 {hits}/{expected} | 항목 {items}/{expected} | "
+                  f"{elapsed:.2f}s | {'통과' if passed else '실패'}")
+
+    return ok
+
+
+def main():
+    """메인 함수"""
+    command = sys.argv[1] if len(sys.argv) > 1 else 'query'
+    if command == 'query':
+        run_query_benchmark()
+    elif command == 'stress':
+        if not run_stress_test():
+            sys.exit(1)
+    else:
+        print("사용법: python benchmark_local.py [query|stress]")
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
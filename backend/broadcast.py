@@ -0,0 +1,158 @@
+"""
+부서 방(room) 이벤트 알림 묶음 전송
+event_created / event_updated / event_deleted 알림을 방별로 잠시(window) 모았다가 한 프레임으로 보냅니다.
+같은 이벤트의 알림은 마지막 상태 하나로 합치고, 접속자가 없는 방의 알림은 직렬화하지 않고 버립니다.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+from socketio import PubSubManager
+
+# 알림 이름 -> events_batch 프레임의 필드
+CHANGE_FIELDS = {
+    'event_created': 'created',
+    'event_updated': 'updated',
+    'event_deleted': 'deleted'
+}
+
+
+class BroadcastScheduler:
+    """
+    방별 알림 버퍼
+
+    window가 0이면 모으지 않고 바로 보냅니다 (여러 건을 한 번에 넘기면 events_batch 한 프레임).
+    모인 알림이 하나면 원래 이름(event_created 등)으로, 둘 이상이면 events_batch로 보냅니다.
+    """
+
+    def __init__(self, socketio, window: float = 0, namespace: str = '/'):
+        self.socketio = socketio
+        self.window = window
+        self.namespace = namespace
+        self._pending = {}  # room -> [받은 알림 수, OrderedDict(event_id -> (알림 이름, 데이터))]
+        self._lock = threading.Lock()
+        self.published = 0
+        self.frames = 0
+        self.frames_saved = 0
+        self.skipped = 0
+
+    def has_members(self, room: str) -> bool:
+        """
+        방 접속자가 있는지 여부
+
+        메시지 큐를 쓰면 다른 워커의 접속자를 알 수 없으므로 항상 True입니다.
+        """
+        manager = self.socketio.server.manager
+        if isinstance(manager, PubSubManager):
+            return True
+        return bool(manager.rooms.get(self.namespace, {}).get(room))
+
+    def publish(self, room: str, event_name: str, payload: Dict):
+        """이벤트 알림 하나 보내기 (event_name은 CHANGE_FIELDS의 키)"""
+        self.publish_many(room, [(event_name, payload)])
+
+    def publish_many(self, room: str, changes: List[Tuple[str, Dict]]):
+        """여러 이벤트 알림을 한 프레임으로 보내기 (window 안의 다른 알림과도 합침)"""
+        if not changes:
+            return
+        with self._lock:
+            self.published += len(changes)
+
+        if not self.has_members(room):
+            with self._lock:
+                self.skipped += len(changes)
+            return
+
+        if self.window <= 0:
+            self._send(room, len(changes), self._merge(OrderedDict(), changes))
+            return
+
+        with self._lock:
+            entry = self._pending.get(room)
+            schedule = entry is None
+            if schedule:
+                entry = self._pending[room] = [0, OrderedDict()]
+            entry[0] += len(changes)
+            self._merge(entry[1], changes)
+
+        if schedule:
+            self.socketio.start_background_task(self._flush_later, room)
+
+    @staticmethod
+    def _merge(buffer: OrderedDict, changes: List[Tuple[str, Dict]]) -> OrderedDict:
+        """
+        이벤트 ID별로 마지막 상태만 남기기
+
+        생성 후 수정은 (수정된 내용의) 생성으로, 생성 후 삭제는 아무 알림도 남기지 않습니다.
+        """
+        for event_name, payload in changes:
+            event_id = payload['id']
+            previous = buffer.pop(event_id, None)
+            if previous is not None and previous[0] == 'event_created':
+                if event_name == 'event_deleted':
+                    continue
+                event_name = 'event_created'
+            buffer[event_id] = (event_name, payload)
+        return buffer
+
+    def _flush_later(self, room: str):
+        self.socketio.sleep(self.window)
+        self.flush(room)
+
+    def flush(self, room: str = None):
+        """모아 둔 알림 즉시 전송 (room을 주지 않으면 모든 방)"""
+        with self._lock:
+            rooms = [room] if room is not None else list(self._pending)
+            entries = [(name, self._pending.pop(name)) for name in rooms if name in self._pending]
+
+        for name, (received, buffer) in entries:
+            # 모으는 동안 모두 나갔으면 보내지 않음
+            if not self.has_members(name):
+                with self._lock:
+                    self.skipped += received
+                continue
+            self._send(name, received, buffer)
+
+    def _send(self, room: str, received: int, buffer: OrderedDict):
+        """버퍼를 한 프레임으로 전송"""
+        with self._lock:
+            if buffer:
+                self.frames += 1
+            self.frames_saved += received - (1 if buffer else 0)
+        if not buffer:
+            return
+
+        if len(buffer) == 1:
+            event_name, payload = next(iter(buffer.values()))
+            self.socketio.emit(event_name, payload, room=room)
+            return
+
+        frame = {'department_id': None, 'created': [], 'updated': [], 'deleted': []}
+        for event_name, payload in buffer.values():
+            frame['department_id'] = payload.get('department_id')
+            field = CHANGE_FIELDS[event_name]
+            frame[field].append(payload['id'] if field == 'deleted' else payload)
+        self.socketio.emit('events_batch', frame, room=room)
+
+    def stats(self) -> Dict:
+        """전송 통계 (frames_saved: 따로 보냈다면 필요했을 프레임 중 아낀 수)"""
+        with self._lock:
+            return {
+                'window_ms': int(self.window * 1000),
+                'published': self.published,
+                'frames': self.frames,
+                'frames_saved': self.frames_saved,
+                'skipped_empty_rooms': self.skipped,
+                'pending_rooms': len(self._pending)
+            }
+
+
+def get_broadcast_scheduler(socketio) -> BroadcastScheduler:
+    """
+    환경 변수로 알림 스케줄러 생성
+
+    BROADCAST_WINDOW_MS: 방별로 알림을 모으는 시간(밀리초), 0이면 바로 전송 (기본값: 0)
+    """
+    return BroadcastScheduler(socketio, float(os.environ.get('BROADCAST_WINDOW_MS', '0')) / 1000)
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+워커 간 Socket.IO 전달 확인 (다중 프로세스)
+로컬 브로커 1개와 서버 워커 2개를 띄우고, 워커 A에 접속한 클라이언트가
+워커 B로 보낸 REST 요청의 알림(event_created, events_batch)을 받는지 확인합니다.
+메시지 큐를 쓰면 자기 자신에게 보내는 응답(sync_response)도 큐를 거치므로 함께 확인합니다.
+
+두 워커는 같은 SQLite 파일을 사용합니다.
+Socket.IO 클라이언트용 requests, websocket-client가 필요합니다 (requirements.txt에 포함).
+
+사용법:
+    python check_message_queue.py
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+TIMEOUT = 10
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port: int):
+    deadline = time.time() + TIMEOUT
+    while time.time() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError(f'포트 {port}가 열리지 않았습니다.')
+
+
+def post(port: int, path: str, body: dict) -> dict:
+    request = urllib.request.Request(
+        f'http://127.0.0.1:{port}{path}',
+        data=json.dumps(body).encode('utf-8'),
+        headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(request, timeout=TIMEOUT) as response:
+        return json.loads(response.read())
+
+
+def run_worker(port: int):
+    """서버 워커 실행 (이 파일을 --worker로 실행했을 때)"""
+    import eventlet
+    eventlet.monkey_patch()
+
+    from app import app, socketio
+    socketio.run(app, host='127.0.0.1', port=port, log_output=False)
+
+
+def main():
+    """메인 함수"""
+    import socketio
+
+    broker_port, port_a, port_b = free_port(), free_port(), free_port()
+    processes = []
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        env = dict(os.environ,
+                   DB_MODE='sqlite',
+                   LOCAL_DATA_DIR=data_dir,
+                   SOCKETIO_MESSAGE_QUEUE=f'local://127.0.0.1:{broker_port}')
+        here = os.path.dirname(os.path.abspath(__file__))
+        try:
+            processes.append(subprocess.Popen(
+                [sys.executable, os.path.join(here, 'message_queue.py'), '--port', str(broker_port)],
+                env=env, stdout=subprocess.DEVNULL))
+            wait_for_port(broker_port)
+            # 스키마를 먼저 만들도록 워커를 차례로 시작
+            for port in (port_a, port_b):
+                processes.append(subprocess.Popen(
+                    [sys.executable, os.path.abspath(__file__), '--worker', str(port)],
+                    env=env, cwd=here, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+                wait_for_port(port)
+
+            department = post(port_b, '/api/departments', {'name': '메시지 큐 확인'})['department']
+
+            received = []
+            client = socketio.Client()
+            for name in ('event_created', 'events_batch', 'sync_response'):
+                client.on(name, lambda data, name=name: received.append((name, data)))
+            client.connect(f'http://127.0.0.1:{port_a}')
+            client.emit('join_department', {'department_id': department['id']})
+            time.sleep(0.5)
+
+            post(port_b, f"/api/events/{department['id']}", {'event_date': '2024-01-20', 'title': '워커 B 이벤트'})
+            post(port_b, f"/api/events/{department['id']}/batch", {'operations': [
+                {'op': 'create', 'event_date': '2024-01-21', 'title': '일괄 1'},
+                {'op': 'create', 'event_date': '2024-01-22', 'title': '일괄 2'}
+            ]})
+
+            deadline = time.time() + TIMEOUT
+            while len(received) < 2 and time.time() < deadline:
+                time.sleep(0.1)
+            client.emit('sync_request', {'department_id': department['id']})
+            while len(received) < 3 and time.time() < deadline:
+                time.sleep(0.1)
+            client.disconnect()
+
+            names = [name for name, _ in received]
+            print("워커 간 Socket.IO 전달 확인")
+            print(f"워커 A(:{port_a})에서 받은 알림: {names}")
+            if names != ['event_created', 'events_batch', 'sync_response'] or len(received[2][1]['events']) != 3:
+                print("✗ 실패: 워커 B의 알림이 워커 A의 접속자에게 전달되지 않았습니다.")
+                return 1
+            print("✓ 성공: 워커 B의 알림이 메시지 큐를 거쳐 워커 A의 접속자에게 전달되었습니다.")
+            return 0
+        finally:
+            for process in reversed(processes):
+                process.terminate()
+                process.wait()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == '--worker':
+        run_worker(int(sys.argv[2]))
+    else:
+        sys.exit(main())
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+eventlet 허브에서 데이터베이스 호출이 겹쳐 실행되는지 확인
+이벤트 조회마다 0.2초 막히는(blocking) 지연을 넣고 서로 다른 부서를 동시에 조회해,
+tpool로 넘긴 경우(기본값)와 허브에서 직접 실행한 경우의 전체 시간과 허브 최대 정지 시간을 비교합니다.
+
+로컬 NoSQL 저장소(임시 디렉터리)를 사용합니다.
+
+사용법:
+    python check_nonblocking_io.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+CONCURRENT = 8
+DELAY = 0.2
+
+
+def measure(client, department_ids):
+    """동시 조회 전체 시간과 그동안의 허브 최대 정지 시간 (초)"""
+    import eventlet
+
+    stalls = []
+    running = [True]
+
+    def heartbeat():
+        # 허브가 막히지 않으면 10ms마다 깨어남
+        last = time.monotonic()
+        while running[0]:
+            eventlet.sleep(0.01)
+            now = time.monotonic()
+            stalls.append(now - last - 0.01)
+            last = now
+
+    ticker = eventlet.spawn(heartbeat)
+    start = time.monotonic()
+    pool = eventlet.GreenPool(CONCURRENT)
+    statuses = list(pool.imap(lambda department_id: client.get(f'/api/events/{department_id}').status_code,
+                              department_ids))
+    elapsed = time.monotonic() - start
+    running[0] = False
+    ticker.wait()
+
+    assert statuses == [200] * len(department_ids), statuses
+    return elapsed, max(stalls, default=0)
+
+
+def main():
+    """메인 함수"""
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ.update(DB_MODE='local', LOCAL_DATA_DIR=data_dir, MODEL_CACHE_TTL='0',
+                          SYNC_MAX_ACTIVE=str(CONCURRENT))
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        import app as app_module
+        from cooperative_io import OffloadedModel
+        from models import Event
+
+        if not isinstance(app_module.event_model, OffloadedModel):
+            print("✗ 모델 호출이 tpool로 넘어가지 않습니다 (DB_OFFLOAD=0 이거나 eventlet이 monkey patch됨).")
+            return 1
+
+        # 느린 데이터베이스 흉내: 조회마다 스레드를 막는 지연
+        load_by_department = Event._load_by_department
+
+        def slow_load(self, department_id):
+            time.sleep(DELAY)
+            return load_by_department(self, department_id)
+        Event._load_by_department = slow_load
+
+        client = app_module.app.test_client()
+
+        def new_departments(prefix):
+            return [client.post('/api/departments', json={'name': f'{prefix} {n}'}).get_json()['department']['id']
+                    for n in range(CONCURRENT)]
+
+        offloaded = measure(client, new_departments('tpool'))
+
+        # 같은 모델을 허브에서 직접 호출
+        app_module.event_model = app_module.event_model._model
+        blocking = measure(client, new_departments('hub'))
+
+    print("eventlet 허브 비차단 I/O 확인")
+    print(f"동시 조회: {CONCURRENT}개, 조회당 지연: {DELAY}초\n")
+    print(f"{'실행 위치':>10} | {'전체 시간(s)':>12} | {'허브 최대 정지(s)':>16}")
+    print("-" * 46)
+    print(f"{'tpool':>10} | {offloaded[0]:>12.2f} | {offloaded[1]:>16.3f}")
+    print(f"{'허브':>10} | {blocking[0]:>12.2f} | {blocking[1]:>16.3f}")
+
+    # 겹쳐 실행되면 전체 시간이 지연 몇 번 수준, 직렬이면 CONCURRENT배
+    if offloaded[0] < DELAY * CONCURRENT / 2 and offloaded[1] < DELAY:
+        print("\n✓ 성공: 동시 요청이 겹쳐 실행되고 허브가 막히지 않았습니다.")
+        return 0
+    print("\n✗ 실패: 동시 요청이 직렬로 실행되었습니다.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+"""
+DynamoDB 스로틀링 처리 확인
+프로비저닝 용량을 넘으면 ProvisionedThroughputExceededException을 내는 가짜 테이블에
+여러 스레드로 이벤트를 한꺼번에 생성해
+- 그대로 호출한 경우: 실패(유실)한 생성 수
+- throttling.py로 감싼 경우: 실패 수와 스로틀링/재시도/대기 횟수
+를 비교합니다. AWS에 연결하지 않습니다.
+
+사용법:
+    python check_throttling.py
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from botocore.exceptions import ClientError
+
+from models import Event
+from throttling import TokenBucket, throttled_table
+
+WRITE_CAPACITY = 100
+EVENTS = 400
+THREADS = 16
+
+
+class CapacityStubTable:
+    """초당 쓰기 용량(1초 분량까지 누적)을 넘으면 스로틀링 오류를 내는 가짜 테이블"""
+
+    def __init__(self, name, write_capacity):
+        self.name = name
+        self.provisioned_throughput = {'ReadCapacityUnits': write_capacity, 'WriteCapacityUnits': write_capacity}
+        self.items = {}
+        self._capacity = TokenBucket(write_capacity, burst_seconds=1.0)
+        self._lock = threading.Lock()
+
+    def put_item(self, Item, ReturnConsumedCapacity=None, **kwargs):
+        with self._capacity._lock:
+            self._capacity._refill()
+            if self._capacity._tokens < 1:
+                raise ClientError({'Error': {'Code': 'ProvisionedThroughputExceededException',
+                                             'Message': 'The level of configured provisioned throughput '
+                                                        'for the table was exceeded.'}}, 'PutItem')
+            self._capacity._tokens -= 1
+        with self._lock:
+            self.items[Item['id']] = Item
+        response = {}
+        if ReturnConsumedCapacity:
+            response['ConsumedCapacity'] = {'TableName': self.name, 'CapacityUnits': 1.0}
+        return response
+
+
+def run(table):
+    """EVENTS개 동시 생성 → (실패 수, 걸린 시간, 저장된 수)"""
+    event_model = Event(SimpleNamespace(get_events_table=lambda: table, events_key_attributes=('id',)))
+    start = time.monotonic()
+    with ThreadPoolExecutor(THREADS) as executor:
+        results = list(executor.map(
+            lambda n: event_model.create('burst', '2024-01-20', f'이벤트 {n}'), range(EVENTS)))
+    return results.count(None), time.monotonic() - start
+
+
+def main():
+    """메인 함수"""
+    raw = CapacityStubTable('events', WRITE_CAPACITY)
+    raw_failed, raw_elapsed = run(raw)
+
+    stub = CapacityStubTable('events', WRITE_CAPACITY)
+    table = throttled_table(stub)
+    failed, elapsed = run(table)
+    stats = table.throttle.stats()
+
+    print("DynamoDB 스로틀링 처리 확인")
+    print(f"쓰기 용량: {WRITE_CAPACITY} WCU, 동시 생성: {EVENTS}개 ({THREADS} 스레드)\n")
+    print(f"{'경로':>10} | {'실패':>6} | {'저장':>6} | {'시간(s)':>8}")
+    print("-" * 42)
+    print(f"{'그대로':>10} | {raw_failed:>6} | {len(raw.items):>6} | {raw_elapsed:>8.2f}")
+    print(f"{'속도 제한':>10} | {failed:>6} | {len(stub.items):>6} | {elapsed:>8.2f}")
+    print(f"\n스로틀링 {stats['throttled']}회, 재시도 {stats['retried']}회, 포기 {stats['exhausted']}회, "
+          f"속도 제한 대기 {stats['write']['waits']}회 ({stats['write']['wait_seconds']:.2f}s)")
+
+    if failed == 0 and len(stub.items) == EVENTS:
+        print("\n✓ 성공: 몰린 쓰기가 유실 없이 용량에 맞춰 처리되었습니다.")
+        return 0
+    print("\n✗ 실패: 일부 쓰기가 유실되었습니다.")
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,67 @@
+"""
+eventlet 서버에서의 데이터베이스 I/O
+eventlet 허브는 스레드 하나에서 모든 소켓과 요청을 처리하므로, boto3 호출이나 파일/SQLite 읽기처럼
+막히는(blocking) 호출이 허브에서 실행되면 그동안 다른 요청이 모두 멈춥니다.
+모델 메서드 호출을 eventlet.tpool의 스레드 풀(크기: EVENTLET_THREADPOOL_SIZE, 기본값 20)로 넘겨
+허브는 그 사이 다른 요청을 처리합니다.
+"""
+
+import contextvars
+import os
+
+try:
+    from eventlet import tpool
+    from eventlet.patcher import is_monkey_patched
+except ImportError:  # eventlet 없이 실행 (동기 모드)
+    tpool = None
+
+
+def threadpool_size() -> int:
+    """eventlet tpool 스레드 수"""
+    return int(os.environ.get('EVENTLET_THREADPOOL_SIZE', '20'))
+
+
+class OffloadedModel:
+    """
+    모델 메서드를 tpool 스레드에서 실행하는 프록시
+
+    메서드가 아닌 속성은 그대로 반환하며, 모델 안에서 자기 메서드를 부르는 호출은 같은 스레드에서 실행됩니다.
+    호출한 쪽의 contextvars(요청 추적)를 복사해 tpool 스레드에서 이어 씁니다.
+    """
+
+    def __init__(self, model):
+        self._model = model
+        self._methods = {}
+
+    def __getattr__(self, name):
+        method = self._methods.get(name)
+        if method is not None:
+            return method
+
+        attribute = getattr(self._model, name)
+        if not callable(attribute):
+            return attribute
+
+        def call(*args, **kwargs):
+            return tpool.execute(contextvars.copy_context().run, attribute, *args, **kwargs)
+        call.__name__ = name
+        call.__doc__ = attribute.__doc__
+        self._methods[name] = call
+        return call
+
+
+def offload_blocking_io(model, async_mode: str):
+    """
+    async_mode가 eventlet이면 모델 호출을 tpool로 넘기는 프록시로 감쌈
+
+    다음 경우에는 모델을 그대로 반환합니다.
+    - DB_OFFLOAD=0
+    - eventlet이 없거나 async_mode가 eventlet이 아닌 경우
+    - threading이 monkey patch된 경우 (gunicorn eventlet 워커): boto3 소켓은 이미 green이고,
+      모델 안의 락이 green 락이 되어 실제 스레드에서 사용할 수 없음
+    """
+    if os.environ.get('DB_OFFLOAD', '1') == '0':
+        return model
+    if tpool is None or async_mode != 'eventlet' or is_monkey_patched('thread'):
+        return model
+    return OffloadedModel(model)
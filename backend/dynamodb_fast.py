@@ -0,0 +1,120 @@
+"""
+DynamoDB 저수준 클라이언트 읽기 경로
+boto3 resource 계층은 숫자를 Decimal로 역직렬화하므로 모델에서 항목마다 Decimal 변환을 한 번 더 해야 합니다.
+여기서는 client 응답(AttributeValue 형식)을 JSON으로 바로 보낼 수 있는 기본 타입으로 한 번에 변환합니다.
+
+    N  -> int 또는 float
+    SS / NS / BS -> list (JSON 직렬화 가능)
+"""
+
+from decimal import Decimal
+from typing import Dict, Optional
+
+from boto3.dynamodb.types import TypeSerializer
+
+
+_serializer = TypeSerializer()
+
+
+def native_number(value: Decimal):
+    """
+    Decimal -> int / float (정수 값이면 int)
+    1E+20처럼 지수로 표기된 큰 정수도 float를 거치지 않아 정확히 변환합니다.
+    """
+    return int(value) if value == value.to_integral_value() else float(value)
+
+
+def _number(text: str):
+    """DynamoDB 숫자 문자열 -> int / float (resource 경로의 Decimal 변환과 같은 규칙)"""
+    if text.isdigit() or (text[:1] == '-' and text[1:].isdigit()):
+        return int(text)
+    return native_number(Decimal(text))
+
+
+def deserialize_value(value: Dict):
+    """AttributeValue 하나를 기본 타입으로 변환"""
+    if 'S' in value:
+        return value['S']
+    if 'N' in value:
+        return _number(value['N'])
+    if 'BOOL' in value:
+        return value['BOOL']
+    if 'NULL' in value:
+        return None
+    if 'M' in value:
+        return deserialize_item(value['M'])
+    if 'L' in value:
+        return [deserialize_value(element) for element in value['L']]
+    if 'SS' in value:
+        return list(value['SS'])
+    if 'NS' in value:
+        return [_number(number) for number in value['NS']]
+    if 'B' in value:
+        return value['B']
+    if 'BS' in value:
+        return list(value['BS'])
+    raise ValueError(f"Unknown DynamoDB attribute value: {value}")
+
+
+def deserialize_item(item: Dict) -> Dict:
+    """AttributeValue 맵을 기본 타입 딕셔너리로 변환 (문자열 속성은 바로 꺼냄)"""
+    result = {}
+    for name, value in item.items():
+        text = value.get('S')
+        result[name] = text if text is not None else deserialize_value(value)
+    return result
+
+
+def serialize_item(item: Optional[Dict]) -> Optional[Dict]:
+    """기본 타입 딕셔너리를 AttributeValue 맵으로 변환 (Key, ExclusiveStartKey, 표현식 값)"""
+    if item is None:
+        return None
+    return {name: _serializer.serialize(value) for name, value in item.items()}
+
+
+class FastTable:
+    """
+    boto3 Table 읽기 메서드를 저수준 client로 처리하는 래퍼
+
+    get_item / query / scan 결과는 Decimal 없이 기본 타입으로 반환하고,
+    나머지 메서드와 속성(put_item, batch_writer, key_schema 등)은 원래 Table에 위임합니다.
+
+    client는 boto3.client('dynamodb')로 따로 만든 것이어야 합니다.
+    resource의 meta.client에는 resource 계층의 Decimal 변환 핸들러가 등록되어 있습니다.
+    """
+
+    # 모델에서 Decimal 변환을 생략해도 되는 테이블
+    native_types = True
+
+    def __init__(self, table, client):
+        self._table = table
+        self._client = client
+        self.name = table.name
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+    def get_item(self, Key: Dict, **kwargs) -> Dict:
+        response = self._client.get_item(TableName=self.name, Key=serialize_item(Key), **kwargs)
+        if 'Item' in response:
+            response['Item'] = deserialize_item(response['Item'])
+        return response
+
+    def query(self, **kwargs) -> Dict:
+        return self._read(self._client.query, kwargs)
+
+    def scan(self, **kwargs) -> Dict:
+        return self._read(self._client.scan, kwargs)
+
+    def _read(self, operation, kwargs: Dict) -> Dict:
+        params = dict(kwargs, TableName=self.name)
+        for name in ('ExpressionAttributeValues', 'ExclusiveStartKey'):
+            if name in params:
+                params[name] = serialize_item(params[name])
+
+        response = operation(**params)
+        if 'Items' in response:
+            response['Items'] = [deserialize_item(item) for item in response['Items']]
+        if 'LastEvaluatedKey' in response:
+            response['LastEvaluatedKey'] = deserialize_item(response['LastEvaluatedKey'])
+        return response
@@ -0,0 +1,388 @@
+"""
+로컬 NoSQL 저장소용 DynamoDB 표현식 컴파일러
+FilterExpression / KeyConditionExpression / UpdateExpression 문자열을
+한 번만 파싱해 클로저로 만들고, 표현식 문자열 기준 LRU 캐시에 보관합니다.
+
+지원 구문:
+    조건: =, <>, <, <=, >, >=, BETWEEN ... AND ..., begins_with(),
+          attribute_exists(), attribute_not_exists(), AND, OR, NOT, 괄호
+    업데이트: SET a = :v, b = c + :n  /  REMOVE a, b
+"""
+
+import re
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+_TOKEN_PATTERN = re.compile(r'''
+    \s*(?:
+        (?P<op><>|<=|>=|=|<|>|\(|\)|,|\+|-)
+      | (?P<value>:[A-Za-z0-9_]+)
+      | (?P<name>\#?[A-Za-z_][A-Za-z0-9_.]*)
+    )
+''', re.VERBOSE)
+
+class ConditionalCheckFailedException(Exception):
+    """ConditionExpression이 거짓일 때 (botocore ClientError와 같은 response 형식)"""
+
+    def __init__(self, message: str = 'The conditional request failed'):
+        super().__init__(message)
+        self.response = {'Error': {'Code': 'ConditionalCheckFailedException', 'Message': message}}
+
+
+_KEYWORDS = {'AND', 'OR', 'NOT', 'BETWEEN', 'SET', 'REMOVE'}
+_COMPARATORS = {'=', '<>', '<', '<=', '>', '>='}
+
+
+def _tokenize(expression: str) -> List[Tuple[str, str]]:
+    """(종류, 텍스트) 토큰 목록"""
+    tokens = []
+    pos = 0
+    end = len(expression.rstrip())
+    while pos < end:
+        match = _TOKEN_PATTERN.match(expression, pos)
+        if not match:
+            raise ValueError(f"Invalid expression near '{expression[pos:]}': {expression}")
+        kind = match.lastgroup
+        text = match.group(kind)
+        if kind == 'name' and text.upper() in _KEYWORDS:
+            kind, text = 'keyword', text.upper()
+        tokens.append((kind, text))
+        pos = match.end()
+    return tokens
+
+
+class _Parser:
+    """토큰 목록을 AST(튜플)로 변환하는 재귀 하강 파서"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        self.tokens = _tokenize(expression)
+        self.pos = 0
+
+    def peek(self, offset: int = 0) -> Tuple[Optional[str], Optional[str]]:
+        index = self.pos + offset
+        if index < len(self.tokens):
+            return self.tokens[index]
+        return None, None
+
+    def take(self, kind: str = None, text: str = None) -> str:
+        token_kind, token_text = self.peek()
+        if token_kind is None or (kind and token_kind != kind) or (text and token_text != text):
+            expected = text or kind or 'token'
+            raise ValueError(f"Expected {expected} at position {self.pos}: {self.expression}")
+        self.pos += 1
+        return token_text
+
+    def accept(self, kind: str, text: str = None) -> bool:
+        token_kind, token_text = self.peek()
+        if token_kind == kind and (text is None or token_text == text):
+            self.pos += 1
+            return True
+        return False
+
+    def done(self):
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected '{self.peek()[1]}' in expression: {self.expression}")
+
+    # ---- 조건식 ----
+
+    def condition(self):
+        node = self.conjunction()
+        while self.accept('keyword', 'OR'):
+            node = ('or', node, self.conjunction())
+        return node
+
+    def conjunction(self):
+        node = self.negation()
+        while self.accept('keyword', 'AND'):
+            node = ('and', node, self.negation())
+        return node
+
+    def negation(self):
+        if self.accept('keyword', 'NOT'):
+            return ('not', self.negation())
+        return self.primary()
+
+    def primary(self):
+        if self.accept('op', '('):
+            node = self.condition()
+            self.take('op', ')')
+            return node
+
+        kind, text = self.peek()
+        if kind == 'name' and self.peek(1) == ('op', '('):
+            return self.function()
+
+        left = self.operand()
+        if self.accept('keyword', 'BETWEEN'):
+            low = self.operand()
+            self.take('keyword', 'AND')
+            return ('between', left, low, self.operand())
+
+        kind, text = self.peek()
+        if kind == 'op' and text in _COMPARATORS:
+            self.pos += 1
+            return ('compare', text, left, self.operand())
+        raise ValueError(f"Expected comparison at position {self.pos}: {self.expression}")
+
+    def function(self):
+        name = self.take('name')
+        self.take('op', '(')
+        args = [self.operand()]
+        while self.accept('op', ','):
+            args.append(self.operand())
+        self.take('op', ')')
+
+        if name == 'begins_with' and len(args) == 2:
+            return ('begins_with', args[0], args[1])
+        if name in ('attribute_exists', 'attribute_not_exists') and len(args) == 1 and args[0][0] == 'path':
+            return ('exists', args[0], name == 'attribute_exists')
+        raise ValueError(f"Unsupported function '{name}' in expression: {self.expression}")
+
+    def operand(self):
+        kind, text = self.peek()
+        if kind == 'value':
+            self.pos += 1
+            return ('value', text)
+        if kind == 'name':
+            self.pos += 1
+            return ('path', text)
+        raise ValueError(f"Expected attribute or value at position {self.pos}: {self.expression}")
+
+    # ---- 업데이트식 ----
+
+    def update(self):
+        actions = []
+        while self.peek()[0] is not None:
+            clause = self.take('keyword')
+            if clause == 'SET':
+                actions.append(self.set_action())
+                while self.accept('op', ','):
+                    actions.append(self.set_action())
+            elif clause == 'REMOVE':
+                actions.append(('remove', self.take('name')))
+                while self.accept('op', ','):
+                    actions.append(('remove', self.take('name')))
+            else:
+                raise ValueError(f"Unsupported update clause '{clause}': {self.expression}")
+        if not actions:
+            raise ValueError(f"Empty update expression: {self.expression}")
+        return actions
+
+    def set_action(self):
+        target = self.take('name')
+        self.take('op', '=')
+        value = self.operand()
+        kind, text = self.peek()
+        if kind == 'op' and text in ('+', '-'):
+            self.pos += 1
+            value = ('arith', text, value, self.operand())
+        return ('set', target, value)
+
+
+# ---- 바인딩: AST + 이름/값 치환 -> 항목별 클로저 ----
+
+def _resolve_name(name: str, attr_names: Optional[Dict]) -> str:
+    if name.startswith('#'):
+        if not attr_names or name not in attr_names:
+            raise ValueError(f"Missing ExpressionAttributeNames entry for {name}")
+        return attr_names[name]
+    return name
+
+
+def _bind_operand(node, attr_names, attr_values) -> Callable[[dict], object]:
+    """피연산자를 item -> 값 함수로 변환"""
+    kind = node[0]
+    if kind == 'value':
+        if not attr_values or node[1] not in attr_values:
+            raise ValueError(f"Missing ExpressionAttributeValues entry for {node[1]}")
+        constant = attr_values[node[1]]
+        return lambda item: constant
+    if kind == 'arith':
+        _, op, left, right = node
+        left_fn = _bind_operand(left, attr_names, attr_values)
+        right_fn = _bind_operand(right, attr_names, attr_values)
+        if op == '+':
+            return lambda item: left_fn(item) + right_fn(item)
+        return lambda item: left_fn(item) - right_fn(item)
+    name = _resolve_name(node[1], attr_names)
+    return lambda item: item.get(name)
+
+
+_COMPARE_FUNCS = {
+    '=': lambda a, b: a == b,
+    '<>': lambda a, b: a != b,
+    '<': lambda a, b: a < b,
+    '<=': lambda a, b: a <= b,
+    '>': lambda a, b: a > b,
+    '>=': lambda a, b: a >= b,
+}
+
+
+def _ordered(compare: Callable) -> Callable:
+    """누락 속성이나 타입 불일치는 DynamoDB처럼 거짓으로 처리"""
+    def evaluate(a, b):
+        if a is None or b is None:
+            return False
+        try:
+            return compare(a, b)
+        except TypeError:
+            return False
+    return evaluate
+
+
+def _bind_condition(node, attr_names, attr_values) -> Callable[[dict], bool]:
+    """조건 AST를 item -> bool 클로저로 변환"""
+    kind = node[0]
+    if kind == 'and':
+        left = _bind_condition(node[1], attr_names, attr_values)
+        right = _bind_condition(node[2], attr_names, attr_values)
+        return lambda item: left(item) and right(item)
+    if kind == 'or':
+        left = _bind_condition(node[1], attr_names, attr_values)
+        right = _bind_condition(node[2], attr_names, attr_values)
+        return lambda item: left(item) or right(item)
+    if kind == 'not':
+        inner = _bind_condition(node[1], attr_names, attr_values)
+        return lambda item: not inner(item)
+    if kind == 'compare':
+        _, op, left, right = node
+        left_fn = _bind_operand(left, attr_names, attr_values)
+        right_fn = _bind_operand(right, attr_names, attr_values)
+        compare = _COMPARE_FUNCS[op] if op in ('=', '<>') else _ordered(_COMPARE_FUNCS[op])
+        return lambda item: compare(left_fn(item), right_fn(item))
+    if kind == 'between':
+        _, target, low, high = node
+        target_fn = _bind_operand(target, attr_names, attr_values)
+        low_fn = _bind_operand(low, attr_names, attr_values)
+        high_fn = _bind_operand(high, attr_names, attr_values)
+        in_range = _ordered(lambda value, bounds: bounds[0] <= value <= bounds[1])
+        return lambda item: in_range(target_fn(item), (low_fn(item), high_fn(item)))
+    if kind == 'begins_with':
+        _, target, prefix = node
+        target_fn = _bind_operand(target, attr_names, attr_values)
+        prefix_fn = _bind_operand(prefix, attr_names, attr_values)
+
+        def begins_with(item):
+            value = target_fn(item)
+            prefix_value = prefix_fn(item)
+            return isinstance(value, str) and isinstance(prefix_value, str) and value.startswith(prefix_value)
+        return begins_with
+    if kind == 'exists':
+        _, target, expected = node
+        name = _resolve_name(target[1], attr_names)
+        return lambda item: (name in item) == expected
+    raise ValueError(f"Unknown condition node: {kind}")
+
+
+class CompiledCondition:
+    """파싱이 끝난 조건식"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        parser = _Parser(expression)
+        self.ast = parser.condition()
+        parser.done()
+
+    def bind(self, attr_names: Dict = None, attr_values: Dict = None) -> Callable[[dict], bool]:
+        """이름/값을 치환한 item -> bool 술어 반환"""
+        return _bind_condition(self.ast, attr_names, attr_values)
+
+    def key_condition(self, attr_names: Dict = None):
+        """
+        인덱스 조회용 키 조건 분해
+
+        Returns:
+            (해시 속성, 해시 값 키, 정렬 속성, 연산자, 값 키 튜플) 또는 키 조건 형식이 아니면 None
+        """
+        node = self.ast
+        range_node = None
+        if node[0] == 'and':
+            node, range_node = node[1], node[2]
+        if node[0] != 'compare' or node[1] != '=' or node[2][0] != 'path' or node[3][0] != 'value':
+            return None
+        hash_attr = _resolve_name(node[2][1], attr_names)
+        hash_value = node[3][1]
+
+        if range_node is None:
+            return hash_attr, hash_value, None, None, ()
+        if range_node[0] == 'between':
+            _, target, low, high = range_node
+            if target[0] == 'path' and low[0] == 'value' and high[0] == 'value':
+                return hash_attr, hash_value, _resolve_name(target[1], attr_names), 'BETWEEN', (low[1], high[1])
+        if range_node[0] == 'compare' and range_node[1] != '<>':
+            _, op, target, operand = range_node
+            if target[0] == 'path' and operand[0] == 'value':
+                return hash_attr, hash_value, _resolve_name(target[1], attr_names), op, (operand[1],)
+        if range_node[0] == 'begins_with':
+            _, target, prefix = range_node
+            if target[0] == 'path' and prefix[0] == 'value':
+                return hash_attr, hash_value, _resolve_name(target[1], attr_names), 'begins_with', (prefix[1],)
+        return None
+
+
+class CompiledUpdate:
+    """파싱이 끝난 업데이트식"""
+
+    def __init__(self, expression: str):
+        self.expression = expression
+        parser = _Parser(expression)
+        self.actions = parser.update()
+        parser.done()
+
+    def bind(self, attr_names: Dict = None, attr_values: Dict = None) -> Callable[[dict], None]:
+        """이름/값을 치환한 item 변경 함수 반환 (item을 제자리에서 수정)"""
+        sets = []
+        removes = []
+        for action in self.actions:
+            if action[0] == 'set':
+                sets.append((_resolve_name(action[1], attr_names),
+                             _bind_operand(action[2], attr_names, attr_values)))
+            else:
+                removes.append(_resolve_name(action[1], attr_names))
+
+        def apply(item: dict):
+            # 모든 값은 변경 전 항목 기준으로 계산
+            values = [(name, value_fn(item)) for name, value_fn in sets]
+            for name, value in values:
+                item[name] = value
+            for name in removes:
+                item.pop(name, None)
+        return apply
+
+
+@lru_cache(maxsize=512)
+def _projection_names(expression: str) -> Tuple[str, ...]:
+    names = tuple(part.strip() for part in expression.split(','))
+    if not all(names):
+        raise ValueError(f"Invalid projection expression: {expression}")
+    return names
+
+
+def projection_attributes(expression: str, attr_names: Dict = None) -> Tuple[str, ...]:
+    """ProjectionExpression('a, #b')의 속성 이름 목록 (최상위 속성만 지원)"""
+    return tuple(_resolve_name(name, attr_names) for name in _projection_names(expression))
+
+
+def check_condition(expression: Optional[str], attr_names: Dict, attr_values: Dict, item: Optional[dict]):
+    """
+    ConditionExpression 평가 (항목이 없으면 빈 항목 기준)
+
+    Raises:
+        ConditionalCheckFailedException: 조건이 거짓인 경우
+    """
+    if expression and not compile_condition(expression).bind(attr_names, attr_values)(item or {}):
+        raise ConditionalCheckFailedException()
+
+
+@lru_cache(maxsize=512)
+def compile_condition(expression: str) -> CompiledCondition:
+    """조건식 컴파일 (표현식 문자열 기준 LRU 캐시)"""
+    return CompiledCondition(expression)
+
+
+@lru_cache(maxsize=512)
+def compile_update(expression: str) -> CompiledUpdate:
+    """업데이트식 컴파일 (표현식 문자열 기준 LRU 캐시)"""
+    return CompiledUpdate(expression)
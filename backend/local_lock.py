@@ -0,0 +1,81 @@
+"""
+로컬 저장소용 테이블 잠금
+프로세스 내부에서는 읽기/쓰기 잠금(reader/writer lock)으로,
+프로세스 간에는 잠금 파일에 대한 advisory lock(fcntl.flock)으로 조정합니다.
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 내부 잠금만 사용
+    fcntl = None
+
+
+class TableLock:
+    """
+    프로세스 내부 + 프로세스 간 읽기/쓰기 잠금
+
+    같은 프로세스의 스레드들은 잠금 파일 디스크립터 하나를 공유하므로,
+    첫 번째 읽기 스레드가 공유 잠금을 잡고 마지막 읽기 스레드가 해제합니다.
+    쓰기 대기자가 있으면 새 읽기는 대기합니다 (쓰기 기아 방지).
+    """
+
+    def __init__(self, lock_path: Path):
+        self.lock_path = Path(lock_path)
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+        self._fd = None
+
+    def _flock(self, operation):
+        """잠금 파일에 flock 적용"""
+        if fcntl is None:
+            return
+        if self._fd is None:
+            self._fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(self._fd, operation)
+
+    @contextmanager
+    def read(self):
+        """공유(읽기) 잠금"""
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            if self._readers == 0:
+                self._flock(fcntl.LOCK_SH if fcntl else None)
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if self._readers == 0:
+                    self._flock(fcntl.LOCK_UN if fcntl else None)
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        """배타(쓰기) 잠금"""
+        with self._cond:
+            self._writers_waiting += 1
+            try:
+                while self._writer or self._readers:
+                    self._cond.wait()
+            finally:
+                self._writers_waiting -= 1
+            self._writer = True
+        try:
+            self._flock(fcntl.LOCK_EX if fcntl else None)
+            try:
+                yield
+            finally:
+                self._flock(fcntl.LOCK_UN if fcntl else None)
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
@@ -4,21 +4,96 @@ JSON 파일 기반의 NoSQL 데이터베이스 에뮬레이션
 """
 
 import json
-import uuid
 import os
-from datetime import datetime
-from typing import List, Dict, Optional
+import threading
+import time
+import zlib
+from bisect import bisect_left, bisect_right
+from typing import List, Optional
 from pathlib import Path
 
+from local_expression import check_condition, compile_condition, compile_update, projection_attributes
+from local_lock import TableLock
+from metrics import count_read_bytes
+
+
+# 테이블별 보조 인덱스 정의 (DynamoDB GSI와 동일한 이름/키)
+TABLE_INDEXES = {
+    'departments': {
+        'name-index': ('name', 'id'),
+    },
+    'events': {
+        'department-date-index': ('department_id', 'event_date'),
+        'department-modified-index': ('department_id', 'last_modified'),
+    },
+}
+
+# 페이지 단위 scan에 쓰는 id 순서 인덱스 (해시 키 없이 파티션 하나)
+PRIMARY_INDEX = '__primary__'
+
+
+def segment_of(item_id: str, total_segments: int) -> int:
+    """병렬 스캔 세그먼트 번호 (프로세스가 달라도 같은 값이 나오도록 crc32 사용)"""
+    return zlib.crc32(item_id.encode('utf-8')) % total_segments
+
+
+def validate_segment(segment: Optional[int], total_segments: Optional[int]):
+    """Segment / TotalSegments 파라미터 확인 (DynamoDB와 같은 제약)"""
+    if segment is None and total_segments is None:
+        return
+    if segment is None or total_segments is None:
+        raise ValueError("Segment and TotalSegments must be specified together")
+    if not 0 <= segment < total_segments:
+        raise ValueError(f"Segment must be between 0 and {total_segments - 1}")
+
+
+def shape_scan_response(response: dict, select: Optional[str], projection_expression: Optional[str],
+                        attr_names: Optional[dict]) -> dict:
+    """Select='COUNT'이면 Items 제거, ProjectionExpression이면 지정한 속성만 남김"""
+    if select == 'COUNT':
+        response.pop('Items')
+    elif projection_expression:
+        attributes = projection_attributes(projection_expression, attr_names)
+        response['Items'] = [
+            {name: item[name] for name in attributes if name in item} for item in response['Items']
+        ]
+    return response
+
+
+def is_expired(item: dict, now: float) -> bool:
+    """expires_at(epoch 초)이 지난 항목인지 확인 (DynamoDB TTL과 같은 규칙, 숫자가 아니면 만료 안 됨)"""
+    expires_at = item.get('expires_at')
+    if isinstance(expires_at, bool) or not isinstance(expires_at, (int, float)):
+        return False
+    return expires_at < now
+
+
+def _atomic_write_json(file_path: Path, data: dict, indent: int = None):
+    """임시 파일에 쓴 뒤 rename으로 교체"""
+    tmp_path = Path(f"{file_path}.tmp.{os.getpid()}.{threading.get_ident()}")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=indent)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, file_path)
+
 
 class LocalNoSQLDatabase:
     """로컬 파일 기반 NoSQL 데이터베이스"""
     
-    def __init__(self, data_dir: str = "data"):
+    def __init__(self, data_dir: str = "data", storage: str = "json",
+                 compact_threshold: int = 1000):
         """
         Args:
             data_dir: 데이터를 저장할 디렉토리 경로
+            storage: 'json' (매번 전체 파일 저장) 또는 'journal' (추가 전용 저널)
+            compact_threshold: 저널 모드에서 스냅샷으로 압축할 레코드 수
         """
+        if storage not in ('json', 'journal'):
+            raise ValueError(f"Unknown local storage: {storage}. Use 'json' or 'journal'")
+        
+        self.storage = storage
+        self.compact_threshold = compact_threshold
         self.data_dir = Path(data_dir)
         self.data_dir.mkdir(exist_ok=True)
         
@@ -26,17 +101,21 @@ class LocalNoSQLDatabase:
         self.departments_file = self.data_dir / "departments.json"
         self.events_file = self.data_dir / "events.json"
         
+        # 테이블 객체 (이름별로 하나씩 유지)
+        self._tables = {}
+        
         # 테이블 초기화
         self._init_storage()
-        print(f"✓ 로컬 NoSQL 저장소 초기화 완료: {self.data_dir}")
+        print(f"✓ 로컬 NoSQL 저장소 초기화 완료: {self.data_dir} ({self.storage})")
     
     def _init_storage(self):
-        """저장소 초기화"""
-        if not self.departments_file.exists():
-            self._write_json(self.departments_file, {})
-        
-        if not self.events_file.exists():
-            self._write_json(self.events_file, {})
+        """저장소 초기화 (여러 워커가 동시에 시작해도 기존 파일을 덮어쓰지 않음)"""
+        for file_path in (self.departments_file, self.events_file):
+            try:
+                with open(file_path, 'x', encoding='utf-8') as f:
+                    f.write('{}')
+            except FileExistsError:
+                pass
     
     def _read_json(self, file_path: Path) -> dict:
         """JSON 파일 읽기"""
@@ -53,204 +132,703 @@ class LocalNoSQLDatabase:
     
     def get_departments_table(self):
         """부서 테이블 반환"""
-        return LocalNoSQLTable(self.departments_file, "departments")
+        return self._get_table(self.departments_file, "departments")
     
     def get_events_table(self):
         """이벤트 테이블 반환"""
-        return LocalNoSQLTable(self.events_file, "events")
+        return self._get_table(self.events_file, "events")
+    
+    def _get_table(self, file_path: Path, table_name: str):
+        """테이블 객체 반환 (메모리 캐시 공유를 위해 파일별로 재사용)"""
+        table = self._tables.get(table_name)
+        if table is None:
+            indexes = TABLE_INDEXES.get(table_name)
+            if self.storage == 'journal':
+                table = LocalJournalTable(file_path, table_name, self.compact_threshold, indexes)
+            else:
+                table = LocalNoSQLTable(file_path, table_name, indexes)
+            self._tables[table_name] = table
+        return table
+
+
+class LocalSortedIndex:
+    """해시 키별로 정렬 키 순서를 유지하는 보조 인덱스 (GSI 에뮬레이션)"""
+    
+    def __init__(self, name: str, hash_key: Optional[str], range_key: str):
+        """
+        Args:
+            name: 인덱스 이름
+            hash_key: 해시 키 속성 (None이면 전체 항목이 파티션 '' 하나에 속함)
+            range_key: 정렬 키 속성
+        """
+        self.name = name
+        self.hash_key = hash_key
+        self.range_key = range_key
+        
+        # 해시 값 -> (정렬 키 값 목록, 항목 ID 목록), 두 목록은 같은 순서로 정렬됨
+        self._partitions = {}
+    
+    def _hash_value(self, item: dict):
+        return item.get(self.hash_key) if self.hash_key else ''
+    
+    def build(self, data: dict):
+        """전체 데이터로 인덱스 재구성"""
+        pairs = {}
+        for item_id, item in data.items():
+            hash_value = self._hash_value(item)
+            range_value = item.get(self.range_key)
+            if hash_value is None or range_value is None:
+                continue
+            pairs.setdefault(hash_value, []).append((range_value, item_id))
+        
+        self._partitions = {}
+        for hash_value, entries in pairs.items():
+            entries.sort()
+            self._partitions[hash_value] = (
+                [range_value for range_value, _ in entries],
+                [item_id for _, item_id in entries]
+            )
+    
+    def add(self, item: dict):
+        """항목 추가"""
+        hash_value = self._hash_value(item)
+        range_value = item.get(self.range_key)
+        if hash_value is None or range_value is None:
+            return
+        
+        range_values, ids = self._partitions.setdefault(hash_value, ([], []))
+        lo = bisect_left(range_values, range_value)
+        hi = bisect_right(range_values, range_value, lo)
+        pos = bisect_left(ids, item['id'], lo, hi)
+        range_values.insert(pos, range_value)
+        ids.insert(pos, item['id'])
+    
+    def remove(self, item: dict):
+        """항목 제거"""
+        hash_value = self._hash_value(item)
+        range_value = item.get(self.range_key)
+        partition = self._partitions.get(hash_value)
+        if partition is None or range_value is None:
+            return
+        
+        range_values, ids = partition
+        lo = bisect_left(range_values, range_value)
+        hi = bisect_right(range_values, range_value, lo)
+        pos = bisect_left(ids, item['id'], lo, hi)
+        if pos < hi and ids[pos] == item['id']:
+            del range_values[pos]
+            del ids[pos]
+            if not ids:
+                del self._partitions[hash_value]
+    
+    def lookup(self, hash_value, low=None, high=None,
+               low_inclusive: bool = True, high_inclusive: bool = True,
+               start_after: tuple = None) -> List[str]:
+        """
+        해시 값과 정렬 키 범위에 해당하는 항목 ID (정렬 키 순)
+        
+        Args:
+            start_after: (정렬 키 값, 항목 ID) - 이 위치 다음부터 반환 (페이지 이어 읽기)
+        """
+        partition = self._partitions.get(hash_value)
+        if partition is None:
+            return []
+        
+        range_values, ids = partition
+        start = 0
+        end = len(ids)
+        if low is not None:
+            start = (bisect_left if low_inclusive else bisect_right)(range_values, low)
+        if high is not None:
+            end = (bisect_right if high_inclusive else bisect_left)(range_values, high)
+        if start_after is not None:
+            range_value, item_id = start_after
+            lo = bisect_left(range_values, range_value)
+            hi = bisect_right(range_values, range_value, lo)
+            start = max(start, bisect_right(ids, item_id, lo, hi))
+        return ids[start:end]
+
+
+class LocalBatchWriter:
+    """
+    boto3 Table.batch_writer() 호환 일괄 쓰기
+    
+    put_item/delete_item을 버퍼에 모았다가 flush_amount개마다(None이면 종료 시에만)
+    테이블의 _batch_commit으로 한 번에 반영합니다.
+    """
+    
+    def __init__(self, table, flush_amount: Optional[int] = 25, overwrite_by_pkeys: List[str] = None):
+        self.table = table
+        self.flush_amount = flush_amount
+        self.overwrite_by_pkeys = overwrite_by_pkeys
+        self._buffer = []
+    
+    def put_item(self, Item: dict):
+        """항목 추가 예약"""
+        if not Item.get('id'):
+            raise ValueError("Item must have 'id' field")
+        self._add(('put', dict(Item)), Item)
+    
+    def delete_item(self, Key: dict):
+        """항목 삭제 예약"""
+        self._add(('delete', Key.get('id')), Key)
+    
+    def _add(self, operation: tuple, keys: dict):
+        if self.overwrite_by_pkeys:
+            # 같은 기본 키에 대한 이전 요청은 마지막 요청으로 대체
+            pkey = tuple(keys.get(name) for name in self.overwrite_by_pkeys)
+            self._buffer = [
+                (op, value, key) for op, value, key in self._buffer if key != pkey
+            ]
+        else:
+            pkey = None
+        self._buffer.append(operation + (pkey,))
+        
+        if self.flush_amount and len(self._buffer) >= self.flush_amount:
+            self.flush()
+    
+    def flush(self):
+        """버퍼에 쌓인 요청을 반영"""
+        if self._buffer:
+            operations = [(op, value) for op, value, _ in self._buffer]
+            self._buffer = []
+            self.table._batch_commit(operations)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, tb):
+        self.flush()
+        return False
 
 
 class LocalNoSQLTable:
     """로컬 NoSQL 테이블 에뮬레이션"""
     
-    def __init__(self, file_path: Path, table_name: str):
+    # batch_writer 자동 flush 간격 (None: 종료 시 한 번에 파일 다시 쓰기)
+    BATCH_FLUSH_AMOUNT = None
+    
+    # JSON에서 읽은 항목이라 Decimal이 없음 (모델에서 변환 생략)
+    native_types = True
+    
+    # 프로세스 안의 메모리 스캔은 세그먼트로 나눠도 빨라지지 않음 (GIL)
+    SCAN_SEGMENTS = 1
+    
+    def __init__(self, file_path: Path, table_name: str, indexes: dict = None):
+        """
+        Args:
+            file_path: 테이블 JSON 파일 경로
+            table_name: 테이블 이름
+            indexes: {인덱스 이름: (해시 키, 정렬 키)} 보조 인덱스 정의
+        """
         self.file_path = file_path
         self.table_name = table_name
+        self.name = table_name
+        
+        # 프로세스 내부 읽기/쓰기 잠금 + 프로세스 간 파일 잠금
+        self._lock = TableLock(Path(f"{file_path}.lock"))
+        
+        # 파싱된 테이블 데이터와 그 시점의 파일 시그니처 (mtime, size, inode)
+        self._cache = None
+        self._cache_signature = None
+        
+        # 캐시 갱신(재파싱/인덱스 재구성)은 읽기 스레드끼리도 겹치지 않게 직렬화
+        self._refresh_lock = threading.Lock()
+        
+        # 보조 인덱스 정의와 (인덱스가 반영하는 데이터 객체, 인덱스들) 상태
+        # 캐시가 다른 객체로 바뀌면 다음 쿼리 때 새 인덱스를 만들어 교체
+        self._index_definitions = dict(indexes or {})
+        self._index_definitions[PRIMARY_INDEX] = (None, 'id')
+        self._index_state = None
+    
+    def _file_signature(self):
+        """캐시 무효화 판단용 파일 시그니처"""
+        try:
+            st = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
     
     def _read_data(self) -> dict:
-        """현재 데이터 읽기"""
+        """현재 데이터 읽기 (파일이 바뀌지 않았으면 메모리 캐시 사용)"""
+        signature = self._file_signature()
+        if self._cache is not None and signature == self._cache_signature:
+            return self._cache
+        
+        with self._refresh_lock:
+            signature = self._file_signature()
+            if self._cache is not None and signature == self._cache_signature:
+                return self._cache
+            
+            # 다른 읽기 스레드가 기존 dict를 순회 중일 수 있으므로 새 객체로 교체
+            data = self._load_snapshot()
+            self._cache = data
+            self._cache_signature = signature
+            return data
+    
+    def _load_snapshot(self) -> dict:
+        """테이블 JSON 파일 파싱"""
         try:
-            with open(self.file_path, 'r', encoding='utf-8') as f:
+            with open(self.file_path, 'rb') as f:
                 content = f.read()
-                if not content:
-                    return {}
-                return json.loads(content)
+            count_read_bytes(len(content))
+            return json.loads(content) if content else {}
         except (FileNotFoundError, json.JSONDecodeError):
             return {}
     
+    def _purge_expired(self, data: dict):
+        """expires_at이 지난 항목(삭제 마커 등) 제거 (쓰기 잠금을 잡은 상태에서 호출)"""
+        now = time.time()
+        for item_id in [item_id for item_id, item in data.items() if is_expired(item, now)]:
+            self._index_replace(data.pop(item_id), None)
+    
     def _write_data(self, data: dict):
-        """데이터 쓰기"""
-        with open(self.file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        """데이터 쓰기 (임시 파일 + rename으로 원자적 교체, 만료된 항목은 이때 제거)"""
+        self._purge_expired(data)
+        try:
+            _atomic_write_json(self.file_path, data, indent=2)
+        except Exception:
+            # 디스크와 어긋난 캐시는 버리고 다음 읽기에서 다시 파싱
+            self.invalidate_cache()
+            raise
+        
+        self._cache = data
+        self._cache_signature = self._file_signature()
     
-    def put_item(self, Item: dict):
-        """항목 추가 또는 수정"""
-        data = self._read_data()
+    def invalidate_cache(self):
+        """메모리 캐시 무효화"""
+        self._cache = None
+        self._cache_signature = None
+        self._index_state = None
+    
+    def _get_index(self, index_name: str, data: dict) -> Optional[LocalSortedIndex]:
+        """data 기준 최신 보조 인덱스 반환"""
+        if index_name not in self._index_definitions:
+            return None
+        
+        state = self._index_state
+        if state is None or state[0] is not data:
+            with self._refresh_lock:
+                state = self._index_state
+                if state is None or state[0] is not data:
+                    indexes = {}
+                    for name, (hash_key, range_key) in self._index_definitions.items():
+                        indexes[name] = LocalSortedIndex(name, hash_key, range_key)
+                        indexes[name].build(data)
+                    state = (data, indexes)
+                    self._index_state = state
+        return state[1][index_name]
+    
+    def _index_replace(self, old_item: Optional[dict], new_item: Optional[dict]):
+        """변경된 항목을 보조 인덱스에 반영 (쓰기 잠금을 잡은 상태에서 호출)"""
+        state = self._index_state
+        if state is None or state[0] is not self._cache:
+            return
+        for index in state[1].values():
+            if old_item is not None:
+                index.remove(old_item)
+            if new_item is not None:
+                index.add(new_item)
+    
+    def _commit_put(self, data: dict, item: dict):
+        """항목 저장 반영 (전체 파일 다시 쓰기)"""
+        self._write_data(data)
+    
+    def _commit_delete(self, data: dict, item_id: str):
+        """항목 삭제 반영 (전체 파일 다시 쓰기)"""
+        self._write_data(data)
+    
+    def _commit_batch(self, data: dict, records: List[dict]):
+        """일괄 변경 반영 (전체 파일 한 번만 다시 쓰기)"""
+        self._write_data(data)
+    
+    def _batch_commit(self, operations: List[tuple]):
+        """('put', item) / ('delete', item_id) 목록을 한 번의 잠금과 쓰기로 반영"""
+        with self._lock.write():
+            data = self._read_data()
+            records = []
+            for op, value in operations:
+                if op == 'put':
+                    old_item = data.get(value['id'])
+                    data[value['id']] = value
+                    self._index_replace(old_item, value)
+                    records.append({'op': 'put', 'item': value})
+                elif value in data:
+                    self._index_replace(data.pop(value), None)
+                    records.append({'op': 'delete', 'id': value})
+            if records:
+                self._commit_batch(data, records)
+    
+    def batch_writer(self, overwrite_by_pkeys: List[str] = None):
+        """일괄 쓰기 컨텍스트 매니저 (boto3 호환)"""
+        return LocalBatchWriter(self, self.BATCH_FLUSH_AMOUNT, overwrite_by_pkeys)
+    
+    def batch_get_item(self, Keys: List[dict]) -> dict:
+        """여러 항목 일괄 조회 (boto3 batch_get_item 응답 형식)"""
+        with self._lock.read():
+            data = self._read_data()
+            items = [dict(data[key.get('id')]) for key in Keys if key.get('id') in data]
+        return {'Responses': {self.table_name: items}, 'UnprocessedKeys': {}}
+    
+    def put_item(self, Item: dict, ConditionExpression: str = None,
+                 ExpressionAttributeNames: dict = None,
+                 ExpressionAttributeValues: dict = None):
+        """항목 추가 또는 수정 (ConditionExpression이 거짓이면 ConditionalCheckFailedException)"""
         item_id = Item.get('id')
         
         if not item_id:
             raise ValueError("Item must have 'id' field")
         
-        data[item_id] = Item
-        self._write_data(data)
+        with self._lock.write():
+            data = self._read_data()
+            old_item = data.get(item_id)
+            check_condition(ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues, old_item)
+            data[item_id] = dict(Item)
+            self._index_replace(old_item, data[item_id])
+            self._commit_put(data, data[item_id])
     
     def get_item(self, Key: dict) -> dict:
         """항목 조회"""
-        data = self._read_data()
         item_id = Key.get('id')
         
-        if item_id in data:
-            return {'Item': data[item_id]}
+        with self._lock.read():
+            data = self._read_data()
+            if item_id in data:
+                return {'Item': dict(data[item_id])}
         return {'Item': None}
     
-    def delete_item(self, Key: dict):
-        """항목 삭제"""
-        data = self._read_data()
+    def delete_item(self, Key: dict, ConditionExpression: str = None,
+                    ExpressionAttributeNames: dict = None,
+                    ExpressionAttributeValues: dict = None):
+        """항목 삭제 (ConditionExpression이 거짓이면 ConditionalCheckFailedException)"""
         item_id = Key.get('id')
         
-        if item_id in data:
-            del data[item_id]
-            self._write_data(data)
+        with self._lock.write():
+            data = self._read_data()
+            check_condition(ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues, data.get(item_id))
+            if item_id in data:
+                old_item = data.pop(item_id)
+                self._index_replace(old_item, None)
+                self._commit_delete(data, item_id)
     
     def scan(self, FilterExpression: str = None, 
              ExpressionAttributeNames: dict = None,
-             ExpressionAttributeValues: dict = None) -> dict:
-        """전체 스캔 (필터링 지원)"""
-        data = self._read_data()
-        items = list(data.values())
+             ExpressionAttributeValues: dict = None,
+             Limit: int = None, ExclusiveStartKey: dict = None,
+             Segment: int = None, TotalSegments: int = None,
+             Select: str = None, ProjectionExpression: str = None) -> dict:
+        """전체 스캔 (필터링, Limit/ExclusiveStartKey 페이지, 병렬 스캔 세그먼트, COUNT/프로젝션 지원)"""
+        validate_segment(Segment, TotalSegments)
         
-        # 필터링 적용
-        if FilterExpression and ExpressionAttributeValues:
-            filtered_items = []
-            for item in items:
-                if self._evaluate_filter(item, FilterExpression, ExpressionAttributeNames, ExpressionAttributeValues):
-                    filtered_items.append(item)
-            items = filtered_items
+        # 필터링 적용 (컴파일된 술어를 항목마다 호출)
+        matches = None
+        if FilterExpression:
+            matches = compile_condition(FilterExpression).bind(
+                ExpressionAttributeNames, ExpressionAttributeValues)
         
-        return {'Items': items}
+        segment = (Segment, TotalSegments) if TotalSegments else None
+        with self._lock.read():
+            data = self._read_data()
+            response = self._scan_page(data, matches, Limit, ExclusiveStartKey, segment)
+        return shape_scan_response(response, Select, ProjectionExpression, ExpressionAttributeNames)
     
     def query(self, IndexName: str = None, KeyConditionExpression: str = None,
-              ExpressionAttributeValues: dict = None) -> dict:
-        """쿼리 실행"""
-        data = self._read_data()
-        items = list(data.values())
+              ExpressionAttributeValues: dict = None,
+              ExpressionAttributeNames: dict = None,
+              Limit: int = None, ExclusiveStartKey: dict = None) -> dict:
+        """쿼리 실행 (보조 인덱스가 있으면 인덱스 범위 조회, 페이지 지원)"""
+        condition = compile_condition(KeyConditionExpression) if KeyConditionExpression else None
         
-        # 키 조건 평가
-        if KeyConditionExpression and ExpressionAttributeValues:
-            filtered_items = []
-            for item in items:
-                if self._evaluate_query(item, KeyConditionExpression, ExpressionAttributeValues):
-                    filtered_items.append(item)
-            items = filtered_items
+        with self._lock.read():
+            data = self._read_data()
+            
+            if condition is None:
+                return self._scan_page(data, None, Limit, ExclusiveStartKey)
+            
+            if IndexName:
+                index = self._get_index(IndexName, data)
+                start_after = None
+                if index is not None and ExclusiveStartKey:
+                    start_after = (ExclusiveStartKey.get(index.range_key), ExclusiveStartKey.get('id'))
+                item_ids = self._query_index(data, IndexName, condition, ExpressionAttributeValues,
+                                             ExpressionAttributeNames, start_after)
+                if item_ids is not None:
+                    key_attrs = ('id', index.hash_key, index.range_key)
+                    return self._page(data, item_ids, Limit, None, key_attrs)
+            
+            # 키 조건 평가
+            matches = condition.bind(ExpressionAttributeNames, ExpressionAttributeValues)
+            return self._scan_page(data, matches, Limit, ExclusiveStartKey)
+    
+    def _scan_page(self, data: dict, matches, limit: Optional[int],
+                   exclusive_start_key: Optional[dict], segment: tuple = None) -> dict:
+        """전체 항목 순회 (페이지 요청이면 id 순서로 이어 읽기, segment=(번호, 전체 수)면 해당 세그먼트만)"""
+        if limit is None and not exclusive_start_key:
+            item_ids = list(data)
+        else:
+            start_after = None
+            if exclusive_start_key:
+                start_id = exclusive_start_key.get('id')
+                start_after = (start_id, start_id)
+            item_ids = self._get_index(PRIMARY_INDEX, data).lookup('', start_after=start_after)
         
-        return {'Items': items}
+        if segment is not None:
+            number, total = segment
+            item_ids = [item_id for item_id in item_ids if segment_of(item_id, total) == number]
+        return self._page(data, item_ids, limit, matches, ('id',))
+    
+    @staticmethod
+    def _page(data: dict, item_ids: List[str], limit: Optional[int], matches,
+              key_attrs: tuple) -> dict:
+        """
+        item_ids 앞에서부터 최대 limit개를 평가해 응답 생성
+        (DynamoDB처럼 Limit은 필터 적용 전 평가 항목 수 기준)
+        """
+        more = limit is not None and len(item_ids) > limit
+        if more:
+            item_ids = item_ids[:limit]
+        
+        items = [data[item_id] for item_id in item_ids]
+        scanned = len(items)
+        if matches is not None:
+            items = [item for item in items if matches(item)]
+        
+        response = {'Items': [dict(item) for item in items], 'Count': len(items), 'ScannedCount': scanned}
+        if more and item_ids:
+            last_item = data[item_ids[-1]]
+            response['LastEvaluatedKey'] = {attr: last_item[attr] for attr in key_attrs if attr in last_item}
+        return response
     
     def update_item(self, Key: dict, UpdateExpression: str,
-                   ExpressionAttributeValues: dict):
-        """항목 업데이트"""
-        data = self._read_data()
+                   ExpressionAttributeValues: dict = None,
+                   ExpressionAttributeNames: dict = None,
+                   ConditionExpression: str = None):
+        """항목 업데이트 (SET / REMOVE, ConditionExpression 지원)"""
+        apply_update = compile_update(UpdateExpression).bind(
+            ExpressionAttributeNames, ExpressionAttributeValues)
         item_id = Key.get('id')
         
-        if item_id not in data:
-            raise KeyError(f"Item with id {item_id} not found")
+        with self._lock.write():
+            data = self._read_data()
+            if item_id not in data:
+                raise KeyError(f"Item with id {item_id} not found")
+            check_condition(ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues, data[item_id])
+            
+            item = dict(data[item_id])
+            apply_update(item)
+            
+            self._index_replace(data[item_id], item)
+            data[item_id] = item
+            self._commit_put(data, item)
+    
+    def _query_index(self, data: dict, index_name: str, condition,
+                     attr_values: dict, attr_names: dict = None,
+                     start_after: tuple = None) -> Optional[List[str]]:
+        """보조 인덱스로 키 조건 평가, 인덱스로 처리할 수 없으면 None"""
+        index = self._get_index(index_name, data) if index_name != PRIMARY_INDEX else None
+        key_condition = condition.key_condition(attr_names) if index is not None else None
+        if key_condition is None or not attr_values:
+            return None
         
-        item = data[item_id]
+        hash_attr, hash_key, range_attr, op, operand_keys = key_condition
+        if hash_attr != index.hash_key or range_attr not in (None, index.range_key):
+            return None
+        if hash_key not in attr_values or any(key not in attr_values for key in operand_keys):
+            return None
         
-        # UpdateExpression 처리 (간단한 SET 구문만 지원)
-        if UpdateExpression.startswith('SET'):
-            parts = UpdateExpression[3:].split(',')
-            
-            for part in parts:
-                part = part.strip()
-                if '=' in part:
-                    attr_name, attr_value = part.split('=')
-                    attr_name = attr_name.strip()
-                    attr_value = attr_value.strip()
-                    
-                    # ExpressionAttributeValues에서 값 찾기
-                    if attr_value.startswith(':'):
-                        if attr_value in ExpressionAttributeValues:
-                            item[attr_name] = ExpressionAttributeValues[attr_value]
-        
-        data[item_id] = item
-        self._write_data(data)
+        hash_value = attr_values[hash_key]
+        operands = [attr_values[key] for key in operand_keys]
+        if op is None:
+            return index.lookup(hash_value, start_after=start_after)
+        if op == 'BETWEEN':
+            return index.lookup(hash_value, operands[0], operands[1], start_after=start_after)
+        if op == '=':
+            return index.lookup(hash_value, operands[0], operands[0], start_after=start_after)
+        if op == 'begins_with':
+            if not isinstance(operands[0], str):
+                return None
+            return index.lookup(hash_value, operands[0], operands[0] + '\U0010ffff', high_inclusive=False,
+                                start_after=start_after)
+        if op in ('<', '<='):
+            return index.lookup(hash_value, high=operands[0], high_inclusive=(op == '<='),
+                                start_after=start_after)
+        return index.lookup(hash_value, low=operands[0], low_inclusive=(op == '>='),
+                            start_after=start_after)
+
+
+class LocalJournalTable(LocalNoSQLTable):
+    """
+    추가 전용 저널 기반 테이블
     
-    @staticmethod
-    def _evaluate_filter(item: dict, expression: str, attr_names: dict, attr_values: dict) -> bool:
-        """필터 표현식 평가"""
-        # name = :value 형식
-        if '=' in expression:
-            left, right = expression.split('=')
-            left = left.strip()
-            right = right.strip()
+    변경 사항은 <table>.journal 파일에 한 줄짜리 레코드로 추가되고,
+    열 때 스냅샷(<table>.json) 위에 저널을 재생합니다.
+    저널 레코드가 compact_threshold개를 넘으면 스냅샷으로 압축합니다.
+    """
+    
+    # 저널 추가는 레코드 수에 비례하므로 boto3와 같은 간격으로 flush
+    BATCH_FLUSH_AMOUNT = 25
+    
+    def __init__(self, file_path: Path, table_name: str, compact_threshold: int = 1000,
+                 indexes: dict = None):
+        super().__init__(file_path, table_name, indexes)
+        self.journal_path = Path(file_path).with_suffix('.journal')
+        self.compact_threshold = compact_threshold
+        
+        # 캐시에 반영된 저널 위치 (inode, 바이트 오프셋)와 압축 이후 레코드 수
+        self._journal_inode = None
+        self._journal_offset = 0
+        self._journal_records = 0
+    
+    def _journal_stat(self):
+        """저널 파일의 (inode, 크기)"""
+        try:
+            st = os.stat(self.journal_path)
+        except FileNotFoundError:
+            return None, 0
+        return st.st_ino, st.st_size
+    
+    def _read_data(self) -> dict:
+        """스냅샷 + 저널 재생 (새로 추가된 저널 레코드만 이어서 재생)"""
+        if self._cache_is_current(*self._journal_stat(), exact=True):
+            return self._cache
+        
+        with self._refresh_lock:
+            journal_inode, journal_size = self._journal_stat()
+            if self._cache_is_current(journal_inode, journal_size, exact=False):
+                if journal_size > self._journal_offset:
+                    # 다른 읽기 스레드가 순회 중일 수 있으므로 복사본에 이어서 재생
+                    data = dict(self._cache)
+                    self._replay(data, self._journal_offset)
+                    self._cache = data
+                return self._cache
             
-            # #name 치환
-            if left.startswith('#') and attr_names:
-                left = attr_names.get(left, left)
+            signature = self._file_signature()
+            data = self._load_snapshot()
+            self._journal_inode = journal_inode
+            self._journal_records = 0
+            self._replay(data, 0)
             
-            # :value 치환
-            if right.startswith(':') and attr_values:
-                right_value = attr_values.get(right)
-                return item.get(left) == right_value
+            self._cache = data
+            self._cache_signature = signature
+            return data
+    
+    def _cache_is_current(self, journal_inode, journal_size: int, exact: bool) -> bool:
+        """
+        캐시가 스냅샷과 같은 파일 기준인지 확인
+        exact=False이면 저널 뒤에 레코드가 추가된 경우(이어서 재생 가능)도 참
+        """
+        if self._cache is None or self._file_signature() != self._cache_signature:
+            return False
+        if journal_inode != self._journal_inode:
+            return False
+        if exact:
+            return journal_size == self._journal_offset
+        return journal_size >= self._journal_offset
+    
+    def _replay(self, data: dict, offset: int):
+        """offset부터 완결된 저널 레코드를 data에 적용"""
+        try:
+            with open(self.journal_path, 'rb') as f:
+                f.seek(offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            self._journal_offset = 0
+            return
+        count_read_bytes(len(chunk))
         
-        return True
+        # 마지막 줄이 개행으로 끝나지 않으면 아직 쓰는 중(또는 중단된) 레코드이므로 건너뜀
+        end = chunk.rfind(b'\n') + 1
+        for line in chunk[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            self._apply_record(data, record)
+            self._journal_records += 1
+        
+        self._journal_offset = offset + end
     
     @staticmethod
-    def _evaluate_query(item: dict, expression: str, attr_values: dict) -> bool:
-        """쿼리 조건 평가"""
-        # department_id = :dept_id 형식
-        # 또는 department_id = :dept_id AND event_date BETWEEN :start AND :end
-        
-        if 'BETWEEN' in expression:
-            # BETWEEN 처리
-            parts = expression.split(' AND ')
-            
-            for part in parts:
-                part = part.strip()
-                
-                if '=' in part:
-                    attr_name, value_key = part.split('=')
-                    attr_name = attr_name.strip()
-                    value_key = value_key.strip()
-                    
-                    if value_key.startswith(':') and value_key in attr_values:
-                        if item.get(attr_name) != attr_values[value_key]:
-                            return False
-                
-                elif 'BETWEEN' in part:
-                    attr_name, rest = part.split(' BETWEEN ')
-                    attr_name = attr_name.strip()
-                    start_key, end_key = rest.split(' AND ')
-                    start_key = start_key.strip().lstrip(':')
-                    end_key = end_key.strip().lstrip(':')
-                    
-                    value = item.get(attr_name)
-                    if value:
-                        start = attr_values.get(':' + start_key)
-                        end = attr_values.get(':' + end_key)
-                        
-                        if not (start <= value <= end):
-                            return False
-            
-            return True
+    def _apply_record(data: dict, record: dict):
+        """저널 레코드 하나 적용"""
+        op = record.get('op')
+        if op == 'put':
+            item = record['item']
+            data[item['id']] = item
+        elif op == 'delete':
+            data.pop(record['id'], None)
+    
+    def _append(self, data: dict, records: List[dict]):
+        """저널에 레코드 추가 후 필요하면 압축"""
+        line = ''.join(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n' for record in records
+        ).encode('utf-8')
+        try:
+            with open(self.journal_path, 'a+b') as f:
+                # 중단된 쓰기로 남은 불완전한 줄 뒤에 붙지 않도록 줄을 끊어줌
+                end = f.seek(0, os.SEEK_END)
+                if end:
+                    f.seek(end - 1)
+                    if f.read(1) != b'\n':
+                        line = b'\n' + line
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                self._journal_offset = f.tell()
+                self._journal_inode = os.fstat(f.fileno()).st_ino
+        except Exception:
+            self.invalidate_cache()
+            raise
         
-        elif '=' in expression:
-            attr_name, value_key = expression.split('=')
-            attr_name = attr_name.strip()
-            value_key = value_key.strip()
-            
-            if value_key.startswith(':') and value_key in attr_values:
-                return item.get(attr_name) == attr_values[value_key]
+        self._journal_records += len(records)
+        if self._journal_records >= self.compact_threshold:
+            self._compact(data)
+    
+    def _commit_put(self, data: dict, item: dict):
+        """항목 저장 반영 (저널 레코드 추가)"""
+        self._append(data, [{'op': 'put', 'item': item}])
+    
+    def _commit_delete(self, data: dict, item_id: str):
+        """항목 삭제 반영 (저널 레코드 추가)"""
+        self._append(data, [{'op': 'delete', 'id': item_id}])
+    
+    def _commit_batch(self, data: dict, records: List[dict]):
+        """일괄 변경 반영 (저널에 한 번에 추가)"""
+        self._append(data, records)
+    
+    def compact(self):
+        """현재 상태를 스냅샷으로 저장하고 저널 비우기"""
+        with self._lock.write():
+            self._compact(self._read_data())
+    
+    def _compact(self, data: dict):
+        """스냅샷 저장 + 저널 비우기 (쓰기 잠금을 잡은 상태에서 호출)"""
+        # 스냅샷을 원자적으로 교체한 뒤 저널을 비움
+        # (그 사이에 중단되어도 저널 재생은 멱등이므로 안전)
+        self._purge_expired(data)
+        _atomic_write_json(self.file_path, data)
+        with open(self.journal_path, 'wb') as f:
+            os.fsync(f.fileno())
         
-        return True
+        self._cache = data
+        self._cache_signature = self._file_signature()
+        self._journal_inode, self._journal_offset = self._journal_stat()
+        self._journal_records = 0
+    
+    def invalidate_cache(self):
+        """메모리 캐시 무효화"""
+        super().invalidate_cache()
+        self._journal_inode = None
+        self._journal_offset = 0
 
 
 # boto3 호환 래퍼
 class LocalNoSQLClient:
     """boto3 호환 클라이언트"""
     
-    def __init__(self, data_dir: str = "data"):
-        self.db = LocalNoSQLDatabase(data_dir)
+    def __init__(self, data_dir: str = "data", storage: str = "json",
+                 compact_threshold: int = 1000):
+        self.db = LocalNoSQLDatabase(data_dir, storage, compact_threshold)
         self.meta = type('obj', (object,), {'client': type('obj', (object,), {
             'exceptions': type('obj', (object,), {
                 'ResourceInUseException': Exception
@@ -274,14 +852,27 @@ class LocalNoSQLClient:
     def resource(self, *args, **kwargs):
         """AWS 리소스 호환성"""
         return self
+    
+    def batch_get_item(self, RequestItems: dict) -> dict:
+        """여러 테이블 일괄 조회 (boto3 resource.batch_get_item 호환)"""
+        responses = {}
+        for table_name, request in RequestItems.items():
+            result = self.Table(table_name).batch_get_item(Keys=request.get('Keys', []))
+            responses.update(result['Responses'])
+        return {'Responses': responses, 'UnprocessedKeys': {}}
 
 
 class LocalDynamoDBDatabase:
     """로컬 테스트용 DynamoDB 에뮬레이션"""
     
-    def __init__(self, data_dir: str = "data"):
+    # 로컬 테이블은 id 하나로 항목을 찾음
+    events_key_attributes = ('id',)
+    
+    def __init__(self, data_dir: str = "data", storage: str = "json",
+                 compact_threshold: int = 1000):
         self.data_dir = data_dir
-        self.client = LocalNoSQLClient(data_dir)
+        self.storage = storage
+        self.client = LocalNoSQLClient(data_dir, storage, compact_threshold)
         self.dynamodb = self.client
     
     def create_tables(self):
@@ -0,0 +1,197 @@
+"""
+여러 워커 프로세스 간 Socket.IO 메시지 전달
+방(room) 정보는 프로세스 메모리에만 있으므로, 워커가 여럿이면 emit을 메시지 큐로 보내 모든 워커가 자기 접속자에게 전달합니다.
+
+SOCKETIO_MESSAGE_QUEUE 값에 따라
+    local://호스트:포트   이 파일의 로컬 브로커 (테스트/단일 호스트용, 추가 패키지 없음)
+    redis://...          Redis (redis 패키지 필요)
+    amqp:// 등           Kombu (kombu 패키지 필요)
+
+로컬 브로커 실행:
+    python message_queue.py --port 6390
+"""
+
+import argparse
+import os
+import pickle
+import socket
+import socketserver
+import struct
+import threading
+from typing import Dict
+from urllib.parse import urlparse
+
+from socketio import PubSubManager
+
+# 메시지 프레임 길이 헤더 (4바이트 빅엔디언)
+_HEADER = struct.Struct('>I')
+
+# Flask-SocketIO 기본 채널
+DEFAULT_CHANNEL = 'flask-socketio'
+
+
+def _read_frame(conn) -> bytes:
+    """길이 헤더가 붙은 프레임 하나 읽기 (연결이 끊기면 ConnectionError)"""
+    header = _read_exact(conn, _HEADER.size)
+    return _read_exact(conn, _HEADER.unpack(header)[0])
+
+
+def _read_exact(conn, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = conn.recv(size)
+        if not chunk:
+            raise ConnectionError('브로커 연결이 끊겼습니다.')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _frame(body: bytes) -> bytes:
+    return _HEADER.pack(len(body)) + body
+
+
+class LocalQueueManager(PubSubManager):
+    """
+    로컬 브로커(LocalBroker)를 쓰는 Socket.IO 클라이언트 매니저
+
+    발행용/구독용 연결을 따로 두며, 발행한 메시지는 자신을 포함한 모든 워커가 받습니다.
+    메시지는 RedisManager와 같이 pickle로 직렬화하므로 신뢰할 수 있는 네트워크에서만 사용해야 합니다.
+    """
+
+    name = 'local'
+
+    def __init__(self, url: str = 'local://127.0.0.1:6390', channel: str = 'socketio',
+                 write_only: bool = False, logger=None):
+        parsed = urlparse(url)
+        self.address = (parsed.hostname or '127.0.0.1', parsed.port or 6390)
+        self._socket = socket
+        self._publisher = None
+        self._publish_lock = threading.Lock()
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+
+    def initialize(self):
+        if self.server.async_mode == 'eventlet':
+            # 허브를 막지 않도록 green socket과 green 락 사용
+            from eventlet.green import socket as green_socket
+            from eventlet.semaphore import Semaphore
+            with self._publish_lock:
+                if self._publisher is not None:
+                    self._publisher.close()
+                    self._publisher = None
+            self._socket = green_socket
+            self._publish_lock = Semaphore()
+        super().initialize()
+
+    def _connect(self):
+        return self._socket.create_connection(self.address)
+
+    def _publish(self, data: Dict):
+        frame = _frame(pickle.dumps((self.channel, data)))
+        with self._publish_lock:
+            # 브로커가 재시작됐으면 한 번 다시 연결
+            for retry in (False, True):
+                try:
+                    if self._publisher is None:
+                        self._publisher = self._connect()
+                    self._publisher.sendall(frame)
+                    return
+                except OSError:
+                    if self._publisher is not None:
+                        self._publisher.close()
+                    self._publisher = None
+                    if retry:
+                        raise
+
+    def _listen(self):
+        while True:
+            try:
+                conn = self._connect()
+            except OSError as e:
+                self._get_logger().error(f'메시지 브로커 연결 실패: {e}')
+                self.server.sleep(1)
+                continue
+            try:
+                while True:
+                    channel, data = pickle.loads(_read_frame(conn))
+                    if channel == self.channel:
+                        yield data
+            except (OSError, ConnectionError) as e:
+                self._get_logger().error(f'메시지 브로커 연결 끊김: {e}')
+                conn.close()
+                self.server.sleep(1)
+
+
+def socketio_queue_options(url: str = None, channel: str = DEFAULT_CHANNEL) -> Dict:
+    """
+    SocketIO(...)에 넘길 메시지 큐 옵션
+
+    SOCKETIO_MESSAGE_QUEUE가 없으면 빈 딕셔너리 (단일 워커)
+    """
+    url = url if url is not None else os.environ.get('SOCKETIO_MESSAGE_QUEUE', '')
+    if not url:
+        return {}
+    if url.startswith('local://'):
+        return {'client_manager': LocalQueueManager(url, channel=channel)}
+    # redis://, amqp:// 등은 Flask-SocketIO가 RedisManager/KombuManager를 선택
+    return {'message_queue': url, 'channel': channel}
+
+
+class LocalBroker(socketserver.ThreadingTCPServer):
+    """받은 프레임을 연결된 모든 워커(보낸 워커 포함)에게 그대로 전달하는 브로커"""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, address):
+        super().__init__(address, _BrokerHandler)
+        self.connections = {}  # 연결 -> 전송 락
+        self.lock = threading.Lock()
+
+    def relay(self, frame: bytes):
+        with self.lock:
+            connections = list(self.connections.items())
+        for conn, send_lock in connections:
+            try:
+                with send_lock:
+                    conn.sendall(frame)
+            except OSError:
+                self.drop(conn)
+
+    def drop(self, conn):
+        with self.lock:
+            self.connections.pop(conn, None)
+
+
+class _BrokerHandler(socketserver.BaseRequestHandler):
+
+    def handle(self):
+        with self.server.lock:
+            self.server.connections[self.request] = threading.Lock()
+        try:
+            while True:
+                body = _read_frame(self.request)
+                self.server.relay(_frame(body))
+        except (OSError, ConnectionError):
+            pass
+        finally:
+            self.server.drop(self.request)
+
+
+def main():
+    """로컬 브로커 실행"""
+    parser = argparse.ArgumentParser(description='Socket.IO 로컬 메시지 브로커')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=6390)
+    args = parser.parse_args()
+
+    with LocalBroker((args.host, args.port)) as broker:
+        print(f"메시지 브로커 실행 중: local://{args.host}:{args.port}", flush=True)
+        try:
+            broker.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
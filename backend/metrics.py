@@ -0,0 +1,374 @@
+"""
+Prometheus 형식 지표 (/metrics)
+- HTTP: 라우트별 응답 시간 히스토그램과 상태 코드별 요청 수
+- 데이터베이스: 테이블 호출(get/query/scan/put/update/delete, batch_get)별 소요 시간, 오류 수,
+  반환 항목 수, 읽은 바이트 수 (AWS는 응답 본문, SQLite는 행 JSON 크기,
+  로컬 JSON은 다시 읽은 파일/저널 크기라서 메모리 캐시로 처리한 호출은 0)
+- Socket.IO: 연결된 클라이언트 수, 부서 방(dept_*)별 인원, 이벤트별 emit 수와 전송 바이트
+
+요청 경로에서는 잠금 아래 카운터만 올리고, 문자열 생성과 방 인원 집계는 수집(scrape) 때만 합니다.
+Socket.IO 연결/방 인원은 워커 프로세스별 값입니다.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Tuple
+
+from tracing import record_operation, record_packet
+
+# 응답 시간 히스토그램 구간 (초)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def utf8_length(text: str) -> int:
+    """UTF-8로 인코딩했을 때의 바이트 수 (ASCII 문자열은 인코딩하지 않음)"""
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _format_value(value) -> str:
+    if isinstance(value, float):
+        if value == float('inf'):
+            return '+Inf'
+        return repr(value)
+    return str(value)
+
+
+class Counter:
+    """레이블 값 튜플별 누적 카운터"""
+
+    kind = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Tuple = (), amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Tuple = ()):
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in sorted(values):
+            yield f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+
+
+class Histogram:
+    """레이블 값 튜플별 히스토그램 (구간별 개수는 수집 때 누적합으로 변환)"""
+
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._values = {}  # labels -> [구간별 개수..., +Inf 개수, 합계]
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Tuple, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            counts[index] += 1
+            counts[-1] += value
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            values = [(labels, list(counts)) for labels, counts in self._values.items()]
+        for labels, counts in sorted(values):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = _format_labels(self.labelnames, labels, f'le="{_format_value(float(bound))}"')
+                yield f'{self.name}_bucket{le} {cumulative}'
+            label_text = _format_labels(self.labelnames, labels)
+            yield f'{self.name}_sum{label_text} {_format_value(counts[-1])}'
+            yield f'{self.name}_count{label_text} {cumulative}'
+
+
+class CallbackGauge:
+    """수집할 때 collect()가 돌려준 (레이블 값 튜플, 값) 목록을 그대로 내보내는 게이지"""
+
+    kind = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...],
+                 collect: Callable[[], Iterable[Tuple[Tuple, float]]]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._collect = collect
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self._collect()):
+            yield f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+
+
+class Registry:
+    """지표 목록과 Prometheus 텍스트 형식(0.0.4) 출력"""
+
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            try:
+                lines.extend(metric.samples())
+            except Exception as e:
+                print(f"지표 수집 오류 ({metric.name}): {e}")
+        return '\n'.join(lines) + '\n'
+
+
+# ==================== 데이터베이스 ====================
+
+# 계측 중인 테이블 호출 안에서 읽은 바이트 수 (스레드별)
+_read_bytes = threading.local()
+
+
+def count_read_bytes(size: int):
+    """저장소에서 읽은 바이트 수를 현재 테이블 호출에 더함 (계측 중인 호출 밖이면 무시)"""
+    total = getattr(_read_bytes, 'total', None)
+    if total is not None:
+        _read_bytes.total = total + size
+
+
+def count_response_bytes(http_response=None, **kwargs):
+    """botocore after-call 핸들러: DynamoDB 응답 본문 크기를 읽은 바이트 수로 집계"""
+    if http_response is not None and http_response.raw is not None:
+        count_read_bytes(len(http_response.content))
+
+
+def _items_returned(response) -> int:
+    if not isinstance(response, dict):
+        return 0
+    if 'Items' in response:
+        return len(response['Items'] or ())
+    if 'Responses' in response:
+        return sum(len(items) for items in response['Responses'].values())
+    return 1 if response.get('Item') else 0
+
+
+class _OperationTimer:
+    """테이블 호출 하나의 소요 시간, 오류, 반환 항목 수, 읽은 바이트 수 기록"""
+
+    def __init__(self, metrics: 'AppMetrics', backend: str):
+        self._metrics = metrics
+        self._backend = backend
+
+    def wrap(self, table_name: str, operation: str, method: Callable) -> Callable:
+        metrics = self._metrics
+        labels = (self._backend, table_name, operation)
+
+        def call(**kwargs):
+            outer = getattr(_read_bytes, 'total', None)
+            _read_bytes.total = 0
+            response = None
+            failed = False
+            start = time.perf_counter()
+            try:
+                response = method(**kwargs)
+                return response
+            except Exception:
+                failed = True
+                metrics.db_errors.inc(labels)
+                raise
+            finally:
+                elapsed = time.perf_counter() - start
+                read = _read_bytes.total
+                _read_bytes.total = outer
+                metrics.db_duration.observe(labels, elapsed)
+                if read:
+                    metrics.db_read_bytes.inc(labels, read)
+                items = _items_returned(response)
+                if items:
+                    metrics.db_items.inc(labels, items)
+                # 요청 추적 중이면 느린 작업 기록용으로 호출 내용도 남김
+                record_operation(table_name, operation, kwargs, elapsed, items, read, failed)
+        call.__name__ = operation
+        return call
+
+
+class InstrumentedTable:
+    """테이블 읽기/쓰기 메서드를 계측하는 래퍼 (나머지 메서드와 속성은 원래 테이블에 위임)"""
+
+    OPERATIONS = ('get_item', 'query', 'scan', 'put_item', 'update_item', 'delete_item')
+
+    def __init__(self, table, timer: _OperationTimer):
+        self._table = table
+        self.name = table.name
+        for operation in self.OPERATIONS:
+            method = getattr(table, operation, None)
+            if method is not None:
+                setattr(self, operation, timer.wrap(table.name, operation, method))
+
+    def __getattr__(self, name):
+        return getattr(self._table, name)
+
+
+class _InstrumentedResource:
+    """db.dynamodb 래퍼 (batch_get_item만 계측)"""
+
+    def __init__(self, resource, timer: _OperationTimer):
+        self._resource = resource
+        self._timer = timer
+
+    def batch_get_item(self, RequestItems: Dict, **kwargs):
+        table_name = ','.join(sorted(RequestItems))
+        method = self._timer.wrap(table_name, 'batch_get_item', self._resource.batch_get_item)
+        return method(RequestItems=RequestItems, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._resource, name)
+
+
+class InstrumentedDatabase:
+    """get_departments_table / get_events_table이 계측 래퍼를 돌려주는 데이터베이스 프록시"""
+
+    def __init__(self, db, timer: _OperationTimer):
+        self._db = db
+        self._timer = timer
+        self._tables = {}
+        self.dynamodb = _InstrumentedResource(db.dynamodb, timer)
+
+    def _instrumented(self, table):
+        wrapped = self._tables.get(id(table))
+        if wrapped is None or wrapped._table is not table:
+            wrapped = self._tables[id(table)] = InstrumentedTable(table, self._timer)
+        return wrapped
+
+    def get_departments_table(self):
+        return self._instrumented(self._db.get_departments_table())
+
+    def get_events_table(self):
+        return self._instrumented(self._db.get_events_table())
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
+# ==================== 애플리케이션 지표 ====================
+
+class AppMetrics:
+    """서버 지표 모음"""
+
+    def __init__(self):
+        self.registry = Registry()
+        register = self.registry.register
+        self.http_duration = register(Histogram(
+            'http_request_duration_seconds', 'HTTP 요청 처리 시간 (초)', ('method', 'route')))
+        self.http_requests = register(Counter(
+            'http_requests_total', '상태 코드별 HTTP 요청 수', ('method', 'route', 'status')))
+        self.db_duration = register(Histogram(
+            'db_operation_duration_seconds', '테이블 호출 시간 (초, 속도 제한 대기와 재시도 포함)',
+            ('backend', 'table', 'operation')))
+        self.db_errors = register(Counter(
+            'db_operation_errors_total', '오류로 끝난 테이블 호출 수', ('backend', 'table', 'operation')))
+        self.db_items = register(Counter(
+            'db_items_returned_total', '테이블 호출이 반환한 항목 수', ('backend', 'table', 'operation')))
+        self.db_read_bytes = register(Counter(
+            'db_read_bytes_total', '테이블 호출 중 저장소/응답에서 읽은 바이트 수',
+            ('backend', 'table', 'operation')))
+        self.socket_emits = register(Counter(
+            'socketio_emits_total', '이벤트별 Socket.IO 전송 패킷 수 (수신자마다 1)', ('event',)))
+        self.socket_emit_bytes = register(Counter(
+            'socketio_emit_bytes_total', '이벤트별 Socket.IO 전송 패킷 크기 합계 (바이트)', ('event',)))
+
+    def render(self) -> str:
+        return self.registry.render()
+
+    def instrument_flask(self, app):
+        """Flask 요청마다 라우트(URL 규칙) 단위로 처리 시간과 상태 코드 기록"""
+        from flask import g, request
+
+        @app.before_request
+        def start_timer():
+            g.metrics_start = time.perf_counter()
+
+        @app.after_request
+        def record_request(response):
+            start = g.pop('metrics_start', None)
+            if start is not None:
+                route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+                self.http_duration.observe((request.method, route), time.perf_counter() - start)
+                self.http_requests.inc((request.method, route, str(response.status_code)))
+            return response
+
+    def instrument_database(self, db, backend: str) -> InstrumentedDatabase:
+        """테이블 호출을 backend 레이블(local/sqlite/aws)로 계측하는 데이터베이스 프록시"""
+        return InstrumentedDatabase(db, _OperationTimer(self, backend))
+
+    def socket_json(self, json_module):
+        """
+        emit 수와 크기를 세는 Socket.IO json 모듈 (SocketIO(json=...))
+
+        이벤트 패킷은 [이벤트 이름, 데이터...] 목록으로 직렬화되므로 첫 항목을 이벤트 이름으로 씁니다.
+        python-socketio는 수신자마다 패킷을 직렬화하므로 방 전체 emit은 인원 수만큼 셉니다.
+        """
+        metrics = self
+
+        class CountingJSON:
+            @staticmethod
+            def dumps(obj, **kwargs) -> str:
+                text = json_module.dumps(obj, **kwargs)
+                if isinstance(obj, list) and obj and isinstance(obj[0], str):
+                    labels = (obj[0],)
+                    size = utf8_length(text)
+                    metrics.socket_emits.inc(labels)
+                    metrics.socket_emit_bytes.inc(labels, size)
+                    record_packet(size)
+                return text
+
+            @staticmethod
+            def loads(text, **kwargs):
+                return json_module.loads(text, **kwargs)
+
+        return CountingJSON
+
+    def watch_socketio(self, socketio, namespace: str = '/'):
+        """연결된 클라이언트 수와 dept_* 방 인원을 수집 때 Socket.IO 서버에서 읽음"""
+
+        def rooms():
+            return socketio.server.manager.rooms.get(namespace, {})
+
+        def connected():
+            return [((), len(rooms().get(None) or ()))]
+
+        def room_members():
+            return [((room,), len(members)) for room, members in list(rooms().items())
+                    if isinstance(room, str) and room.startswith('dept_')]
+
+        self.registry.register(CallbackGauge(
+            'socketio_connected_clients', '이 워커에 연결된 Socket.IO 클라이언트 수', (), connected))
+        self.registry.register(CallbackGauge(
+            'socketio_room_members', '이 워커의 부서 방별 인원', ('room',), room_members))
@@ -5,11 +5,18 @@ JSON 기반 데이터 → AWS DynamoDB 마이그레이션 스크립트
 
 import json
 import os
+import sys
 import boto3
 from datetime import datetime
 import uuid
 from pathlib import Path
 
+from dynamodb_fast import FastTable
+from models import Department, DynamoDBDatabase, Event, dynamodb_client_config, parallel_count, parallel_scan
+
+# BatchWriteItem 요청당 최대 항목 수
+BATCH_WRITE_LIMIT = 25
+
 
 class MigrationManager:
     """마이그레이션 관리 클래스"""
@@ -17,7 +24,9 @@ class MigrationManager:
     def __init__(self):
         # AWS 설정
         self.region = os.environ.get('AWS_REGION', 'ap-northeast-2')
-        self.dynamodb = boto3.resource('dynamodb', region_name=self.region)
+        self.dynamodb = boto3.resource('dynamodb', region_name=self.region, config=dynamodb_client_config())
+        # 병렬 스캔은 스레드 간에 공유해도 안전한 저수준 client로 처리
+        self.client = boto3.client('dynamodb', region_name=self.region, config=dynamodb_client_config())
         
         # 테이블 이름
         self.departments_table_name = os.environ.get('DEPARTMENTS_TABLE', 'departments')
@@ -27,6 +36,9 @@ class MigrationManager:
         self.departments_table = self.dynamodb.Table(self.departments_table_name)
         self.events_table = self.dynamodb.Table(self.events_table_name)
         
+        # 이벤트 일괄 생성은 모델의 create_many 사용 (get_events_table로 이 테이블을 넘김)
+        self.event_model = Event(self)
+        
         # 파일 경로
         self.base_path = Path(__file__).parent.parent
         self.departments_file = self.base_path / 'departments.json'
@@ -45,6 +57,14 @@ class MigrationManager:
             print(f"❌ JSON 로드 오류 ({file_path}): {e}")
             return None
     
+    def get_events_table(self):
+        return self.events_table
+    
+    def _name_reserved(self, name):
+        """이름 예약 항목이 이미 있는지 (다시 실행해도 기존 부서의 이름을 빼앗지 않도록)"""
+        key = {'id': Department.NAME_RESERVATION_PREFIX + name}
+        return 'Item' in self.departments_table.get_item(Key=key, ProjectionExpression='id')
+    
     def migrate_departments(self):
         """부서 데이터 마이그레이션"""
         print("\n📋 부서 데이터 마이그레이션 시작...")
@@ -53,26 +73,34 @@ class MigrationManager:
         if not data:
             return 0
         
-        departments = data.get('departments', [])
-        migrated = 0
-        
-        for dept in departments:
-            try:
+        def department_items():
+            seen = set()
+            for dept in data.get('departments', []):
+                name = dept.get('name', '')
+                # 같은 이름이 두 번 있으면 예약 키가 겹쳐 일괄 쓰기 전체가 거절되므로 처음 것만 옮김
+                if name in seen:
+                    print(f"  ⚠️  부서 '{name}' 이름이 중복되어 건너뜁니다.")
+                    continue
+                seen.add(name)
+                if self._name_reserved(name):
+                    print(f"  • 부서 '{name}'은(는) 이미 있어 건너뜁니다.")
+                    continue
+                
                 # UUID 생성
                 item = {
                     'id': str(uuid.uuid4()),
-                    'name': dept.get('name', ''),
+                    'name': name,
                     'description': dept.get('description', ''),
                     'created_at': datetime.utcnow().isoformat(),
                     'updated_at': datetime.utcnow().isoformat()
                 }
-                
-                # DynamoDB에 저장
-                self.departments_table.put_item(Item=item)
-                print(f"  ✓ 부서 '{item['name']}' 마이그레이션 완료")
-                migrated += 1
-            except Exception as e:
-                print(f"  ❌ 부서 '{dept.get('name')}' 마이그레이션 실패: {e}")
+                # 부서와 이름 예약 항목은 같은 일괄 쓰기에 넣음
+                yield f"부서 '{item['name']}'", [item, Department.name_reservation(item['name'], item['id'])]
+        
+        migrated, error = self._write_batches(self.departments_table, department_items())
+        if error is not None:
+            print(f"  ❌ 부서 마이그레이션 실패: {error} (기록 완료: {migrated}개)")
+            return migrated
         
         print(f"\n✅ 부서 데이터 마이그레이션 완료: {migrated}개")
         return migrated
@@ -88,41 +116,77 @@ class MigrationManager:
         # 부서 목록 조회 (매핑용)
         departments = self._get_all_departments()
         
-        migrated = 0
+        # 첫 번째 부서로 매핑 (기존 데이터는 부서 ID가 0)
+        default_dept_id = departments[0]['id'] if departments else str(uuid.uuid4())
         
-        for date_str, events_list in data.items():
-            for event in events_list:
-                try:
-                    # 첫 번째 부서로 매핑 (기존 데이터는 부서 ID가 0)
-                    default_dept_id = departments[0]['id'] if departments else str(uuid.uuid4())
-                    
-                    item = {
-                        'id': str(uuid.uuid4()),
-                        'department_id': default_dept_id,
-                        'event_date': date_str,
-                        'title': event.get('Title', ''),
-                        'description': event.get('Description', ''),
-                        'time': event.get('Time', ''),
-                        'url': event.get('Url', ''),
-                        'created_at': datetime.utcnow().isoformat(),
-                        'last_modified': event.get('LastModified', datetime.utcnow().isoformat())
-                    }
-                    
-                    # DynamoDB에 저장
-                    self.events_table.put_item(Item=item)
-                    print(f"  ✓ 이벤트 '{item['title']}' ({date_str}) 마이그레이션 완료")
-                    migrated += 1
-                except Exception as e:
-                    print(f"  ❌ 이벤트 마이그레이션 실패: {e}")
+        events = [
+            {
+                'event_date': date_str,
+                'title': event.get('Title', ''),
+                'description': event.get('Description', ''),
+                'time': event.get('Time', ''),
+                'url': event.get('Url', ''),
+                'last_modified': event.get('LastModified')
+            }
+            for date_str, events_list in data.items()
+            for event in events_list
+        ]
+        
+        # BATCH_WRITE_LIMIT개씩 일괄 생성하고, 끝난 묶음만 셈
+        migrated = 0
+        for start in range(0, len(events), BATCH_WRITE_LIMIT):
+            chunk = events[start:start + BATCH_WRITE_LIMIT]
+            if not self.event_model.create_many(default_dept_id, chunk):
+                print(f"  ❌ 이벤트 마이그레이션 실패 (기록 완료: {migrated}개)")
+                return migrated
+            for event in chunk:
+                print(f"  ✓ 이벤트 '{event['title']}' ({event['event_date']}) 마이그레이션 완료")
+            migrated += len(chunk)
         
         print(f"\n✅ 이벤트 데이터 마이그레이션 완료: {migrated}개")
         return migrated
     
+    def _write_batches(self, table, groups):
+        """
+        (설명, 항목 목록) 묶음들을 BATCH_WRITE_LIMIT개 이하씩 BatchWriteItem으로 저장
+        한 묶음의 항목은 항상 같은 요청에 넣고, 요청이 끝난(UnprocessedItems까지 처리된) 묶음만 셉니다.
+        
+        Returns:
+            (기록 완료된 묶음 수, 실패했으면 예외 아니면 None)
+        """
+        written = 0
+        chunk = []
+        
+        def flush():
+            with table.batch_writer() as batch:
+                for _, items in chunk:
+                    for item in items:
+                        batch.put_item(Item=item)
+            for description, _ in chunk:
+                print(f"  ✓ {description} 마이그레이션 완료")
+            return len(chunk)
+        
+        try:
+            for description, items in groups:
+                if chunk and sum(len(group) for _, group in chunk) + len(items) > BATCH_WRITE_LIMIT:
+                    written += flush()
+                    chunk = []
+                chunk.append((description, items))
+            if chunk:
+                written += flush()
+        except Exception as e:
+            return written, e
+        return written, None
+    
     def _get_all_departments(self):
-        """모든 부서 조회"""
+        """모든 부서 조회 (id, name만, 이름 예약 항목 제외)"""
         try:
-            response = self.departments_table.scan()
-            return response.get('Items', [])
+            return parallel_scan(
+                FastTable(self.departments_table, self.client),
+                FilterExpression='attribute_exists(#name)',
+                ProjectionExpression='id, #name',
+                ExpressionAttributeNames={'#name': 'name'}
+            )
         except Exception as e:
             print(f"❌ 부서 조회 오류: {e}")
             return []
@@ -132,14 +196,19 @@ class MigrationManager:
         print("\n🔍 마이그레이션 검증 중...")
         
         try:
-            # 부서 개수 확인
-            dept_response = self.departments_table.scan()
-            dept_count = len(dept_response.get('Items', []))
+            # 부서 개수 확인 (이름 예약 항목 제외)
+            dept_count = parallel_count(
+                FastTable(self.departments_table, self.client),
+                FilterExpression='attribute_exists(#name)',
+                ExpressionAttributeNames={'#name': 'name'}
+            )
             print(f"  • 부서: {dept_count}개")
             
-            # 이벤트 개수 확인
-            event_response = self.events_table.scan()
-            event_count = len(event_response.get('Items', []))
+            # 이벤트 개수 확인 (삭제 표시 항목 제외)
+            event_count = parallel_count(
+                FastTable(self.events_table, self.client),
+                FilterExpression='attribute_not_exists(deleted)'
+            )
             print(f"  • 이벤트: {event_count}개")
             
             print("\n✅ 마이그레이션 검증 완료")
@@ -173,12 +242,53 @@ class MigrationManager:
         print("\n" + "=" * 50)
         print("📊 마이그레이션 결과 요약")
         print("=" * 50)
-        print(f"부서: {dept_count}개")
-        print(f"이벤트: {event_count}개")
+        print(f"부서: {dept_migrated}개 옮김, 테이블에 {dept_count}개")
+        print(f"이벤트: {event_migrated}개 옮김, 테이블에 {event_count}개")
         print("=" * 50)
         
         return True
     
+    def rekey_events(self, target_table_name):
+        """
+        이벤트 테이블 키 스키마 마이그레이션
+        기존 (id, department_id) 복합 키 테이블의 항목을 id 단일 키 테이블로 복사합니다.
+        복사가 끝나면 EVENTS_TABLE 환경 변수를 새 테이블 이름으로 바꾸어 서버를 재시작하세요.
+        """
+        print(f"\n🔑 이벤트 테이블 키 마이그레이션: {self.events_table_name} → {target_table_name}")
+        
+        client = self.dynamodb.meta.client
+        try:
+            self.dynamodb.create_table(**DynamoDBDatabase.events_table_definition(target_table_name))
+            print(f"  ✓ {target_table_name} 테이블 생성 요청 완료")
+        except client.exceptions.ResourceInUseException:
+            print(f"  • {target_table_name} 테이블이 이미 존재합니다.")
+        DynamoDBDatabase.enable_events_ttl(client, target_table_name)
+        
+        target_table = self.dynamodb.Table(target_table_name)
+        copied = 0
+        scan_kwargs = {}
+        
+        try:
+            with target_table.batch_writer(overwrite_by_pkeys=['id']) as batch:
+                while True:
+                    response = self.events_table.scan(**scan_kwargs)
+                    for item in response.get('Items', []):
+                        batch.put_item(Item=item)
+                        copied += 1
+                    
+                    last_key = response.get('LastEvaluatedKey')
+                    if not last_key:
+                        break
+                    scan_kwargs['ExclusiveStartKey'] = last_key
+                    print(f"  … {copied}개 복사 중")
+        except Exception as e:
+            print(f"  ❌ 이벤트 복사 실패: {e}")
+            return False
+        
+        print(f"\n✅ 이벤트 {copied}개 복사 완료")
+        print(f"다음 환경 변수로 서버를 재시작하세요:\n\n  EVENTS_TABLE={target_table_name}")
+        return True
+    
     def _tables_exist(self):
         """테이블이 존재하는지 확인"""
         try:
@@ -191,10 +301,19 @@ class MigrationManager:
 
 
 def main():
-    """메인 함수"""
+    """
+    메인 함수
+    
+    사용법:
+        python migrate_to_dynamodb.py                         # JSON → DynamoDB
+        python migrate_to_dynamodb.py --rekey-events events_v2  # 이벤트 테이블 키 마이그레이션
+    """
     try:
         migration = MigrationManager()
-        success = migration.run()
+        if len(sys.argv) == 3 and sys.argv[1] == '--rekey-events':
+            success = migration.rekey_events(sys.argv[2])
+        else:
+            success = migration.run()
         
         if success:
             print("\n✨ 마이그레이션 완료! DynamoDB를 사용할 준비가 되었습니다.")
@@ -0,0 +1,114 @@
+"""
+모델 조회 결과용 프로세스 내 캐시
+키별 TTL과 LRU 크기 제한을 두고, 적중/실패 횟수를 집계합니다.
+모델의 create/update/delete가 영향받는 키를 직접 무효화합니다.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Optional
+
+from versioning import etag_max_age
+
+
+class ModelCache:
+    """
+    TTL + LRU 캐시
+
+    다른 프로세스(워커)의 쓰기는 무효화 신호를 받지 못하므로 최대 TTL만큼 늦게 반영됩니다.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 1024, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (만료 시각, 값)
+        self._pending = {}  # 읽는 중인 key -> 토큰 (읽는 동안 무효화되면 제거됨)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], object], ttl: float = None):
+        """
+        캐시된 값을 반환하고, 없거나 만료됐으면 loader()로 읽어 저장
+
+        loader가 예외를 내면 저장하지 않고 그대로 전파합니다.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            self.misses += 1
+            token = object()
+            self._pending[key] = token
+
+        try:
+            value = loader()
+        except Exception:
+            with self._lock:
+                if self._pending.get(key) is token:
+                    del self._pending[key]
+            raise
+
+        with self._lock:
+            # 읽는 동안 무효화됐다면 이미 낡은 값일 수 있으므로 저장하지 않음
+            if self._pending.get(key) is token:
+                del self._pending[key]
+                self._entries[key] = (self._clock() + (self.ttl if ttl is None else ttl), value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, *keys: Hashable):
+        """지정한 키 무효화"""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+                self._pending.pop(key, None)
+                self.invalidations += 1
+
+    def clear(self):
+        """전체 무효화"""
+        with self._lock:
+            self._entries.clear()
+            self._pending.clear()
+
+    def stats(self) -> Dict:
+        """적중/실패 통계"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations
+            }
+
+
+def get_model_cache() -> Optional[ModelCache]:
+    """
+    환경 변수로 모델 캐시 생성
+
+    MODEL_CACHE_TTL: 캐시 유지 시간(초), 0이면 캐시 사용 안 함 (기본값: 0)
+    MODEL_CACHE_SIZE: 최대 항목 수 (기본값: 1024)
+    ETag 교체 주기(etag_max_age)가 있으면 다른 워커의 변경이 그 주기 안에 반영되도록 TTL을 그 이하로 줄입니다.
+    """
+    ttl = float(os.environ.get('MODEL_CACHE_TTL', '0'))
+    if ttl <= 0:
+        return None
+    max_age = etag_max_age()
+    if max_age > 0:
+        ttl = min(ttl, max_age)
+    return ModelCache(ttl, int(os.environ.get('MODEL_CACHE_SIZE', '1024')))
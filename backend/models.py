@@ -4,11 +4,47 @@ AWS DynamoDB를 사용한 데이터베이스 모델 정의
 """
 
 import boto3
+import base64
+from botocore.config import Config
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import json
+import threading
+import time as time_module
 import uuid
-from datetime import datetime
-from typing import List, Dict, Optional
+from datetime import datetime, timedelta, timezone
+from typing import List, Dict, Optional, Tuple
 import os
 from decimal import Decimal
+from model_cache import ModelCache
+from cooperative_io import threadpool_size
+from throttling import RetryExhausted, throttled_table
+from metrics import count_response_bytes
+from dynamodb_fast import native_number
+
+
+# 전체 테이블 스캔을 나눌 세그먼트 수 (세그먼트마다 스레드 하나)
+SCAN_SEGMENTS = int(os.environ.get('DYNAMODB_SCAN_SEGMENTS', '4'))
+
+# 병렬 스캔 세그먼트를 실행할 공용 스레드 풀 (처음 병렬 스캔할 때 생성)
+_scan_executor = None
+_scan_executor_lock = threading.Lock()
+
+
+def dynamodb_client_config() -> Config:
+    """
+    DynamoDB client 설정
+    연결 풀 크기는 DYNAMODB_MAX_POOL_CONNECTIONS, 기본값은 동시에 호출할 수 있는 스레드 수
+    (tpool 스레드 수 × 스캔 세그먼트 수, 최소 50)
+    
+    스로틀링 재시도는 throttling.py가 속도 제한과 함께 처리하므로, botocore 자체 재시도는
+    일시적인 오류용으로 한 번만 합니다 (두 계층의 재시도가 곱해지지 않도록).
+    """
+    default_size = max(50, threadpool_size() * SCAN_SEGMENTS)
+    return Config(
+        max_pool_connections=int(os.environ.get('DYNAMODB_MAX_POOL_CONNECTIONS', str(default_size))),
+        retries={'mode': 'standard', 'total_max_attempts': 2}
+    )
 
 
 class DynamoDBDatabase:
@@ -17,7 +53,11 @@ class DynamoDBDatabase:
     def __init__(self):
         # AWS 환경 설정
         self.region = os.environ.get('AWS_REGION', 'ap-northeast-2')
-        self.dynamodb = boto3.resource('dynamodb', region_name=self.region)
+        # 병렬 스캔 스레드들이 연결을 기다리지 않도록 연결 풀 크기 설정
+        self.config = dynamodb_client_config()
+        self.dynamodb = boto3.resource('dynamodb', region_name=self.region, config=self.config)
+        # 응답 본문 크기를 지표(db_read_bytes_total)로 집계
+        self.dynamodb.meta.client.meta.events.register('after-call.dynamodb', count_response_bytes)
         
         # 테이블 이름
         self.departments_table_name = os.environ.get('DEPARTMENTS_TABLE', 'departments')
@@ -26,6 +66,98 @@ class DynamoDBDatabase:
         # 테이블 참조
         self.departments_table = self.dynamodb.Table(self.departments_table_name)
         self.events_table = self.dynamodb.Table(self.events_table_name)
+        
+        # 읽기는 저수준 client로 처리해 Decimal 없이 기본 타입으로 받음 (DYNAMODB_FAST_READS=0이면 resource 그대로)
+        if os.environ.get('DYNAMODB_FAST_READS', '1') != '0':
+            from dynamodb_fast import FastTable
+            client = boto3.client('dynamodb', region_name=self.region, config=self.config)
+            client.meta.events.register('after-call.dynamodb', count_response_bytes)
+            self.departments_table = FastTable(self.departments_table, client)
+            self.events_table = FastTable(self.events_table, client)
+        
+        # 테이블 용량에 맞춘 요청 속도 제한과 스로틀링 재시도 (DYNAMODB_THROTTLE=0이면 사용 안 함)
+        self.departments_table = throttled_table(self.departments_table)
+        self.events_table = throttled_table(self.events_table)
+        
+        # 이벤트 테이블 키 속성 (처음 사용할 때 DescribeTable로 확인)
+        self._events_key_attributes = None
+    
+    @property
+    def events_key_attributes(self) -> Tuple[str, ...]:
+        """
+        이벤트 테이블 기본 키 속성
+        ('id',)이면 GetItem 한 번으로 조회 가능,
+        ('id', 'department_id')이면 마이그레이션 전 기존 스키마
+        
+        DescribeTable이 실패하면 예외를 그대로 올려 해당 요청만 실패시키고 다음 호출에서 다시 확인합니다.
+        (추측한 스키마로 쓰면 기존 테이블에서 키 오류가 나므로 기본값을 쓰지 않음)
+        """
+        if self._events_key_attributes is None:
+            key_schema = self.events_table.key_schema
+            self._events_key_attributes = tuple(key['AttributeName'] for key in key_schema)
+        return self._events_key_attributes
+    
+    @staticmethod
+    def events_table_definition(table_name: str) -> Dict:
+        """이벤트 테이블 생성 파라미터 (id 단일 파티션 키 + 부서/날짜, 부서/변경 시각 GSI)"""
+        return {
+            'TableName': table_name,
+            'KeySchema': [
+                {'AttributeName': 'id', 'KeyType': 'HASH'}  # Partition Key
+            ],
+            'AttributeDefinitions': [
+                {'AttributeName': 'id', 'AttributeType': 'S'},
+                {'AttributeName': 'department_id', 'AttributeType': 'S'},
+                {'AttributeName': 'event_date', 'AttributeType': 'S'},
+                {'AttributeName': 'last_modified', 'AttributeType': 'S'}
+            ],
+            'GlobalSecondaryIndexes': [
+                {
+                    'IndexName': 'department-date-index',
+                    'KeySchema': [
+                        {'AttributeName': 'department_id', 'KeyType': 'HASH'},
+                        {'AttributeName': 'event_date', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'},
+                    'ProvisionedThroughput': {
+                        'ReadCapacityUnits': 10,
+                        'WriteCapacityUnits': 10
+                    }
+                },
+                {
+                    # 델타 동기화: 부서별 변경 시각 순서 (삭제 표시 항목 포함)
+                    'IndexName': 'department-modified-index',
+                    'KeySchema': [
+                        {'AttributeName': 'department_id', 'KeyType': 'HASH'},
+                        {'AttributeName': 'last_modified', 'KeyType': 'RANGE'}
+                    ],
+                    'Projection': {'ProjectionType': 'ALL'},
+                    'ProvisionedThroughput': {
+                        'ReadCapacityUnits': 5,
+                        'WriteCapacityUnits': 5
+                    }
+                }
+            ],
+            'ProvisionedThroughput': {
+                'ReadCapacityUnits': 10,
+                'WriteCapacityUnits': 10
+            }
+        }
+    
+    @staticmethod
+    def enable_events_ttl(client, table_name: str):
+        """
+        이벤트 테이블 생성을 기다린 뒤 expires_at TTL 켜기
+        삭제 표시 항목은 보존 기간이 지나면 DynamoDB TTL로 자동 삭제됩니다.
+        """
+        client.get_waiter('table_exists').wait(TableName=table_name)
+        description = client.describe_time_to_live(TableName=table_name)['TimeToLiveDescription']
+        if description.get('TimeToLiveStatus') in ('ENABLED', 'ENABLING'):
+            return
+        client.update_time_to_live(
+            TableName=table_name,
+            TimeToLiveSpecification={'Enabled': True, 'AttributeName': 'expires_at'}
+        )
     
     def create_tables(self):
         """DynamoDB 테이블 생성 (최초 1회만)"""
@@ -61,37 +193,10 @@ class DynamoDBDatabase:
             print(f"✓ {self.departments_table_name} 테이블이 생성되었습니다.")
             
             # 이벤트 테이블
-            self.dynamodb.create_table(
-                TableName=self.events_table_name,
-                KeySchema=[
-                    {'AttributeName': 'id', 'KeyType': 'HASH'},  # Partition Key
-                    {'AttributeName': 'department_id', 'KeyType': 'RANGE'}  # Sort Key
-                ],
-                AttributeDefinitions=[
-                    {'AttributeName': 'id', 'AttributeType': 'S'},
-                    {'AttributeName': 'department_id', 'AttributeType': 'S'},
-                    {'AttributeName': 'event_date', 'AttributeType': 'S'}
-                ],
-                GlobalSecondaryIndexes=[
-                    {
-                        'IndexName': 'department-date-index',
-                        'KeySchema': [
-                            {'AttributeName': 'department_id', 'KeyType': 'HASH'},
-                            {'AttributeName': 'event_date', 'KeyType': 'RANGE'}
-                        ],
-                        'Projection': {'ProjectionType': 'ALL'},
-                        'ProvisionedThroughput': {
-                            'ReadCapacityUnits': 10,
-                            'WriteCapacityUnits': 10
-                        }
-                    }
-                ],
-                ProvisionedThroughput={
-                    'ReadCapacityUnits': 10,
-                    'WriteCapacityUnits': 10
-                }
-            )
+            self.dynamodb.create_table(**self.events_table_definition(self.events_table_name))
             print(f"✓ {self.events_table_name} 테이블이 생성되었습니다.")
+            
+            self.enable_events_ttl(self.dynamodb.meta.client, self.events_table_name)
         except self.dynamodb.meta.client.exceptions.ResourceInUseException:
             print("✓ 테이블이 이미 존재합니다.")
     
@@ -100,17 +205,263 @@ class DynamoDBDatabase:
     
     def get_events_table(self):
         return self.events_table
+    
+    def throttle_stats(self) -> Dict:
+        """테이블별 속도 제한/스로틀링/재시도 횟수"""
+        return {
+            table.name: table.throttle.stats()
+            for table in (self.departments_table, self.events_table)
+            if hasattr(table, 'throttle')
+        }
+
+
+def _collect_pages(operation, **kwargs) -> List[Dict]:
+    """LastEvaluatedKey가 없을 때까지 scan/query를 이어 호출해 모든 항목 수집"""
+    items = []
+    while True:
+        response = operation(**kwargs)
+        items.extend(response.get('Items', []))
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return items
+        kwargs['ExclusiveStartKey'] = last_key
+
+
+def _count_pages(operation, **kwargs) -> int:
+    """Select='COUNT'로 LastEvaluatedKey가 없을 때까지 이어 호출해 개수 합산"""
+    count = 0
+    while True:
+        response = operation(Select='COUNT', **kwargs)
+        count += response.get('Count', 0)
+        last_key = response.get('LastEvaluatedKey')
+        if not last_key:
+            return count
+        kwargs['ExclusiveStartKey'] = last_key
+
+
+def _scan_segments(table, total_segments: Optional[int], scan_segment) -> List:
+    """
+    Segment/TotalSegments로 테이블을 나누어 세그먼트마다 스레드 하나로 scan_segment(kwargs) 실행
+    
+    세그먼트 수를 주지 않으면 테이블의 SCAN_SEGMENTS(로컬 저장소는 1), 없으면 DYNAMODB_SCAN_SEGMENTS를 사용합니다.
+    세그먼트는 호출마다 스레드를 새로 만들지 않고 공용 스레드 풀에서 실행하며,
+    호출한 쪽의 contextvars(요청 추적)를 복사해 실행합니다.
+    """
+    total_segments = total_segments or getattr(table, 'SCAN_SEGMENTS', None) or SCAN_SEGMENTS
+    if total_segments <= 1:
+        return [scan_segment({})]
+    
+    segments = [{'Segment': segment, 'TotalSegments': total_segments} for segment in range(total_segments)]
+    contexts = [contextvars.copy_context() for _ in segments]
+    return list(_get_scan_executor().map(
+        lambda context, kwargs: context.run(scan_segment, kwargs), contexts, segments))
+
+
+def _get_scan_executor() -> ThreadPoolExecutor:
+    """공용 스캔 스레드 풀 (동시에 스캔할 수 있는 tpool 스레드 수 × 세그먼트 수만큼)"""
+    global _scan_executor
+    if _scan_executor is None:
+        with _scan_executor_lock:
+            if _scan_executor is None:
+                _scan_executor = ThreadPoolExecutor(max_workers=max(SCAN_SEGMENTS, threadpool_size() * SCAN_SEGMENTS),
+                                                    thread_name_prefix='scan')
+    return _scan_executor
+
+
+def parallel_scan(table, total_segments: int = None, **kwargs) -> List[Dict]:
+    """
+    병렬 스캔으로 전체 항목 수집 (항목 순서는 보장하지 않음)
+    
+    kwargs는 scan 파라미터 그대로 (FilterExpression, ProjectionExpression 등)
+    """
+    results = _scan_segments(
+        table, total_segments,
+        lambda segment: _collect_pages(table.scan, **segment, **kwargs)
+    )
+    return [item for items in results for item in items]
+
+
+def parallel_count(table, total_segments: int = None, **kwargs) -> int:
+    """병렬 스캔으로 항목 수 집계 (Select='COUNT', 항목 본문은 전송하지 않음)"""
+    return sum(_scan_segments(
+        table, total_segments,
+        lambda segment: _count_pages(table.scan, **segment, **kwargs)
+    ))
+
+
+def encode_cursor(last_evaluated_key: Optional[Dict]) -> Optional[str]:
+    """LastEvaluatedKey를 클라이언트에 돌려줄 불투명 커서 문자열로 변환"""
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, default=str, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Dict]:
+    """
+    커서 문자열을 ExclusiveStartKey로 변환
+    
+    Raises:
+        ValueError: 잘못된 커서
+    """
+    if not cursor:
+        return None
+    try:
+        key = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    if not isinstance(key, dict):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return key
+
+
+# BatchGetItem 요청당 최대 키 개수
+BATCH_GET_LIMIT = 100
+
+# 속도 제한을 끈 테이블(DYNAMODB_THROTTLE=0)에서 UnprocessedKeys를 다시 요청하는 최대 횟수
+BATCH_GET_MAX_RETRIES = 8
+
+# 삭제 표시(tombstone) 보존 기간: 이보다 오래된 since 커서는 전체 동기화로 응답
+TOMBSTONE_RETENTION_DAYS = 30
+
+# 변경 시각 기록과 실제 쓰기 사이의 지연/서버 간 시계 차이를 덮기 위해 since보다 앞당겨 조회하는 시간
+SYNC_OVERLAP_SECONDS = 5
+
+
+def _batch_get_items(db, table, keys: List[Dict]) -> List[Dict]:
+    """
+    키 목록으로 항목 일괄 조회 (BATCH_GET_LIMIT개씩 나누고 UnprocessedKeys 재요청)
+    재요청은 테이블 Throttle의 백오프와 재시도 횟수/예산을 따릅니다.
+    
+    Args:
+        db: DynamoDBDatabase / LocalDynamoDBDatabase / SQLiteDatabase
+        table: 조회할 테이블
+        keys: 기본 키 목록
+    
+    Raises:
+        RetryExhausted: 재시도 횟수/예산을 다 쓰고도 처리되지 않은 키가 남음
+    """
+    throttle = getattr(table, 'throttle', None)
+    items = []
+    for start in range(0, len(keys), BATCH_GET_LIMIT):
+        request = {table.name: {'Keys': keys[start:start + BATCH_GET_LIMIT]}}
+        attempt = 0
+        while request:
+            if throttle is None:
+                response = db.dynamodb.batch_get_item(RequestItems=request)
+            else:
+                response = throttle.call('read', db.dynamodb.batch_get_item,
+                                         RequestItems=request, ReturnConsumedCapacity='TOTAL')
+            items.extend(response.get('Responses', {}).get(table.name, []))
+            request = response.get('UnprocessedKeys') or None
+            if not request:
+                break
+            # 처리되지 않은 키는 용량 부족으로 남은 것이므로 백오프 후 다시 요청
+            attempt += 1
+            if throttle is None:
+                if attempt > BATCH_GET_MAX_RETRIES:
+                    raise RetryExhausted(f"{table.name}: 처리되지 않은 키가 남았습니다.")
+                time_module.sleep(min(5.0, 0.05 * (2 ** attempt)))
+            elif not throttle.pause('read', attempt):
+                raise RetryExhausted(f"{table.name}: 처리되지 않은 키가 남았습니다 (재시도 횟수/예산 소진).")
+    return items
+
+
+def parse_sync_cursor(cursor: str) -> datetime:
+    """
+    델타 동기화 커서(UTC ISO 8601 시각) 파싱
+    
+    Raises:
+        ValueError: 잘못된 커서
+    """
+    try:
+        parsed = datetime.fromisoformat(cursor)
+    except (TypeError, ValueError):
+        raise ValueError('since 커서 형식이 올바르지 않습니다.')
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _is_condition_failure(error: Exception) -> bool:
+    """ConditionExpression 실패 여부 (boto3 ClientError / 로컬 예외 공통)"""
+    response = getattr(error, 'response', None) or {}
+    return response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+
+def _convert_decimal(obj):
+    """Decimal 값을 int 또는 float로 변환 (boto3 resource 응답용, 제자리 변환)"""
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            if isinstance(v, Decimal):
+                obj[k] = native_number(v)
+            elif isinstance(v, dict):
+                _convert_decimal(v)
+            elif isinstance(v, list):
+                for item in v:
+                    if isinstance(item, dict):
+                        _convert_decimal(item)
+
+
+def _to_native(table, items: List[Dict]) -> List[Dict]:
+    """
+    조회 결과의 Decimal 변환
+    
+    이미 기본 타입으로 돌려주는 테이블(저수준 client 경로, 로컬 저장소)은 항목 순회를 생략합니다.
+    """
+    if not getattr(table, 'native_types', False):
+        for item in items:
+            _convert_decimal(item)
+    return items
+
+
+def _read_cached(cache: Optional[ModelCache], key: Tuple, loader):
+    """
+    캐시를 거쳐 조회 (캐시가 없으면 바로 loader 호출)
+    
+    캐시된 항목은 호출자가 수정해도 영향이 없도록 복사해서 반환합니다.
+    """
+    if cache is None:
+        return loader()
+    value = cache.get_or_load(key, loader)
+    if isinstance(value, list):
+        return [dict(item) for item in value]
+    if isinstance(value, dict):
+        return dict(value)
+    return value
 
 
 class Department:
-    """AWS DynamoDB 기반 부서 모델"""
+    """
+    AWS DynamoDB 기반 부서 모델
+    
+    부서 이름의 중복은 같은 테이블의 이름 예약 항목(id = 'name#<부서명>')을
+    attribute_not_exists 조건부 쓰기로 만들어 막습니다.
+    """
     
-    def __init__(self, db: DynamoDBDatabase):
+    NAME_RESERVATION_PREFIX = 'name#'
+    
+    def __init__(self, db: DynamoDBDatabase, cache: ModelCache = None):
         self.db = db
         self.table = db.get_departments_table()
+        self.cache = cache
+    
+    def _invalidate(self, department_id: str):
+        """부서 목록과 해당 부서 캐시 무효화"""
+        if self.cache is not None:
+            self.cache.invalidate(('departments',), ('department', department_id))
+    
+    @classmethod
+    def name_reservation(cls, name: str, department_id: str) -> Dict:
+        """부서 이름 예약 항목 (name 속성이 없어 name-index에는 포함되지 않음)"""
+        return {
+            'id': cls.NAME_RESERVATION_PREFIX + name,
+            'department_id': department_id,
+            'created_at': datetime.utcnow().isoformat()
+        }
     
     def create(self, name: str, description: str = "") -> Optional[str]:
-        """새 부서 생성"""
+        """새 부서 생성 (이미 존재하는 이름이면 None)"""
         try:
             department_id = str(uuid.uuid4())
             
@@ -122,79 +473,158 @@ class Department:
                 'updated_at': datetime.utcnow().isoformat()
             }
             
-            # 중복 확인
-            response = self.table.scan(
-                FilterExpression='#name = :name',
-                ExpressionAttributeNames={'#name': 'name'},
-                ExpressionAttributeValues={':name': name}
-            )
+            # 이름 예약: 같은 이름의 예약 항목이 없을 때만 성공하므로 동시 요청도 하나만 통과
+            try:
+                self.table.put_item(
+                    Item=self.name_reservation(name, department_id),
+                    ConditionExpression='attribute_not_exists(id)'
+                )
+            except Exception as e:
+                if _is_condition_failure(e):
+                    return None  # 중복된 부서명
+                raise
             
-            if response.get('Items'):
-                return None  # 중복된 부서명
+            # 예약 항목 도입 전에 만들어진 부서는 name-index로 확인하고 예약을 넘겨줌
+            existing = self._find_by_name(name)
+            if existing:
+                self.table.put_item(Item=self.name_reservation(name, existing['id']))
+                return None
             
-            self.table.put_item(Item=item)
+            try:
+                self.table.put_item(Item=item)
+            except Exception:
+                self._release_name(name, department_id)
+                raise
+            self._invalidate(department_id)
             return department_id
         except Exception as e:
             print(f"부서 생성 오류: {e}")
             return None
     
+    def _find_by_name(self, name: str) -> Optional[Dict]:
+        """name-index로 같은 이름의 부서 조회"""
+        response = self.table.query(
+            IndexName='name-index',
+            KeyConditionExpression='#name = :name',
+            ExpressionAttributeNames={'#name': 'name'},
+            ExpressionAttributeValues={':name': name},
+            Limit=1
+        )
+        items = response.get('Items')
+        return items[0] if items else None
+    
+    def _release_name(self, name: str, department_id: str):
+        """이 부서가 가진 이름 예약 해제 (다른 부서의 예약이면 그대로 둠)"""
+        try:
+            self.table.delete_item(
+                Key={'id': self.NAME_RESERVATION_PREFIX + name},
+                ConditionExpression='department_id = :department_id',
+                ExpressionAttributeValues={':department_id': department_id}
+            )
+        except Exception as e:
+            if not _is_condition_failure(e):
+                raise
+    
     def get_all(self) -> List[Dict]:
         """모든 부서 조회"""
         try:
-            response = self.table.scan()
-            items = response.get('Items', [])
-            
-            # Decimal을 int로 변환
-            for item in items:
-                self._convert_decimal(item)
-            
-            return sorted(items, key=lambda x: x.get('name', ''))
+            return _read_cached(self.cache, ('departments',), self._load_all)
         except Exception as e:
             print(f"부서 조회 오류: {e}")
             return []
     
+    def _load_all(self) -> List[Dict]:
+        # 부서 테이블은 작으므로 세그먼트로 나누지 않고 한 번에 페이지 단위로 스캔
+        items = [
+            item for item in _collect_pages(self.table.scan)
+            if not item['id'].startswith(self.NAME_RESERVATION_PREFIX)
+        ]
+        
+        _to_native(self.table, items)
+        
+        return sorted(items, key=lambda x: x.get('name', ''))
+    
+    def _is_reservation_id(self, department_id: str) -> bool:
+        """이름 예약 항목의 ID인지 (부서로 조회/삭제할 수 없음)"""
+        return department_id.startswith(self.NAME_RESERVATION_PREFIX)
+    
     def get_by_id(self, department_id: str) -> Optional[Dict]:
-        """ID로 부서 조회"""
+        """ID로 부서 조회 (이름 예약 항목 ID는 없는 부서로 처리)"""
+        if self._is_reservation_id(department_id):
+            return None
         try:
-            response = self.table.get_item(Key={'id': department_id})
-            item = response.get('Item')
-            if item:
-                self._convert_decimal(item)
-            return item
+            return _read_cached(self.cache, ('department', department_id),
+                                lambda: self._load_by_id(department_id))
         except Exception as e:
             print(f"부서 조회 오류: {e}")
             return None
     
+    def _load_by_id(self, department_id: str) -> Optional[Dict]:
+        response = self.table.get_item(Key={'id': department_id})
+        item = response.get('Item')
+        if item:
+            _to_native(self.table, [item])
+        return item
+    
+    def get_many(self, department_ids: List[str]) -> List[Dict]:
+        """여러 부서 일괄 조회 (요청한 ID 순서, 없는 ID는 제외)"""
+        department_ids = [dept_id for dept_id in department_ids if not self._is_reservation_id(dept_id)]
+        try:
+            items = _batch_get_items(self.db, self.table, [{'id': dept_id} for dept_id in department_ids])
+            
+            by_id = {}
+            for item in items:
+                _convert_decimal(item)
+                by_id[item['id']] = item
+            
+            return [by_id[dept_id] for dept_id in department_ids if dept_id in by_id]
+        except Exception as e:
+            print(f"부서 일괄 조회 오류: {e}")
+            return []
+    
     def delete(self, department_id: str) -> bool:
-        """부서 삭제"""
+        """부서 삭제 (이름 예약도 해제, 이름 예약 항목 ID는 삭제하지 않음)"""
+        if self._is_reservation_id(department_id):
+            return False
         try:
+            department = self._load_by_id(department_id)
             self.table.delete_item(Key={'id': department_id})
+            if department and department.get('name') is not None:
+                self._release_name(department['name'], department_id)
+            self._invalidate(department_id)
             return True
         except Exception as e:
             print(f"부서 삭제 오류: {e}")
             return False
-    
-    @staticmethod
-    def _convert_decimal(obj):
-        """Decimal 값을 int 또는 float로 변환"""
-        if isinstance(obj, dict):
-            for k, v in obj.items():
-                if isinstance(v, Decimal):
-                    obj[k] = int(v) if v % 1 == 0 else float(v)
-                elif isinstance(v, dict):
-                    Department._convert_decimal(v)
-                elif isinstance(v, list):
-                    for item in v:
-                        if isinstance(item, dict):
-                            Department._convert_decimal(item)
 
 
 class Event:
-    """AWS DynamoDB 기반 캘린더 이벤트 모델"""
+    """
+    AWS DynamoDB 기반 캘린더 이벤트 모델
+    
+    삭제된 이벤트는 event_date 없이 deleted 표시만 남긴 항목(tombstone)으로 바꾸어
+    델타 동기화에서 삭제를 전달합니다. event_date가 없으므로 department-date-index 조회에는 나타나지 않습니다.
+    """
     
-    def __init__(self, db: DynamoDBDatabase):
+    def __init__(self, db: DynamoDBDatabase, cache: ModelCache = None):
         self.db = db
         self.table = db.get_events_table()
+        self.cache = cache
+    
+    def _invalidate(self, department_id: str, *event_ids: str):
+        """부서 이벤트 목록과 해당 이벤트 캐시 무효화"""
+        if self.cache is not None:
+            self.cache.invalidate(('events', department_id), *[('event', event_id) for event_id in event_ids])
+    
+    def _uses_legacy_key(self) -> bool:
+        """기존 (id, department_id) 복합 키 테이블인지 여부"""
+        return 'department_id' in self.db.events_key_attributes
+    
+    def _key(self, event_id: str, department_id: str) -> Dict:
+        """테이블 스키마에 맞는 기본 키"""
+        if self._uses_legacy_key():
+            return {'id': event_id, 'department_id': department_id}
+        return {'id': event_id}
     
     def create(self, department_id: str, event_date: str, title: str,
                description: str = "", time: str = "", url: str = "") -> Optional[str]:
@@ -215,48 +645,246 @@ class Event:
             }
             
             self.table.put_item(Item=item)
+            self._invalidate(department_id, event_id)
             return event_id
         except Exception as e:
             print(f"이벤트 생성 오류: {e}")
             return None
     
-    def get_by_department(self, department_id: str) -> List[Dict]:
-        """부서별 모든 이벤트 조회"""
+    def create_many(self, department_id: str, events: List[Dict]) -> List[str]:
+        """
+        여러 이벤트 일괄 생성 (batch_writer 사용)
+        
+        Args:
+            department_id: 부서 ID
+            events: event_date, title, description, time, url을 담은 딕셔너리 목록
+                    (last_modified가 있으면 그 값을 유지, 없으면 현재 시각)
+        
+        Returns:
+            생성된 이벤트 ID 목록 (입력 순서), 실패 시 빈 목록
+        """
         try:
-            response = self.table.query(
-                IndexName='department-date-index',
-                KeyConditionExpression='department_id = :dept_id',
-                ExpressionAttributeValues={':dept_id': department_id}
-            )
+            now = datetime.utcnow().isoformat()
+            event_ids = []
             
-            items = response.get('Items', [])
+            with self.table.batch_writer() as batch:
+                for event in events:
+                    event_id = str(uuid.uuid4())
+                    batch.put_item(Item={
+                        'id': event_id,
+                        'department_id': department_id,
+                        'event_date': event.get('event_date', ''),
+                        'title': event.get('title', ''),
+                        'description': event.get('description', ''),
+                        'time': event.get('time', ''),
+                        'url': event.get('url', ''),
+                        'created_at': now,
+                        'last_modified': event.get('last_modified') or now
+                    })
+                    event_ids.append(event_id)
             
-            # Decimal 변환
-            for item in items:
-                Event._convert_decimal(item)
+            self._invalidate(department_id, *event_ids)
+            return event_ids
+        except Exception as e:
+            print(f"이벤트 일괄 생성 오류: {e}")
+            # 일부는 이미 기록됐을 수 있음
+            self._invalidate(department_id)
+            return []
+    
+    # 일괄 변경에서 수정할 수 있는 속성
+    BATCH_FIELDS = ('event_date', 'title', 'description', 'time', 'url')
+    
+    def apply_batch(self, department_id: str, operations: List[Dict]) -> Optional[Dict]:
+        """
+        한 부서의 생성/수정/삭제를 한 번의 일괄 쓰기(batch_writer)로 처리
+        
+        수정/삭제할 이벤트는 BatchGetItem 한 번으로 읽고, 수정은 읽은 항목에 변경을 합친 전체 항목을,
+        삭제는 삭제 표시 항목(tombstone)을 씁니다.
+        
+        Args:
+            department_id: 부서 ID
+            operations: {'op': 'create'|'update'|'delete', 'id': 수정/삭제할 ID, 그 밖의 속성} 목록
+                        (같은 ID가 두 번 나오지 않아야 함)
+        
+        Returns:
+            {'created': [이벤트], 'updated': [이벤트], 'deleted': [ID], 'missing': [ID]} (입력 순서),
+            쓰기 실패 시 None
+            missing은 이 부서에 없어 건너뛴 수정/삭제 대상 ID입니다.
+        """
+        try:
+            target_ids = [operation['id'] for operation in operations if operation['op'] != 'create']
+            existing = {event['id']: event for event in self.get_many(target_ids, department_id)
+                        if event['department_id'] == department_id}
             
-            return sorted(items, key=lambda x: (x.get('event_date', ''), x.get('time', '')))
+            now = datetime.utcnow().isoformat()
+            result = {'created': [], 'updated': [], 'deleted': [], 'missing': []}
+            items = []
+            
+            for operation in operations:
+                op = operation['op']
+                fields = {name: operation[name] for name in self.BATCH_FIELDS
+                          if operation.get(name) is not None}
+                
+                if op == 'create':
+                    item = {name: '' for name in self.BATCH_FIELDS}
+                    item.update(fields)
+                    item.update({
+                        'id': str(uuid.uuid4()),
+                        'department_id': department_id,
+                        'created_at': now,
+                        'last_modified': now
+                    })
+                    result['created'].append(item)
+                elif operation['id'] not in existing:
+                    result['missing'].append(operation['id'])
+                    continue
+                elif op == 'update':
+                    item = dict(existing[operation['id']], **fields, last_modified=now)
+                    result['updated'].append(item)
+                else:
+                    item = {
+                        'id': operation['id'],
+                        'department_id': department_id,
+                        'deleted': True,
+                        'last_modified': now,
+                        'expires_at': int(time_module.time()) + TOMBSTONE_RETENTION_DAYS * 86400
+                    }
+                    result['deleted'].append(operation['id'])
+                items.append(item)
+            
+            with self.table.batch_writer() as batch:
+                for item in items:
+                    batch.put_item(Item=item)
+            
+            self._invalidate(department_id, *[item['id'] for item in items])
+            return result
+        except Exception as e:
+            print(f"이벤트 일괄 변경 오류: {e}")
+            # 일부는 이미 기록됐을 수 있음
+            self._invalidate(department_id, *[operation['id'] for operation in operations if operation.get('id')])
+            return None
+    
+    def get_by_department(self, department_id: str) -> List[Dict]:
+        """부서별 모든 이벤트 조회"""
+        try:
+            return _read_cached(self.cache, ('events', department_id),
+                                lambda: self._load_by_department(department_id))
         except Exception as e:
             print(f"이벤트 조회 오류: {e}")
             return []
     
-    def get_by_id(self, event_id: str) -> Optional[Dict]:
-        """ID로 이벤트 조회"""
+    def _load_by_department(self, department_id: str) -> List[Dict]:
+        items = _collect_pages(
+            self.table.query,
+            IndexName='department-date-index',
+            KeyConditionExpression='department_id = :dept_id',
+            ExpressionAttributeValues={':dept_id': department_id}
+        )
+        
+        _to_native(self.table, items)
+        
+        return sorted(items, key=lambda x: (x.get('event_date', ''), x.get('time', '')))
+    
+    def get_by_department_page(self, department_id: str, limit: int, cursor: str = None,
+                               start_date: str = None,
+                               end_date: str = None) -> Tuple[List[Dict], Optional[str]]:
+        """
+        부서별 이벤트를 날짜순 페이지 단위로 조회
+        
+        Args:
+            department_id: 부서 ID
+            limit: 페이지 크기
+            cursor: 이전 페이지에서 받은 커서 (첫 페이지는 None)
+            start_date, end_date: 주면 그 날짜 범위(양 끝 포함)만 조회
+        
+        Returns:
+            (이벤트 목록, 다음 커서 또는 마지막 페이지면 None)
+        
+        Raises:
+            ValueError: 잘못된 커서
+        """
+        kwargs = {
+            'IndexName': 'department-date-index',
+            'KeyConditionExpression': 'department_id = :dept_id',
+            'ExpressionAttributeValues': {':dept_id': department_id},
+            'Limit': limit
+        }
+        if start_date is not None:
+            kwargs['KeyConditionExpression'] += ' AND event_date BETWEEN :start AND :end'
+            kwargs['ExpressionAttributeValues'].update({':start': start_date, ':end': end_date})
+        start_key = decode_cursor(cursor)
+        if start_key:
+            kwargs['ExclusiveStartKey'] = start_key
+        
         try:
-            # DynamoDB에서 GSI를 사용하여 id로만 검색
-            response = self.table.scan(
-                FilterExpression='id = :event_id',
-                ExpressionAttributeValues={':event_id': event_id}
-            )
+            response = self.table.query(**kwargs)
+            items = response.get('Items', [])
+            
+            _to_native(self.table, items)
             
+            return items, encode_cursor(response.get('LastEvaluatedKey'))
+        except Exception as e:
+            print(f"이벤트 페이지 조회 오류: {e}")
+            return [], None
+    
+    def get_by_id(self, event_id: str) -> Optional[Dict]:
+        """ID로 이벤트 조회 (GetItem 한 번)"""
+        try:
+            return _read_cached(self.cache, ('event', event_id), lambda: self._load_by_id(event_id))
+        except Exception as e:
+            print(f"이벤트 조회 오류: {e}")
+            return None
+    
+    def _load_by_id(self, event_id: str) -> Optional[Dict]:
+        if not self._uses_legacy_key():
+            item = self.table.get_item(Key={'id': event_id}).get('Item')
+            if not item or item.get('deleted'):
+                return None
+            _to_native(self.table, [item])
+            return item
+        
+        # 기존 복합 키 테이블: id만으로는 GetItem을 할 수 없어 스캔
+        # (필터는 페이지별로 적용되므로 찾을 때까지 다음 페이지를 이어 읽음)
+        kwargs = {
+            'FilterExpression': 'id = :event_id AND attribute_not_exists(deleted)',
+            'ExpressionAttributeValues': {':event_id': event_id}
+        }
+        while True:
+            response = self.table.scan(**kwargs)
             items = response.get('Items', [])
             if items:
-                Event._convert_decimal(items[0])
+                _to_native(self.table, items)
                 return items[0]
-            return None
+            last_key = response.get('LastEvaluatedKey')
+            if not last_key:
+                return None
+            kwargs['ExclusiveStartKey'] = last_key
+    
+    def get_many(self, event_ids: List[str], department_id: str = None) -> List[Dict]:
+        """
+        여러 이벤트 일괄 조회 (요청한 ID 순서, 없는 ID는 제외)
+        
+        기존 복합 키 테이블에서는 department_id가 필요하며, 없으면 개별 조회합니다.
+        """
+        try:
+            if self._uses_legacy_key() and department_id is None:
+                events = [self.get_by_id(event_id) for event_id in event_ids]
+                return [event for event in events if event]
+            
+            keys = [self._key(event_id, department_id) for event_id in event_ids]
+            items = _batch_get_items(self.db, self.table, keys)
+            
+            by_id = {}
+            for item in items:
+                if item.get('deleted'):
+                    continue
+                _convert_decimal(item)
+                by_id[item['id']] = item
+            
+            return [by_id[event_id] for event_id in event_ids if event_id in by_id]
         except Exception as e:
-            print(f"이벤트 조회 오류: {e}")
-            return None
+            print(f"이벤트 일괄 조회 오류: {e}")
+            return []
     
     def update(self, event_id: str, title: str = None, description: str = None,
                time: str = None, url: str = None, event_date: str = None) -> bool:
@@ -295,35 +923,104 @@ class Event:
             
             # 업데이트 실행
             self.table.update_item(
-                Key={'id': event_id, 'department_id': event['department_id']},
+                Key=self._key(event_id, event['department_id']),
                 UpdateExpression='SET ' + ', '.join(update_expression_parts),
                 ExpressionAttributeValues=expression_attribute_values
             )
+            self._invalidate(event['department_id'], event_id)
             return True
         except Exception as e:
             print(f"이벤트 수정 오류: {e}")
             return False
     
     def delete(self, event_id: str) -> bool:
-        """이벤트 삭제"""
+        """이벤트 삭제 (델타 동기화용 삭제 표시 항목으로 교체)"""
         try:
             # 먼저 이벤트 조회
             event = self.get_by_id(event_id)
             if not event:
                 return False
             
-            self.table.delete_item(
-                Key={'id': event_id, 'department_id': event['department_id']}
-            )
+            self.table.put_item(Item={
+                'id': event_id,
+                'department_id': event['department_id'],
+                'deleted': True,
+                'last_modified': datetime.utcnow().isoformat(),
+                # DynamoDB TTL 속성 (epoch 초)
+                'expires_at': int(time_module.time()) + TOMBSTONE_RETENTION_DAYS * 86400
+            })
+            self._invalidate(event['department_id'], event_id)
             return True
         except Exception as e:
             print(f"이벤트 삭제 오류: {e}")
             return False
     
+    def sync_cursor(self) -> str:
+        """
+        전체 목록을 읽기 직전에 발급하는 델타 동기화 커서
+        
+        캐시된 목록은 TTL만큼 오래됐을 수 있으므로 그만큼 앞당깁니다.
+        """
+        now = datetime.utcnow()
+        if self.cache is not None:
+            now -= timedelta(seconds=self.cache.ttl)
+        return now.isoformat()
+    
+    def get_changes(self, department_id: str, since: str, start_date: str = None,
+                    end_date: str = None) -> Optional[Tuple[List[Dict], List[str], str]]:
+        """
+        since 커서 이후 추가/수정/삭제된 이벤트 조회 (department-modified-index)
+        
+        start_date, end_date를 주면 그 날짜 범위의 이벤트만 돌려줍니다.
+        삭제 표시에는 날짜가 남지 않으므로 삭제된 ID는 범위와 관계없이 모두 포함됩니다.
+        
+        Returns:
+            (추가/수정된 이벤트, 삭제된 이벤트 ID, 다음 커서)
+            커서가 삭제 표시 보존 기간보다 오래됐거나 조회에 실패하면 None (전체 동기화 필요)
+        
+        Raises:
+            ValueError: 잘못된 커서
+        """
+        since_time = parse_sync_cursor(since)
+        now = datetime.utcnow()
+        if since_time < now - timedelta(days=TOMBSTONE_RETENTION_DAYS):
+            return None
+        
+        try:
+            items = _collect_pages(
+                self.table.query,
+                IndexName='department-modified-index',
+                KeyConditionExpression='department_id = :dept_id AND last_modified >= :since',
+                ExpressionAttributeValues={
+                    ':dept_id': department_id,
+                    ':since': (since_time - timedelta(seconds=SYNC_OVERLAP_SECONDS)).isoformat()
+                }
+            )
+        except Exception as e:
+            print(f"이벤트 변경분 조회 오류: {e}")
+            return None
+        
+        events = []
+        deleted_ids = []
+        expired_before = time_module.time()
+        for item in items:
+            if item.get('deleted'):
+                # DynamoDB TTL은 만료 후 바로 지우지 않으므로 만료된 삭제 표시는 건너뜀
+                expires_at = item.get('expires_at')
+                if expires_at is None or float(expires_at) >= expired_before:
+                    deleted_ids.append(item['id'])
+            elif start_date is None or start_date <= item.get('event_date', '') <= end_date:
+                events.append(item)
+        
+        _to_native(self.table, events)
+        events.sort(key=lambda x: (x.get('event_date', ''), x.get('time', '')))
+        return events, deleted_ids, now.isoformat()
+    
     def get_by_date_range(self, department_id: str, start_date: str, end_date: str) -> List[Dict]:
         """날짜 범위로 이벤트 조회"""
         try:
-            response = self.table.query(
+            items = _collect_pages(
+                self.table.query,
                 IndexName='department-date-index',
                 KeyConditionExpression='department_id = :dept_id AND event_date BETWEEN :start AND :end',
                 ExpressionAttributeValues={
@@ -333,30 +1030,12 @@ class Event:
                 }
             )
             
-            items = response.get('Items', [])
-            
-            # Decimal 변환
-            for item in items:
-                Event._convert_decimal(item)
+            _to_native(self.table, items)
             
             return sorted(items, key=lambda x: (x.get('event_date', ''), x.get('time', '')))
         except Exception as e:
             print(f"이벤트 날짜 범위 조회 오류: {e}")
             return []
-    
-    @staticmethod
-    def _convert_decimal(obj):
-        """Decimal 값을 int 또는 float로 변환"""
-        if isinstance(obj, dict):
-            for k, v in obj.items():
-                if isinstance(v, Decimal):
-                    obj[k] = int(v) if v % 1 == 0 else float(v)
-                elif isinstance(v, dict):
-                    Event._convert_decimal(v)
-                elif isinstance(v, list):
-                    for item in v:
-                        if isinstance(item, dict):
-                            Event._convert_decimal(item)
 
 
 # 하위 호환성을 위한 별칭
@@ -369,11 +1048,11 @@ def get_database(mode: str = None):
     데이터베이스 인스턴스 생성
     
     Args:
-        mode: 'local' (로컬 JSON 파일) 또는 'aws' (AWS DynamoDB)
+        mode: 'local' (로컬 JSON 파일), 'sqlite' (로컬 SQLite) 또는 'aws' (AWS DynamoDB)
               None이면 환경 변수 확인
     
     Returns:
-        DynamoDBDatabase 또는 LocalDynamoDBDatabase 인스턴스
+        DynamoDBDatabase, LocalDynamoDBDatabase 또는 SQLiteDatabase 인스턴스
     """
     if mode is None:
         mode = os.environ.get('DB_MODE', 'local').lower()
@@ -381,9 +1060,16 @@ def get_database(mode: str = None):
     if mode == 'local':
         from local_nosql import LocalDynamoDBDatabase
         data_dir = os.environ.get('LOCAL_DATA_DIR', 'data')
-        return LocalDynamoDBDatabase(data_dir)
+        storage = os.environ.get('LOCAL_STORAGE', 'json').lower()
+        compact_threshold = int(os.environ.get('LOCAL_JOURNAL_COMPACT_EVERY', '1000'))
+        return LocalDynamoDBDatabase(data_dir, storage, compact_threshold)
+    elif mode == 'sqlite':
+        from sqlite_nosql import SQLiteDatabase
+        data_dir = os.environ.get('LOCAL_DATA_DIR', 'data')
+        db_path = os.environ.get('SQLITE_PATH', os.path.join(data_dir, 'calendar.db'))
+        return SQLiteDatabase(db_path)
     elif mode == 'aws':
         return DynamoDBDatabase()
     else:
-        raise ValueError(f"Unknown database mode: {mode}. Use 'local' or 'aws'")
+        raise ValueError(f"Unknown database mode: {mode}. Use 'local', 'sqlite' or 'aws'")
 
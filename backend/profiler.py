@@ -0,0 +1,157 @@
+"""
+요청 샘플링 프로파일러
+관리자가 켜면 다음 N개 요청(REST/Socket.IO 핸들러)을 처리하는 동안 PROFILE_INTERVAL_MS마다 모든 스레드의 스택을 샘플링하고,
+N개가 끝나면 collapsed stack 형식(한 줄에 '프레임;프레임;... 횟수')으로 PROFILE_DIR에 저장합니다.
+flamegraph.pl이나 speedscope로 flame graph를 만들 수 있습니다.
+
+- 이 프로젝트의 코드를 지나는 스택만 남깁니다 (대기 중인 tpool 스레드, eventlet 허브 대기 등은 제외).
+- 프로파일링 중에 함께 처리된 다른 요청의 스택도 섞일 수 있습니다.
+- 샘플링 스레드는 eventlet monkey patch와 관계없이 실제 스레드로 실행합니다.
+"""
+
+import os
+import sys
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Optional
+
+try:
+    from eventlet.patcher import original
+    _thread = original('_thread')
+    _time = original('time')
+except ImportError:  # eventlet 없이 실행
+    import _thread
+    import time as _time
+
+# 이 경로 아래 코드를 지나는 스택만 기록 (backend/venv 등에 설치된 패키지는 제외)
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _is_app_file(filename: str) -> bool:
+    return filename.startswith(APP_DIR) and 'site-packages' not in filename
+
+
+def _frame_name(code) -> str:
+    return f'{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})'
+
+
+def _thread_names() -> Dict[int, str]:
+    # tpool 스레드는 eventlet이 따로 불러온 원래 threading 모듈에 등록됨
+    modules = (threading, sys.modules.get('__original_module_threading'))
+    return {thread.ident: thread.name for module in modules if module for thread in module.enumerate()}
+
+
+class SamplingProfiler:
+    """
+    다음 N개 요청 동안의 스택 샘플링
+
+    요청 시작 때 claim()이 True를 돌려준 요청만 대상이며, 대상 요청이 처리 중일 때만 샘플링합니다.
+    """
+
+    def __init__(self, output_dir: str = 'profiles', interval: float = 0.005):
+        self.output_dir = output_dir
+        self.interval = interval
+        self._lock = _thread.allocate_lock()
+        self._remaining = 0
+        self._active = 0
+        self._stacks = Counter()
+        self._samples = 0
+        self._sampler = None
+        self.last_output = None
+
+    def start(self, requests: int) -> bool:
+        """다음 requests개 요청 프로파일링 시작 (이미 진행 중이면 False)"""
+        with self._lock:
+            if self._sampler is not None:
+                return False
+            self._remaining = requests
+            self._stacks = Counter()
+            self._samples = 0
+            self._sampler = _thread.start_new_thread(self._run, ())
+            return True
+
+    def claim(self) -> bool:
+        """요청 시작: 프로파일링 대상이면 True (남은 수가 있을 때만 잠금)"""
+        if not self._remaining:
+            return False
+        with self._lock:
+            if not self._remaining:
+                return False
+            self._remaining -= 1
+            self._active += 1
+            return True
+
+    def release(self):
+        """대상 요청 종료"""
+        with self._lock:
+            self._active -= 1
+
+    def _run(self):
+        own = _thread.get_ident()
+        while True:
+            with self._lock:
+                active = self._active
+                done = not active and not self._remaining
+            if done:
+                break
+            if active:
+                self._sample(own)
+            _time.sleep(self.interval)
+        self._finish()
+
+    def _sample(self, own_ident: int):
+        names = _thread_names()
+        for ident, frame in sys._current_frames().items():
+            if ident == own_ident:
+                continue
+            stack = []
+            in_app = False
+            while frame is not None:
+                code = frame.f_code
+                in_app = in_app or _is_app_file(code.co_filename)
+                stack.append(_frame_name(code))
+                frame = frame.f_back
+            if in_app:
+                stack.append(names.get(ident, f'thread-{ident}'))
+                self._stacks[';'.join(reversed(stack))] += 1
+        self._samples += 1
+
+    def _finish(self):
+        path = None
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f"profile-{datetime.now().strftime('%Y%m%d-%H%M%S')}.collapsed")
+            with open(path, 'w', encoding='utf-8') as f:
+                for stack, count in sorted(self._stacks.items()):
+                    f.write(f'{stack} {count}\n')
+        except OSError as e:
+            print(f"프로파일 저장 오류: {e}")
+            path = None
+        with self._lock:
+            self.last_output = path
+            self._sampler = None
+
+    def status(self) -> Dict:
+        with self._lock:
+            return {
+                'running': self._sampler is not None,
+                'remaining': self._remaining,
+                'active': self._active,
+                'samples': self._samples,
+                'last_output': self.last_output
+            }
+
+
+def get_sampling_profiler() -> Optional[SamplingProfiler]:
+    """
+    환경 변수로 프로파일러 생성
+
+    PROFILE_DIR: collapsed stack 파일을 저장할 디렉터리 (기본값: profiles)
+    PROFILE_INTERVAL_MS: 샘플링 간격 (밀리초, 기본값: 5)
+    ADMIN_TOKEN이 없으면 켤 수 없으므로 만들지 않습니다.
+    """
+    if not os.environ.get('ADMIN_TOKEN'):
+        return None
+    return SamplingProfiler(os.environ.get('PROFILE_DIR', 'profiles'),
+                            float(os.environ.get('PROFILE_INTERVAL_MS', '5')) / 1000)
@@ -0,0 +1,129 @@
+"""
+미리 직렬화한 응답 캐시
+이벤트/부서 목록 응답을 (버전 키, 요청 변형) 단위로 JSON 바이트와 gzip 바이트로 보관해,
+읽기 요청마다 다시 직렬화하지 않고 쓰기(버전 변경) 후 처음 읽을 때만 직렬화합니다.
+
+orjson이 설치되어 있으면 사용하고, 없으면 표준 json을 사용합니다.
+"""
+
+import gzip
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 표준 json 사용
+    orjson = None
+
+
+# 이보다 작은 응답은 압축하지 않음 (gzip 헤더 비용이 더 큼)
+GZIP_MIN_SIZE = 1024
+
+
+def encode_json(obj) -> bytes:
+    """UTF-8 JSON 바이트 (한글을 \\u 이스케이프하지 않음)"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj)
+        except TypeError:
+            pass  # orjson이 지원하지 않는 타입은 표준 json으로
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class EncodedPayload:
+    """직렬화가 끝난 응답 본문 (gzip/문자열 형태는 처음 필요할 때 만들어 보관)"""
+
+    __slots__ = ('body', '_gzip_body', '_text')
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self._gzip_body = None
+        self._text = None
+
+    @property
+    def gzip_body(self) -> bytes:
+        if self._gzip_body is None:
+            self._gzip_body = gzip.compress(self.body, compresslevel=6)
+        return self._gzip_body
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.body.decode('utf-8')
+        return self._text
+
+
+class ResponseCache:
+    """
+    키별로 가장 최근 태그(ETag)의 직렬화 결과 하나만 보관하는 LRU 캐시
+
+    태그가 바뀌면(쓰기로 버전이 오르면) 다음 조회에서 다시 직렬화합니다.
+    태그는 이 프로세스의 버전이라 다른 워커의 쓰기로는 바뀌지 않으므로, max_age(초)가 있으면
+    태그가 같아도 그보다 오래된 항목은 다시 직렬화합니다 (워커가 여럿일 때 ETag 교체 주기와 같게 지정).
+    """
+
+    def __init__(self, max_entries: int = 256, max_age: float = 0):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self._entries = OrderedDict()  # key -> (tag, 만료 시각 또는 None, EncodedPayload)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key: Hashable, tag: str, build: Callable[[], object]) -> EncodedPayload:
+        """
+        tag가 같은 캐시 항목이 있으면 반환, 없으면 build() 결과를 직렬화해 저장
+
+        build가 예외를 내면 저장하지 않고 그대로 전파합니다.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == tag and (entry[1] is None or entry[1] > time.monotonic()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[2]
+            self.misses += 1
+
+        expires = time.monotonic() + self.max_age if self.max_age > 0 else None
+        payload = EncodedPayload(encode_json(build()))
+
+        with self._lock:
+            self._entries[key] = (tag, expires, payload)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return payload
+
+    def stats(self) -> Dict:
+        """적중/실패 통계"""
+        with self._lock:
+            return {
+                'size': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'encoder': 'orjson' if orjson is not None else 'json'
+            }
+
+
+class SocketJSON:
+    """
+    Socket.IO 패킷용 json 모듈 (SocketIO(json=SocketJSON))
+
+    emit 데이터에 EncodedPayload가 있으면 다시 직렬화하지 않고 보관된 JSON 문자열을 그대로 이어 붙입니다.
+    """
+
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        if isinstance(obj, list) and any(isinstance(item, EncodedPayload) for item in obj):
+            return '[' + ','.join(
+                item.text if isinstance(item, EncodedPayload) else json.dumps(item, **kwargs)
+                for item in obj
+            ) + ']'
+        return json.dumps(obj, **kwargs)
+
+    @staticmethod
+    def loads(text, **kwargs):
+        return json.loads(text, **kwargs)
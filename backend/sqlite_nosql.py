@@ -0,0 +1,421 @@
+"""
+SQLite 기반 로컬 NoSQL 저장소
+단일 호스트 배포용으로 DynamoDB Table 인터페이스를 SQLite 위에 구현합니다.
+항목은 JSON으로 저장하고, 키/인덱스 속성은 별도 컬럼으로 두어 B-tree 인덱스를 사용합니다.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from local_expression import check_condition, compile_condition, compile_update
+from local_nosql import LocalBatchWriter, segment_of, shape_scan_response, validate_segment
+from metrics import count_read_bytes, utf8_length
+
+
+# 테이블별 인덱스 컬럼 정의 (id는 항상 PRIMARY KEY)
+TABLE_SCHEMAS = {
+    'departments': {
+        'columns': ('name',),
+        'indexes': {'name-index': ('name',)},
+    },
+    'events': {
+        'columns': ('department_id', 'event_date', 'last_modified'),
+        'indexes': {
+            'department-date-index': ('department_id', 'event_date'),
+            'department-modified-index': ('department_id', 'last_modified'),
+        },
+    },
+}
+
+def _load_row(data: str) -> dict:
+    """data 컬럼(JSON) 파싱, 읽은 크기는 지표로 집계"""
+    count_read_bytes(utf8_length(data))
+    return json.loads(data)
+
+
+# DynamoDB TTL 속성 (epoch 초)
+_EXPIRES_AT = "json_extract(data, '$.expires_at')"
+
+# begins_with를 범위 조건으로 바꿀 때 쓰는 상한 문자
+_PREFIX_UPPER = '\U0010ffff'
+
+
+class SQLiteDatabase:
+    """SQLite 파일 기반 데이터베이스 (WAL 모드)"""
+
+    # 모든 테이블의 기본 키는 id
+    events_key_attributes = ('id',)
+
+    def __init__(self, db_path: str = "data/calendar.db"):
+        """
+        Args:
+            db_path: SQLite 데이터베이스 파일 경로
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # 스레드별 연결 (sqlite3 연결은 스레드 간 공유하지 않음)
+        self._local = threading.local()
+        self._tables = {}
+        
+        # boto3 resource 호환 (models에서 db.dynamodb.batch_get_item 사용)
+        self.dynamodb = self
+
+        self.create_tables()
+        print(f"✓ SQLite 저장소 초기화 완료: {self.db_path}")
+
+    def connection(self) -> sqlite3.Connection:
+        """현재 스레드의 연결 반환"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute('PRAGMA busy_timeout=30000')
+            conn.create_function('segment_of', 2, segment_of, deterministic=True)
+            self._local.conn = conn
+        return conn
+
+    def create_tables(self):
+        """테이블과 인덱스 생성 (이미 있으면 무시)"""
+        conn = self.connection()
+        for table_name, schema in TABLE_SCHEMAS.items():
+            columns = ''.join(f', {column} TEXT' for column in schema['columns'])
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {table_name} '
+                f'(id TEXT PRIMARY KEY{columns}, data TEXT NOT NULL)'
+            )
+            # 이전 버전 파일에 없는 인덱스 컬럼은 추가하고 저장된 JSON에서 채움
+            existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table_name})')}
+            for column in schema['columns']:
+                if column not in existing:
+                    conn.execute(f'ALTER TABLE {table_name} ADD COLUMN {column} TEXT')
+                    conn.execute(f"UPDATE {table_name} SET {column} = json_extract(data, '$.{column}')")
+            for index_name, index_columns in schema['indexes'].items():
+                # id까지 포함해 query의 ORDER BY를 인덱스 순서만으로 처리
+                sql_index_name = f"{table_name}_{index_name.replace('-', '_')}"
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS {sql_index_name} "
+                    f"ON {table_name} ({', '.join(index_columns + ('id',))})"
+                )
+            # 만료 항목 정리(DELETE ... WHERE expires_at < ?)용 부분 인덱스
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {table_name}_expires_at ON {table_name} ({_EXPIRES_AT}) "
+                f"WHERE {_EXPIRES_AT} IS NOT NULL"
+            )
+            self._get_table(table_name).purge_expired()
+
+    def get_departments_table(self):
+        """부서 테이블 반환"""
+        return self._get_table('departments')
+
+    def get_events_table(self):
+        """이벤트 테이블 반환"""
+        return self._get_table('events')
+
+    def Table(self, table_name: str):
+        """테이블 객체 반환 (boto3 resource 호환)"""
+        if table_name not in TABLE_SCHEMAS:
+            raise ValueError(f"Unknown table: {table_name}")
+        return self._get_table(table_name)
+
+    def batch_get_item(self, RequestItems: dict) -> dict:
+        """여러 테이블 일괄 조회 (boto3 resource.batch_get_item 호환)"""
+        responses = {}
+        for table_name, request in RequestItems.items():
+            result = self.Table(table_name).batch_get_item(Keys=request.get('Keys', []))
+            responses.update(result['Responses'])
+        return {'Responses': responses, 'UnprocessedKeys': {}}
+
+    def _get_table(self, table_name: str):
+        table = self._tables.get(table_name)
+        if table is None:
+            table = SQLiteTable(self, table_name, TABLE_SCHEMAS[table_name])
+            self._tables[table_name] = table
+        return table
+
+
+class SQLiteTable:
+    """DynamoDB Table 호환 SQLite 테이블"""
+
+    # batch_writer 자동 flush 간격 (flush마다 트랜잭션 하나)
+    BATCH_FLUSH_AMOUNT = 25
+
+    # JSON에서 읽은 항목이라 Decimal이 없음 (모델에서 변환 생략)
+    native_types = True
+
+    # 연결 하나로 처리하는 편이 세그먼트별 병렬 조회보다 빠름
+    SCAN_SEGMENTS = 1
+    
+    # 쓰기 때 만료 항목을 정리하는 최소 간격 (초)
+    PURGE_INTERVAL = 3600
+
+    def __init__(self, db: SQLiteDatabase, table_name: str, schema: dict):
+        self.db = db
+        self.table_name = table_name
+        self.name = table_name
+        self.columns = schema['columns']
+        self.indexes = schema['indexes']
+
+        column_list = ', '.join(('id',) + self.columns + ('data',))
+        placeholders = ', '.join('?' for _ in range(len(self.columns) + 2))
+        self._upsert_sql = f'INSERT OR REPLACE INTO {table_name} ({column_list}) VALUES ({placeholders})'
+        self._last_purge = 0.0
+
+    def _row_values(self, item: dict) -> tuple:
+        """INSERT용 컬럼 값"""
+        return ((item['id'],) + tuple(item.get(column) for column in self.columns)
+                + (json.dumps(item, ensure_ascii=False),))
+
+    def purge_expired(self):
+        """expires_at이 지난 항목(삭제 마커 등) 삭제 (DynamoDB TTL 대응)"""
+        now = time.time()
+        self._last_purge = now
+        self.db.connection().execute(
+            f'DELETE FROM {self.table_name} WHERE {_EXPIRES_AT} < ?', (now,)
+        )
+
+    def _maybe_purge_expired(self):
+        """마지막 정리 후 PURGE_INTERVAL이 지났으면 만료 항목 정리"""
+        if time.time() - self._last_purge >= self.PURGE_INTERVAL:
+            self.purge_expired()
+
+    def put_item(self, Item: dict, ConditionExpression: str = None,
+                 ExpressionAttributeNames: dict = None,
+                 ExpressionAttributeValues: dict = None):
+        """항목 추가 또는 수정 (ConditionExpression이 거짓이면 ConditionalCheckFailedException)"""
+        if not Item.get('id'):
+            raise ValueError("Item must have 'id' field")
+
+        if not ConditionExpression:
+            self.db.connection().execute(self._upsert_sql, self._row_values(Item))
+        else:
+            with self._transaction() as conn:
+                check_condition(ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues,
+                                self._fetch(conn, Item['id']))
+                conn.execute(self._upsert_sql, self._row_values(Item))
+        self._maybe_purge_expired()
+
+    def get_item(self, Key: dict) -> dict:
+        """항목 조회"""
+        row = self.db.connection().execute(
+            f'SELECT data FROM {self.table_name} WHERE id = ?', (Key.get('id'),)
+        ).fetchone()
+        return {'Item': _load_row(row[0]) if row else None}
+
+    def delete_item(self, Key: dict, ConditionExpression: str = None,
+                    ExpressionAttributeNames: dict = None,
+                    ExpressionAttributeValues: dict = None):
+        """항목 삭제 (ConditionExpression이 거짓이면 ConditionalCheckFailedException)"""
+        if not ConditionExpression:
+            self.db.connection().execute(
+                f'DELETE FROM {self.table_name} WHERE id = ?', (Key.get('id'),)
+            )
+            return
+        with self._transaction() as conn:
+            check_condition(ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues,
+                            self._fetch(conn, Key.get('id')))
+            conn.execute(f'DELETE FROM {self.table_name} WHERE id = ?', (Key.get('id'),))
+
+    @contextmanager
+    def _transaction(self):
+        """BEGIN IMMEDIATE 트랜잭션 (예외 시 ROLLBACK)"""
+        conn = self.db.connection()
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+
+    def _fetch(self, conn, item_id: str) -> Optional[dict]:
+        """트랜잭션 안에서 항목 조회"""
+        row = conn.execute(
+            f'SELECT data FROM {self.table_name} WHERE id = ?', (item_id,)
+        ).fetchone()
+        return _load_row(row[0]) if row else None
+
+    def batch_writer(self, overwrite_by_pkeys: List[str] = None):
+        """일괄 쓰기 컨텍스트 매니저 (boto3 호환)"""
+        return LocalBatchWriter(self, self.BATCH_FLUSH_AMOUNT, overwrite_by_pkeys)
+
+    def _batch_commit(self, operations: List[tuple]):
+        """('put', item) / ('delete', item_id) 목록을 하나의 트랜잭션으로 반영"""
+        with self._transaction() as conn:
+            for op, value in operations:
+                if op == 'put':
+                    conn.execute(self._upsert_sql, self._row_values(value))
+                else:
+                    conn.execute(f'DELETE FROM {self.table_name} WHERE id = ?', (value,))
+        self._maybe_purge_expired()
+
+    def batch_get_item(self, Keys: List[dict]) -> dict:
+        """여러 항목 일괄 조회 (boto3 batch_get_item 응답 형식)"""
+        item_ids = [key.get('id') for key in Keys]
+        items = []
+        conn = self.db.connection()
+        # SQLite 바인드 변수 개수 제한을 넘지 않도록 나누어 조회
+        for start in range(0, len(item_ids), 500):
+            chunk = item_ids[start:start + 500]
+            placeholders = ', '.join('?' for _ in chunk)
+            rows = conn.execute(
+                f'SELECT data FROM {self.table_name} WHERE id IN ({placeholders})', chunk
+            ).fetchall()
+            items.extend(_load_row(row[0]) for row in rows)
+        return {'Responses': {self.table_name: items}, 'UnprocessedKeys': {}}
+
+    def scan(self, FilterExpression: str = None,
+             ExpressionAttributeNames: dict = None,
+             ExpressionAttributeValues: dict = None,
+             Limit: int = None, ExclusiveStartKey: dict = None,
+             Segment: int = None, TotalSegments: int = None,
+             Select: str = None, ProjectionExpression: str = None) -> dict:
+        """전체 스캔 (인덱스 컬럼 조건은 SQL로, 나머지는 컴파일된 술어로 필터링, 병렬 스캔 세그먼트 지원)"""
+        validate_segment(Segment, TotalSegments)
+        segment = (Segment, TotalSegments) if TotalSegments else None
+        response = self._select(FilterExpression, ExpressionAttributeNames,
+                                ExpressionAttributeValues, ('id',), Limit, ExclusiveStartKey, segment)
+        return shape_scan_response(response, Select, ProjectionExpression, ExpressionAttributeNames)
+
+    def query(self, IndexName: str = None, KeyConditionExpression: str = None,
+              ExpressionAttributeValues: dict = None,
+              ExpressionAttributeNames: dict = None,
+              Limit: int = None, ExclusiveStartKey: dict = None) -> dict:
+        """쿼리 실행 (인덱스의 정렬 키 순서로 반환)"""
+        order_by = ('id',)
+        if IndexName:
+            if IndexName not in self.indexes:
+                raise ValueError(f"Unknown index {IndexName} on table {self.table_name}")
+            order_by = self.indexes[IndexName] + ('id',)
+
+        return self._select(KeyConditionExpression, ExpressionAttributeNames,
+                            ExpressionAttributeValues, order_by, Limit, ExclusiveStartKey)
+
+    def update_item(self, Key: dict, UpdateExpression: str,
+                    ExpressionAttributeValues: dict = None,
+                    ExpressionAttributeNames: dict = None,
+                    ConditionExpression: str = None):
+        """항목 업데이트 (읽기-수정-쓰기를 하나의 트랜잭션으로 처리)"""
+        apply_update = compile_update(UpdateExpression).bind(
+            ExpressionAttributeNames, ExpressionAttributeValues)
+        item_id = Key.get('id')
+
+        with self._transaction() as conn:
+            item = self._fetch(conn, item_id)
+            if item is None:
+                raise KeyError(f"Item with id {item_id} not found")
+            check_condition(ConditionExpression, ExpressionAttributeNames, ExpressionAttributeValues, item)
+
+            apply_update(item)
+            conn.execute(self._upsert_sql, self._row_values(item))
+
+    def _select(self, expression: Optional[str], attr_names: Optional[Dict],
+                attr_values: Optional[Dict], order_by: tuple = ('id',),
+                limit: int = None, exclusive_start_key: dict = None,
+                segment: tuple = None) -> dict:
+        """
+        조건식을 가능한 만큼 WHERE 절로 바꾸어 조회
+        order_by 컬럼 기준 keyset 방식으로 페이지를 이어 읽음
+        segment=(번호, 전체 수)면 해당 병렬 스캔 세그먼트의 항목만
+        (Limit은 DynamoDB처럼 필터 적용 전 평가 항목 수 기준)
+        """
+        clauses = []
+        params = []
+        matches = None
+        if expression:
+            condition = compile_condition(expression)
+            translated = self._to_sql(condition.ast, attr_names, attr_values or {})
+            if translated is not None:
+                clauses.append(translated[0])
+                params.extend(translated[1])
+            else:
+                matches = condition.bind(attr_names, attr_values)
+
+        # 인덱스 조회는 DynamoDB GSI처럼 인덱스 키가 없는 항목 제외
+        clauses.extend(f'{column} IS NOT NULL' for column in order_by if column != 'id')
+
+        if segment is not None:
+            clauses.append('segment_of(id, ?) = ?')
+            params.extend((segment[1], segment[0]))
+
+        if exclusive_start_key:
+            clauses.append(f"({', '.join(order_by)}) > ({', '.join('?' for _ in order_by)})")
+            params.extend(exclusive_start_key.get(column) for column in order_by)
+
+        sql = f'SELECT data FROM {self.table_name}'
+        if clauses:
+            sql += ' WHERE ' + ' AND '.join(clauses)
+        sql += f" ORDER BY {', '.join(order_by)}"
+        if limit is not None:
+            # 다음 페이지 존재 여부 확인용으로 하나 더 읽음
+            sql += ' LIMIT ?'
+            params.append(limit + 1)
+
+        items = [_load_row(row[0]) for row in self.db.connection().execute(sql, params).fetchall()]
+        more = limit is not None and len(items) > limit
+        if more:
+            items = items[:limit]
+
+        scanned = len(items)
+        last_item = items[-1] if more and items else None
+        if matches is not None:
+            items = [item for item in items if matches(item)]
+
+        response = {'Items': items, 'Count': len(items), 'ScannedCount': scanned}
+        if last_item is not None:
+            response['LastEvaluatedKey'] = {column: last_item.get(column) for column in order_by}
+        return response
+
+    def _to_sql(self, node, attr_names, attr_values):
+        """조건 AST를 (SQL, 파라미터)로 변환, 컬럼이 아닌 속성이 있으면 None"""
+        kind = node[0]
+        if kind in ('and', 'or'):
+            left = self._to_sql(node[1], attr_names, attr_values)
+            right = self._to_sql(node[2], attr_names, attr_values)
+            if left is None or right is None:
+                return None
+            return f'({left[0]} {kind.upper()} {right[0]})', left[1] + right[1]
+        if kind == 'not':
+            inner = self._to_sql(node[1], attr_names, attr_values)
+            if inner is None:
+                return None
+            return f'(NOT {inner[0]})', inner[1]
+        if kind == 'exists':
+            column = self._column(node[1], attr_names)
+            if column is None:
+                return None
+            return f'{column} IS {"NOT NULL" if node[2] else "NULL"}', []
+
+        column = self._column(node[2] if kind == 'compare' else node[1], attr_names)
+        if column is None:
+            return None
+        operands = node[3:] if kind == 'compare' else node[2:]
+        if any(operand[0] != 'value' or operand[1] not in attr_values for operand in operands):
+            return None
+        params = [attr_values[operand[1]] for operand in operands]
+
+        if kind == 'compare':
+            op = '!=' if node[1] == '<>' else node[1]
+            return f'{column} {op} ?', params
+        if kind == 'between':
+            return f'{column} BETWEEN ? AND ?', params
+        if kind == 'begins_with' and isinstance(params[0], str):
+            return f'({column} >= ? AND {column} < ?)', [params[0], params[0] + _PREFIX_UPPER]
+        return None
+
+    def _column(self, operand, attr_names) -> Optional[str]:
+        """피연산자가 컬럼으로 저장된 속성이면 컬럼 이름"""
+        if operand[0] != 'path':
+            return None
+        name = operand[1]
+        if name.startswith('#'):
+            name = (attr_names or {}).get(name)
+        if name == 'id' or name in self.columns:
+            return name
+        return None
@@ -0,0 +1,379 @@
+"""
+DynamoDB 요청 속도 제한과 재시도
+프로비저닝된 용량(RCU/WCU)을 넘는 요청이 몰리면 ProvisionedThroughputExceededException으로 실패하므로
+- 테이블과 GSI별 읽기/쓰기 토큰 버킷으로 요청 속도를 용량에 맞추고 (실제 소비 용량만큼 각각 차감,
+  워커 프로세스가 여럿이면 용량을 워커 수로 나눈 몫만 사용)
+- 스로틀링되면 속도를 낮춘 뒤 지수 백오프 + 지터로 재시도하며
+- 재시도 예산으로 장애 시 재시도가 요청을 몇 배로 불리지 않게 합니다.
+
+스로틀링 외의 오류는 그대로 전파합니다.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+
+# 재시도할 오류 코드
+THROTTLING_ERROR_CODES = frozenset([
+    'ProvisionedThroughputExceededException',
+    'ThrottlingException',
+    'RequestLimitExceeded'
+])
+
+
+class RetryExhausted(Exception):
+    """일부만 처리된 일괄 요청을 재시도 횟수/예산 안에 끝내지 못함"""
+
+
+def is_throttling_error(error: Exception) -> bool:
+    """DynamoDB 스로틀링 오류 여부"""
+    response = getattr(error, 'response', None)
+    if not isinstance(response, dict):
+        return False
+    return response.get('Error', {}).get('Code') in THROTTLING_ERROR_CODES
+
+
+def consumed_capacity(response: Dict, index: Optional[str] = None) -> Dict[Optional[str], float]:
+    """
+    응답의 ConsumedCapacity를 테이블(None)과 GSI 이름별로 나눈 값 (없으면 빈 dict)
+
+    ReturnConsumedCapacity='INDEXES' 응답은 Table / GlobalSecondaryIndexes 항목으로 나누고,
+    합계만 있으면('TOTAL', BatchGetItem) 요청한 index(없으면 테이블)의 소비량으로 봅니다.
+    """
+    consumed = response.get('ConsumedCapacity') if isinstance(response, dict) else None
+    if not consumed:
+        return {}
+    if isinstance(consumed, dict):
+        consumed = [consumed]
+    totals = {}
+    for entry in consumed:
+        if 'Table' in entry or 'GlobalSecondaryIndexes' in entry:
+            parts = [(None, entry.get('Table', {}))] + list(entry.get('GlobalSecondaryIndexes', {}).items())
+        else:
+            parts = [(index, entry)]
+        for name, part in parts:
+            totals[name] = totals.get(name, 0.0) + float(part.get('CapacityUnits', 0))
+    return totals
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 채워지는 토큰 버킷 (최대 burst_seconds초 분량)
+
+    요청은 토큰을 먼저 예약(잔량이 음수가 될 수 있음)하고, 모자란 만큼 기다립니다.
+    스로틀링되면 쌓아 둔 토큰을 버리고 속도를 절반으로 줄이며(최소 목표의 10%),
+    성공할 때마다 목표 속도까지 조금씩 되돌립니다.
+    rate가 0이면 제한하지 않습니다.
+    """
+
+    def __init__(self, rate: float, burst_seconds: float = 5.0,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.target_rate = rate
+        self.rate = rate
+        self.burst_seconds = burst_seconds
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = rate * burst_seconds
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.waits = 0
+        self.wait_seconds = 0.0
+
+    def _refill(self):
+        now = self._clock()
+        self._tokens = min(self.rate * self.burst_seconds, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0):
+        """토큰을 예약하고 모자라면 채워질 때까지 대기"""
+        if self.target_rate <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            if wait > 0:
+                self.waits += 1
+                self.wait_seconds += wait
+        if wait > 0:
+            self._sleep(wait)
+
+    def debit(self, tokens: float):
+        """요청 후 알게 된 추가 소비량 차감 (다음 요청이 그만큼 기다림)"""
+        if self.target_rate <= 0 or tokens <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+
+    def throttled(self):
+        """스로틀링됨: 쌓아 둔 토큰을 버리고 속도를 절반으로"""
+        if self.target_rate <= 0:
+            return
+        with self._lock:
+            self._refill()
+            self._tokens = min(self._tokens, 0.0)
+            self.rate = max(self.target_rate * 0.1, self.rate * 0.5)
+
+    def succeeded(self):
+        if self.rate >= self.target_rate:
+            return
+        with self._lock:
+            self._refill()
+            self.rate = min(self.target_rate, self.rate + self.target_rate * 0.02)
+
+
+class RetryBudget:
+    """
+    재시도 예산
+    요청마다 ratio만큼 쌓이고(최대 max_tokens) 재시도마다 1씩 씁니다.
+    스로틀링이 계속되면 예산이 바닥나 재시도 없이 바로 실패합니다.
+    """
+
+    def __init__(self, ratio: float = 0.2, max_tokens: float = 20.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._balance = max_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(self.max_tokens, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class Throttle:
+    """
+    테이블 하나(와 그 GSI들)의 읽기/쓰기 속도 제한 + 재시도
+
+    capacity_loader는 처음 호출할 때 한 번 실행되어 {None(테이블) 또는 GSI 이름: (RCU, WCU)}를 반환합니다
+    (온디맨드 테이블/모르는 GSI는 0 → 제한 없음).
+    GSI는 용량이 따로 프로비저닝되므로 GSI 쿼리와 쓰기 때 GSI가 소비한 용량은 그 GSI의 버킷에서 차감합니다.
+    워커 프로세스 workers개가 같은 테이블을 쓰면 각 워커는 용량의 1/workers만 사용합니다.
+    """
+
+    def __init__(self, name: str, capacity_loader: Callable[[], Dict], burst_seconds: float = 5.0,
+                 max_retries: int = 8, base_delay: float = 0.05, max_delay: float = 5.0,
+                 budget: RetryBudget = None, sleep: Callable[[float], None] = time.sleep,
+                 workers: int = 1):
+        self.name = name
+        self.workers = max(1, workers)
+        self.burst_seconds = burst_seconds
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self._sleep = sleep
+        self._capacity_loader = capacity_loader
+        self._capacities = None
+        self._buckets = {}  # (kind, GSI 이름 또는 None) -> TokenBucket
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+        self.retried = 0
+        self.exhausted = 0
+
+    def bucket(self, kind: str, index: Optional[str] = None) -> TokenBucket:
+        """테이블(index=None) 또는 GSI의 'read' / 'write' 버킷 (처음 사용할 때 용량의 워커 몫으로 생성)"""
+        bucket = self._buckets.get((kind, index))
+        if bucket is None:
+            with self._lock:
+                if self._capacities is None:
+                    self._capacities = self._capacity_loader()
+                bucket = self._buckets.get((kind, index))
+                if bucket is None:
+                    read_rate, write_rate = self._capacities.get(index, (0, 0))
+                    rate = (read_rate if kind == 'read' else write_rate) / self.workers
+                    bucket = TokenBucket(rate, self.burst_seconds, sleep=self._sleep)
+                    self._buckets[(kind, index)] = bucket
+        return bucket
+
+    def backoff(self, attempt: int) -> float:
+        """attempt번째 재시도 전 대기 시간 (full jitter)"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def call(self, kind: str, operation: Callable, index: Optional[str] = None, **kwargs):
+        """
+        속도 제한을 지키며 operation(**kwargs) 실행, 스로틀링되면 백오프 후 재시도
+        index(GSI 이름)를 주면 그 GSI의 버킷에서 토큰을 받습니다.
+
+        Raises:
+            스로틀링 외의 오류, 또는 재시도 횟수/예산을 다 쓴 뒤의 스로틀링 오류
+        """
+        bucket = self.bucket(kind, index)
+        self.budget.deposit()
+        with self._lock:
+            self.calls += 1
+
+        attempt = 0
+        while True:
+            bucket.acquire(1)
+            try:
+                response = operation(**kwargs)
+            except Exception as e:
+                if not is_throttling_error(e):
+                    raise
+                bucket.throttled()
+                with self._lock:
+                    self.throttled += 1
+                    give_up = attempt >= self.max_retries or not self.budget.withdraw()
+                    if give_up:
+                        self.exhausted += 1
+                    else:
+                        self.retried += 1
+                if give_up:
+                    raise
+                attempt += 1
+                self._sleep(self.backoff(attempt))
+                continue
+
+            bucket.succeeded()
+            # 미리 받은 토큰 하나를 뺀 나머지를 테이블/GSI별 실제 소비량만큼 차감
+            for name, units in consumed_capacity(response, index).items():
+                self.bucket(kind, name).debit(units - 1 if name == index else units)
+            return response
+
+    def pause(self, kind: str, attempt: int, index: Optional[str] = None) -> bool:
+        """
+        일부만 처리된 일괄 요청(UnprocessedKeys/Items)을 다시 보내기 전 대기
+        스로틀링 재시도와 같은 횟수 제한과 예산을 쓰며, 다 썼으면 기다리지 않고 False를 반환합니다.
+        """
+        self.bucket(kind, index).throttled()
+        with self._lock:
+            self.throttled += 1
+            give_up = attempt > self.max_retries or not self.budget.withdraw()
+            if give_up:
+                self.exhausted += 1
+            else:
+                self.retried += 1
+        if give_up:
+            return False
+        self._sleep(self.backoff(attempt))
+        return True
+
+    def stats(self) -> Dict:
+        with self._lock:
+            stats = {
+                'calls': self.calls,
+                'throttled': self.throttled,
+                'retried': self.retried,
+                'exhausted': self.exhausted
+            }
+        for (kind, index), bucket in list(self._buckets.items()):
+            bucket_stats = {
+                'target_rate': bucket.target_rate,
+                'rate': round(bucket.rate, 2),
+                'waits': bucket.waits,
+                'wait_seconds': round(bucket.wait_seconds, 3)
+            }
+            if index is None:
+                stats[kind] = bucket_stats
+            else:
+                stats.setdefault('indexes', {}).setdefault(index, {})[kind] = bucket_stats
+        return stats
+
+
+class _ThrottledBatchWriter:
+    """batch_writer의 항목마다 쓰기 토큰을 받음"""
+
+    def __init__(self, writer, throttle: Throttle):
+        self._writer = writer
+        self._throttle = throttle
+
+    def __enter__(self):
+        self._writer.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._writer.__exit__(*exc_info)
+
+    def put_item(self, Item: Dict):
+        self._throttle.bucket('write').acquire(1)
+        self._writer.put_item(Item=Item)
+
+    def delete_item(self, Key: Dict):
+        self._throttle.bucket('write').acquire(1)
+        self._writer.delete_item(Key=Key)
+
+
+class ThrottledTable:
+    """
+    DynamoDB Table(또는 FastTable) 래퍼
+    읽기/쓰기 메서드를 Throttle로 실행하고, 테이블/GSI별 실제 소비 용량을 알기 위해
+    ReturnConsumedCapacity='INDEXES'를 요청합니다 (IndexName이 있는 쿼리는 그 GSI의 읽기 버킷 사용).
+    나머지 메서드와 속성은 원래 Table에 위임합니다.
+    """
+
+    READ_METHODS = ('get_item', 'query', 'scan')
+    WRITE_METHODS = ('put_item', 'update_item', 'delete_item')
+
+    def __init__(self, table, throttle: Throttle):
+        self._table = table
+        self.throttle = throttle
+        self.name = table.name
+
+    def __getattr__(self, name):
+        if name in self.READ_METHODS:
+            return self._wrap('read', getattr(self._table, name))
+        if name in self.WRITE_METHODS:
+            return self._wrap('write', getattr(self._table, name))
+        return getattr(self._table, name)
+
+    def _wrap(self, kind: str, method: Callable) -> Callable:
+        def call(**kwargs):
+            kwargs.setdefault('ReturnConsumedCapacity', 'INDEXES')
+            return self.throttle.call(kind, method, index=kwargs.get('IndexName'), **kwargs)
+        return call
+
+    def batch_writer(self, **kwargs):
+        return _ThrottledBatchWriter(self._table.batch_writer(**kwargs), self.throttle)
+
+
+def table_capacity(table) -> Dict[Optional[str], tuple]:
+    """
+    테이블과 GSI의 프로비저닝 용량 {None(테이블) 또는 GSI 이름: (RCU, WCU)}
+    테이블 용량은 DYNAMODB_READ_RATE / DYNAMODB_WRITE_RATE가 있으면 그 값을 사용하고, 확인할 수 없으면 0(제한 없음)
+    """
+    try:
+        throughput = table.provisioned_throughput or {}
+        indexes = getattr(table, 'global_secondary_indexes', None) or []
+    except Exception as e:
+        print(f"테이블 용량 확인 오류: {e}")
+        throughput, indexes = {}, []
+
+    capacities = {
+        index['IndexName']: (float(index.get('ProvisionedThroughput', {}).get('ReadCapacityUnits', 0)),
+                             float(index.get('ProvisionedThroughput', {}).get('WriteCapacityUnits', 0)))
+        for index in indexes
+    }
+    read_rate = os.environ.get('DYNAMODB_READ_RATE') or throughput.get('ReadCapacityUnits', 0)
+    write_rate = os.environ.get('DYNAMODB_WRITE_RATE') or throughput.get('WriteCapacityUnits', 0)
+    capacities[None] = (float(read_rate), float(write_rate))
+    return capacities
+
+
+def throttled_table(table, sleep: Callable[[float], None] = time.sleep):
+    """
+    환경 변수 설정으로 테이블을 ThrottledTable로 감쌈
+
+    DYNAMODB_THROTTLE: 0이면 감싸지 않음 (기본값: 1)
+    DYNAMODB_BURST_SECONDS: 버킷에 쌓아 둘 수 있는 용량 (초 단위, 기본값: 5)
+    DYNAMODB_MAX_RETRIES: 스로틀링 재시도 횟수 (기본값: 8)
+    DYNAMODB_THROTTLE_WORKERS: 같은 테이블을 쓰는 워커 프로세스 수, 각 워커는 용량을 이 수로 나눈 몫만 사용 (기본값: 1)
+    """
+    if os.environ.get('DYNAMODB_THROTTLE', '1') == '0':
+        return table
+    throttle = Throttle(table.name, lambda: table_capacity(table),
+                        burst_seconds=float(os.environ.get('DYNAMODB_BURST_SECONDS', '5')),
+                        max_retries=int(os.environ.get('DYNAMODB_MAX_RETRIES', '8')),
+                        sleep=sleep,
+                        workers=int(os.environ.get('DYNAMODB_THROTTLE_WORKERS', '1')))
+    return ThrottledTable(table, throttle)
@@ -0,0 +1,235 @@
+"""
+느린 작업 기록
+REST 요청과 Socket.IO 핸들러마다 추적(Trace)을 열어 그 안에서 실행된 테이블 호출과 emit을 모으고,
+처리 시간이 SLOW_LOG_MS를 넘으면 시간 구성(데이터베이스/emit/나머지), 호출별 표현식과 항목 수를 한 줄 JSON으로 남깁니다.
+테이블 호출 하나가 기준을 넘으면 그 호출도 따로 기록합니다.
+
+추적은 contextvars로 전달되므로 tpool 스레드와 병렬 스캔 스레드에서 실행된 호출도 요청에 묶입니다
+(스레드로 넘길 때 copy_context()로 실행).
+기록도 프로파일링도 하지 않는 요청은 추적을 만들지 않습니다.
+"""
+
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Callable, Dict, Optional
+
+# 느린 작업 기록에 남길 테이블 호출 파라미터
+EXPRESSION_KEYS = ('IndexName', 'KeyConditionExpression', 'FilterExpression', 'ProjectionExpression',
+                   'UpdateExpression', 'ConditionExpression', 'Key', 'Select', 'Limit',
+                   'Segment', 'TotalSegments')
+
+# 기록 하나에 남길 테이블 호출 수 (나머지는 개수만)
+MAX_LOGGED_OPERATIONS = 50
+
+_current: ContextVar = ContextVar('trace', default=None)
+
+
+class Trace:
+    """REST 요청 또는 Socket.IO 핸들러 하나의 실행 기록"""
+
+    def __init__(self, tracer: 'Tracer', kind: str, name: str, profiled: bool):
+        self.tracer = tracer
+        self.kind = kind
+        self.name = name
+        self.profiled = profiled
+        self.status = None
+        self.start = time.perf_counter()
+        self.operations = []  # (table, operation, kwargs, 소요 시간, 항목 수, 읽은 바이트, 실패 여부)
+        self.emits = 0
+        self.emit_seconds = 0.0
+        self.packets = 0
+        self.packet_bytes = 0
+        self._lock = threading.Lock()
+
+    def add_operation(self, entry: tuple):
+        with self._lock:
+            self.operations.append(entry)
+
+    def summary(self, elapsed: float) -> Dict:
+        with self._lock:
+            operations = list(self.operations)
+        db_seconds = sum(entry[3] for entry in operations)
+        record = {
+            'kind': self.kind,
+            'name': self.name,
+            'ms': _ms(elapsed),
+            'breakdown': {
+                'db_ms': _ms(db_seconds),
+                'emit_ms': _ms(self.emit_seconds),
+                # 병렬 스캔은 호출 시간이 겹치므로 0 아래로 내려가지 않게 함
+                'other_ms': _ms(max(0.0, elapsed - db_seconds - self.emit_seconds))
+            },
+            'db': {
+                'calls': len(operations),
+                'items': sum(entry[4] for entry in operations),
+                'read_bytes': sum(entry[5] for entry in operations)
+            },
+            'emits': {'calls': self.emits, 'packets': self.packets, 'bytes': self.packet_bytes},
+            'operations': [_describe_operation(entry) for entry in operations[:MAX_LOGGED_OPERATIONS]]
+        }
+        if self.status is not None:
+            record['status'] = self.status
+        if len(operations) > MAX_LOGGED_OPERATIONS:
+            record['operations_omitted'] = len(operations) - MAX_LOGGED_OPERATIONS
+        return record
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+def _describe_operation(entry: tuple) -> Dict:
+    table, operation, kwargs, elapsed, items, read_bytes, failed = entry
+    description = {'table': table, 'operation': operation, 'ms': _ms(elapsed),
+                   'items': items, 'read_bytes': read_bytes}
+    expression = {key: kwargs[key] for key in EXPRESSION_KEYS if key in kwargs}
+    if 'RequestItems' in kwargs:
+        expression['keys'] = sum(len(request.get('Keys', ())) for request in kwargs['RequestItems'].values())
+    if expression:
+        description['expression'] = expression
+    if failed:
+        description['error'] = True
+    return description
+
+
+def record_operation(table: str, operation: str, kwargs: Dict, elapsed: float,
+                     items: int, read_bytes: int, failed: bool):
+    """테이블 호출 기록 (추적 중인 요청 안이 아니면 무시)"""
+    trace = _current.get()
+    if trace is None:
+        return
+    entry = (table, operation, kwargs, elapsed, items, read_bytes, failed)
+    trace.add_operation(entry)
+    tracer = trace.tracer
+    if tracer.threshold and elapsed >= tracer.threshold:
+        tracer.write({'kind': 'table', 'name': f'{table}.{operation}', 'in': trace.name,
+                      **_describe_operation(entry)})
+
+
+def record_packet(size: int):
+    """직렬화한 Socket.IO 패킷 크기 기록 (수신자마다 호출됨)"""
+    trace = _current.get()
+    if trace is not None:
+        trace.packets += 1
+        trace.packet_bytes += size
+
+
+class Tracer:
+    """
+    요청/핸들러 추적과 느린 작업 기록
+
+    threshold(초)가 0이면 기록하지 않고, profiler가 있으면 요청 시작 때 프로파일링 대상인지 확인합니다.
+    """
+
+    def __init__(self, threshold: float = 1.0, logger: logging.Logger = None, profiler=None):
+        self.threshold = threshold
+        self.logger = logger or logging.getLogger('slow_operations')
+        self.profiler = profiler
+        self.slow = 0
+
+    def begin(self, kind: str, name: str, profile: bool = True):
+        """추적 시작 → (trace, token), 기록도 프로파일링도 하지 않으면 (None, None)"""
+        profiled = profile and self.profiler is not None and self.profiler.claim()
+        if not self.threshold and not profiled:
+            return None, None
+        trace = Trace(self, kind, name, profiled)
+        return trace, _current.set(trace)
+
+    def end(self, trace: Optional[Trace], token):
+        if trace is None:
+            return
+        elapsed = time.perf_counter() - trace.start
+        _current.reset(token)
+        if trace.profiled:
+            self.profiler.release()
+        if self.threshold and elapsed >= self.threshold:
+            self.slow += 1
+            self.write(trace.summary(elapsed))
+
+    def write(self, record: Dict):
+        try:
+            self.logger.warning(json.dumps(record, ensure_ascii=False, default=str))
+        except Exception as e:
+            print(f"느린 작업 기록 오류: {e}")
+
+    def instrument_flask(self, app, unprofiled: tuple = ()):
+        """
+        REST 요청마다 'METHOD URL 규칙' 이름으로 추적
+        unprofiled로 시작하는 경로(관리자 API, 지표 수집 등)는 프로파일링 요청 수에 넣지 않습니다.
+        """
+        from flask import g, request
+
+        @app.before_request
+        def begin_trace():
+            rule = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+            g.trace, g.trace_token = self.begin('http', f'{request.method} {rule}',
+                                                profile=not request.path.startswith(unprofiled))
+
+        @app.after_request
+        def record_status(response):
+            trace = g.get('trace')
+            if trace is not None:
+                trace.status = response.status_code
+            return response
+
+        @app.teardown_request
+        def end_trace(error=None):
+            # 예외로 after_request를 건너뛰어도 항상 호출됨
+            trace = g.pop('trace', None)
+            if trace is not None:
+                self.end(trace, g.pop('trace_token'))
+
+    def instrument_socketio(self, socketio):
+        """emit(수신자에게 나누어 보내는 부분 포함) 소요 시간 기록"""
+        manager = socketio.server.manager
+        emit = manager.emit
+
+        def traced_emit(*args, **kwargs):
+            trace = _current.get()
+            if trace is None:
+                return emit(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return emit(*args, **kwargs)
+            finally:
+                trace.emits += 1
+                trace.emit_seconds += time.perf_counter() - start
+        manager.emit = traced_emit
+
+    def socket_handler(self, event: str) -> Callable:
+        """Socket.IO 핸들러 추적 데코레이터 (@socketio.on 아래에 적용)"""
+        def decorator(handler):
+            @functools.wraps(handler)
+            def wrapper(*args, **kwargs):
+                trace, token = self.begin('socket', event)
+                try:
+                    return handler(*args, **kwargs)
+                finally:
+                    self.end(trace, token)
+            return wrapper
+        return decorator
+
+    def stats(self) -> Dict:
+        return {'threshold_ms': _ms(self.threshold), 'slow': self.slow}
+
+
+def get_tracer(profiler=None) -> Tracer:
+    """
+    환경 변수로 추적기 생성
+
+    SLOW_LOG_MS: 이 시간(밀리초)을 넘는 요청/핸들러/테이블 호출을 기록, 0이면 기록 안 함 (기본값: 1000)
+    SLOW_LOG_FILE: 기록을 남길 파일 (한 줄에 JSON 하나), 없으면 서버 로그(slow_operations 로거)에만 남김
+    """
+    logger = logging.getLogger('slow_operations')
+    path = os.environ.get('SLOW_LOG_FILE')
+    if path and not any(getattr(handler, 'baseFilename', None) == os.path.abspath(path)
+                        for handler in logger.handlers):
+        handler = logging.FileHandler(path, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+    return Tracer(float(os.environ.get('SLOW_LOG_MS', '1000')) / 1000, logger, profiler)
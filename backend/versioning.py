@@ -0,0 +1,73 @@
+"""
+조건부 GET용 버전 카운터
+부서 목록과 부서별 이벤트 목록의 버전을 프로세스 메모리에 두고, 쓰기마다 올립니다.
+ETag는 이 버전으로 만들므로 If-None-Match 확인에 데이터베이스를 읽지 않습니다.
+"""
+
+import os
+import threading
+import time
+import uuid
+import zlib
+from typing import Hashable
+
+# 기본 ETag 교체 주기 (초)
+# 버전은 워커마다 따로 있으므로, 워커가 여럿일 수 있는 기본 설정에서는 다른 워커의 변경이 이 시간 안에 보이도록 함
+DEFAULT_MAX_AGE = 5
+
+
+class VersionCounters:
+    """
+    키별 버전 카운터
+
+    ETag에 프로세스마다 다른 boot ID를 넣어, 다른 워커가 발급한 ETag가 우연히 일치하지 않게 합니다.
+    다른 워커의 쓰기는 이 프로세스의 버전을 올리지 못하므로, 워커가 여럿이면 max_age(초)를 지정해
+    그 주기마다 ETag를 바꾸어 오래된 304 응답이 이어지는 시간을 제한합니다.
+    """
+
+    def __init__(self, max_age: float = 0):
+        self.max_age = max_age
+        self._boot_id = uuid.uuid4().hex[:8]
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> int:
+        """현재 버전"""
+        return self._versions.get(key, 0)
+
+    def bump(self, *keys: Hashable):
+        """쓰기 후 버전 증가"""
+        with self._lock:
+            for key in keys:
+                self._versions[key] = self._versions.get(key, 0) + 1
+
+    def etag(self, key: Hashable, variant: bytes = b'') -> str:
+        """
+        ETag 값 (따옴표 제외)
+
+        Args:
+            key: 버전 키
+            variant: 같은 버전이라도 응답이 달라지는 요소 (예: 쿼리 문자열)
+        """
+        parts = [self._boot_id, str(self.get(key)), format(zlib.crc32(variant), 'x')]
+        if self.max_age > 0:
+            parts.append(str(int(time.time() // self.max_age)))
+        return '-'.join(parts)
+
+
+def etag_max_age() -> float:
+    """
+    ETag 교체 주기 (초)
+
+    ETAG_MAX_AGE: 기본값 5, 0이면 쓰기가 있을 때만 바뀜 (워커 프로세스가 하나일 때만 지정)
+    SOCKETIO_MESSAGE_QUEUE가 있으면 워커가 여럿이므로 0을 지정해도 DEFAULT_MAX_AGE를 사용합니다.
+    """
+    max_age = float(os.environ.get('ETAG_MAX_AGE', str(DEFAULT_MAX_AGE)))
+    if max_age <= 0 and os.environ.get('SOCKETIO_MESSAGE_QUEUE'):
+        return DEFAULT_MAX_AGE
+    return max_age
+
+
+def get_version_counters() -> VersionCounters:
+    """환경 변수로 버전 카운터 생성 (교체 주기는 etag_max_age 참고)"""
+    return VersionCounters(etag_max_age())